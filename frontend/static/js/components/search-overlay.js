@@ -11,6 +11,7 @@ import { createShortcutBag } from "../utils/global-shortcuts.js";
 import { ReactiveElement } from "../utils/reactive-element.js";
 import { playAnimation } from "../utils/transition.js";
 import { AutocompleteOverlayMixin } from "./base/autocomplete-overlay.js";
+import { StreamTransport } from "./stream-transport.js";
 
 const getEventTarget = (evt) => {
   const target = evt.target;
@@ -92,6 +93,7 @@ export class SearchOverlay extends AutocompleteOverlayMixin(ReactiveElement) {
   #onToggle;
   #onTagsCatalogUpdated;
   #activePanelEl = null;
+  #refineTransport = null;
   #emojiShortcodeMap = new Map();
 
   constructor() {
@@ -238,6 +240,7 @@ export class SearchOverlay extends AutocompleteOverlayMixin(ReactiveElement) {
   }
 
   #handleBeforeRequest() {
+    this.#stopRefinement();
     const wrap = this.#resultsEl;
     if (wrap) {
       wrap.setAttribute("aria-busy", "true");
@@ -259,6 +262,7 @@ export class SearchOverlay extends AutocompleteOverlayMixin(ReactiveElement) {
 
     const swapTarget = evt.detail?.target;
     if (swapTarget !== wrap) return;
+    this.#startRefinement();
 
     const panel = wrap.querySelector(".sr-panel");
     if (!panel) {
@@ -296,12 +300,61 @@ export class SearchOverlay extends AutocompleteOverlayMixin(ReactiveElement) {
     this.#loadRecentSearches();
   }
 
+  #startRefinement() {
+    const marker = this.#resultsEl?.querySelector(".search-results-refine[data-sse-url]");
+    if (!marker) return;
+    const url = marker.dataset.sseUrl;
+    marker.remove();
+    this.#stopRefinement();
+    if (!url) return;
+
+    const transport = new StreamTransport({
+      url,
+      onChunk: (html) => this.#applyRefinedResults(html),
+      onDone: () => this.#stopRefinement(transport),
+      onError: () => this.#stopRefinement(transport),
+    });
+    this.#refineTransport = transport;
+    transport.start();
+  }
+
+  #stopRefinement(transport = this.#refineTransport) {
+    if (!transport) return;
+    transport.close();
+    if (this.#refineTransport === transport) {
+      this.#refineTransport = null;
+    }
+  }
+
+  #applyRefinedResults(html) {
+    const wrap = this.#resultsEl;
+    if (!wrap) return;
+    const template = document.createElement("template");
+    template.innerHTML = html;
+    const incomingCursor = template.content.querySelector("#search-session-id");
+    if (incomingCursor) {
+      const cursorEl = this.ownerDocument?.getElementById("search-session-id");
+      if (cursorEl) {
+        cursorEl.value = incomingCursor.value;
+      }
+      incomingCursor.remove();
+    }
+    wrap.replaceChildren(template.content);
+    globalThis.htmx?.process(wrap);
+    this.#handleAfterSwap({ detail: { target: wrap } });
+  }
+
   #handleInput() {
+    this.#stopRefinement();
     const cursorEl = this.ownerDocument?.getElementById("search-session-id");
     if (cursorEl) {
       cursorEl.value = "";
     }
-    if (!this.#inputEl || this.#inputEl.value.trim()) return;
+    if (!this.#inputEl) return;
+    if (this.#inputEl.value.trim()) {
+      this.#loadRecentSearches();
+      return;
+    }
     this.#closeResults();
   }
 
@@ -325,9 +378,10 @@ export class SearchOverlay extends AutocompleteOverlayMixin(ReactiveElement) {
     });
   }
 
-  async #fetchRecentAutocompleteCandidates(signal) {
+  async #fetchRecentAutocompleteCandidates(query, signal) {
     try {
-      const response = await fetch("/search/recent", {
+      const suffix = query ? `?q=${encodeURIComponent(query)}` : "";
+      const response = await fetch(`/search/recent${suffix}`, {
         headers: { Accept: "application/json" },
         credentials: "same-origin",
         signal,
@@ -567,6 +621,7 @@ export class SearchOverlay extends AutocompleteOverlayMixin(ReactiveElement) {
   }
 
   #closeResults(clearInput = false, options = {}) {
+    this.#stopRefinement();
     const wrap = this.#resultsEl;
     const finish = () => {
       this.#spinnerController?.stop();
@@ -691,7 +746,7 @@ export class SearchOverlay extends AutocompleteOverlayMixin(ReactiveElement) {
         if (context?.mode === "emoji") {
           return this.#fetchEmojiAutocompleteCandidates(query, context?.signal);
         }
-        return this.#fetchRecentAutocompleteCandidates(context?.signal);
+        return this.#fetchRecentAutocompleteCandidates(query, context?.signal);
       },
       buildCacheKey: (query, context = {}) =>
         `${String(context?.mode || "recent")}:${String(query || "")
@@ -713,7 +768,7 @@ export class SearchOverlay extends AutocompleteOverlayMixin(ReactiveElement) {
     if (isShortcodeLookupQuery(query)) {
       return { query, context: { mode: "emoji" } };
     }
-    return { query: "", context: { mode: "recent" } };
+    return { query, context: { mode: "recent" } };
   }
 
   onAutocompleteCommit(committed) {
@@ -0,0 +1,8 @@
+-- Content-addressed chunk embeddings ----------------------------------------
+--
+-- chunk_digest is a keyed HMAC of the chunk text (derived from the user's
+-- DEK) so unchanged chunks can reuse their stored embedding on re-index.
+
+ALTER TABLE vectors ADD COLUMN chunk_digest TEXT;
+
+CREATE INDEX idx_vectors_user_chunk_digest ON vectors(user_id, chunk_digest);
@@ -0,0 +1,80 @@
+-- Blind lexical index ---------------------------------------------------------
+--
+-- Entry tokens are stored as keyed HMACs (derived from the user's DEK), so
+-- the index answers exact term lookups for BM25 scoring without any
+-- plaintext word reaching disk. Document frequencies and corpus size are kept
+-- current by triggers, including when entries are deleted via cascade.
+
+CREATE TABLE lexical_docs (
+    entry_id  TEXT    PRIMARY KEY REFERENCES entries(id) ON DELETE CASCADE,
+    user_id   TEXT    NOT NULL REFERENCES users(id)   ON DELETE CASCADE,
+    length    INTEGER NOT NULL
+);
+
+CREATE INDEX idx_lexical_docs_user ON lexical_docs(user_id);
+
+CREATE TABLE lexical_postings (
+    user_id     TEXT    NOT NULL,
+    token_hash  BLOB    NOT NULL,
+    entry_id    TEXT    NOT NULL REFERENCES entries(id) ON DELETE CASCADE,
+    tf          INTEGER NOT NULL,
+    PRIMARY KEY (user_id, token_hash, entry_id)
+) WITHOUT ROWID;
+
+CREATE INDEX idx_lexical_postings_entry ON lexical_postings(entry_id);
+
+CREATE TABLE lexical_terms (
+    user_id     TEXT    NOT NULL,
+    token_hash  BLOB    NOT NULL,
+    df          INTEGER NOT NULL,
+    PRIMARY KEY (user_id, token_hash)
+) WITHOUT ROWID;
+
+CREATE TABLE lexical_stats (
+    user_id       TEXT    PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    doc_count     INTEGER NOT NULL DEFAULT 0,
+    total_length  INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER trg_lexical_postings_insert
+AFTER INSERT ON lexical_postings FOR EACH ROW
+BEGIN
+    INSERT INTO lexical_terms (user_id, token_hash, df)
+    VALUES (NEW.user_id, NEW.token_hash, 1)
+    ON CONFLICT(user_id, token_hash) DO UPDATE SET df = df + 1;
+END;
+
+CREATE TRIGGER trg_lexical_postings_delete
+AFTER DELETE ON lexical_postings FOR EACH ROW
+BEGIN
+    UPDATE lexical_terms SET df = df - 1
+    WHERE user_id = OLD.user_id AND token_hash = OLD.token_hash;
+    DELETE FROM lexical_terms
+    WHERE user_id = OLD.user_id AND token_hash = OLD.token_hash AND df <= 0;
+END;
+
+CREATE TRIGGER trg_lexical_docs_insert
+AFTER INSERT ON lexical_docs FOR EACH ROW
+BEGIN
+    INSERT INTO lexical_stats (user_id, doc_count, total_length)
+    VALUES (NEW.user_id, 1, NEW.length)
+    ON CONFLICT(user_id) DO UPDATE SET
+        doc_count = doc_count + 1,
+        total_length = total_length + NEW.length;
+END;
+
+CREATE TRIGGER trg_lexical_docs_update
+AFTER UPDATE OF length ON lexical_docs FOR EACH ROW
+BEGIN
+    UPDATE lexical_stats SET total_length = total_length - OLD.length + NEW.length
+    WHERE user_id = NEW.user_id;
+END;
+
+CREATE TRIGGER trg_lexical_docs_delete
+AFTER DELETE ON lexical_docs FOR EACH ROW
+BEGIN
+    UPDATE lexical_stats SET
+        doc_count = doc_count - 1,
+        total_length = total_length - OLD.length
+    WHERE user_id = OLD.user_id;
+END;
@@ -0,0 +1,17 @@
+-- Related entries ---------------------------------------------------------------
+--
+-- Top-k nearest neighbours of each entry, computed in the background from the
+-- in-memory vector index. The neighbour list (entry ids and scores) is
+-- encrypted like entry content, so the table reveals only which entries have
+-- been processed.
+
+CREATE TABLE entry_neighbors (
+    entry_id      TEXT PRIMARY KEY REFERENCES entries(id) ON DELETE CASCADE,
+    user_id       TEXT NOT NULL REFERENCES users(id)   ON DELETE CASCADE,
+    nonce         BLOB NOT NULL,
+    ciphertext    BLOB NOT NULL,
+    alg           TEXT NOT NULL,
+    computed_at   TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_entry_neighbors_user ON entry_neighbors(user_id);
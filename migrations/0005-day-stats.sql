@@ -0,0 +1,27 @@
+-- Per-day aggregates ------------------------------------------------------------
+--
+-- One row per user and day with entries, kept current by the entries
+-- repository in the same transaction as every entry write. Calendar rendering
+-- and day-summary cache validation read these rows instead of scanning the
+-- day's entries.
+--
+-- ``digest`` is the day's aggregate entry digest. SQL cannot compute it, so
+-- rows backfilled here start without one and get it on first read.
+
+CREATE TABLE day_stats (
+    user_id        TEXT    NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    created_date   TEXT    NOT NULL,
+    entry_count    INTEGER NOT NULL DEFAULT 0,
+    opening_count  INTEGER NOT NULL DEFAULT 0,
+    digest         TEXT,
+    PRIMARY KEY (user_id, created_date)
+) WITHOUT ROWID;
+
+INSERT INTO day_stats (user_id, created_date, entry_count, opening_count)
+SELECT user_id,
+       created_date,
+       COUNT(*),
+       SUM(CASE WHEN flags LIKE '%|auto_opening|%' THEN 1 ELSE 0 END)
+FROM entries
+WHERE created_date IS NOT NULL
+GROUP BY user_id, created_date;
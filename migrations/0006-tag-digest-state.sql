@@ -0,0 +1,8 @@
+-- Tag digest state -------------------------------------------------------------
+--
+-- Running multiset hash over the digests of every entry linked to a tag (see
+-- ``digest_multiset_update``), updated as links and entries change so tag
+-- digests no longer rescan the tag's entries. NULL means not yet computed;
+-- the tags repository rebuilds it from ``tag_entry_xref`` on first read.
+
+ALTER TABLE tags ADD COLUMN digest_state TEXT;
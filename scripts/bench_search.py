@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""Benchmark search quality and latency on a synthetic multi-year journal.
+
+A journal is generated straight into a temporary encrypted SQLite database
+(no server, no LLM), indexed through ``SearchAPI.bulk_index`` and queried
+with a fixed query set through ``SearchAPI.search``. Every query has a few
+planted "needle" entries; the report covers
+
+* ``needle_recall_at_k``: planted entries found in the final results,
+* ``ann_recall_at_k``: vector candidates matching an exact brute-force
+  search over every stored vector,
+* p50/p95/p99 latency for the first (cold) and repeated (warm) runs,
+* entries decrypted per query and the in-memory index size.
+
+``--embedder hash`` swaps the embedding model for a deterministic feature
+hashing embedder so runs are reproducible and need no model download.
+Settings can be overridden with ``--set SEARCH.progressive.k1=256`` (values
+are parsed as JSON when possible). ``--json`` prints the report only, for
+diffing runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import orjson
+
+from llamora.settings import settings
+
+# (query, phrase planted into that query's needle entries)
+QUERIES: tuple[tuple[str, str], ...] = (
+    ("hiking trip in the mountains", "hiked up the mountain trail with Sam"),
+    ("grandmother's birthday dinner", "birthday dinner for grandmother at the old inn"),
+    ("trouble sleeping", "could not sleep again, awake until four"),
+    ("job interview nerves", "nervous before the job interview at the studio"),
+    ("learning to play piano", "practised piano scales for an hour"),
+    ("moving to a new apartment", "packed boxes for the move to the new apartment"),
+    ("argument with my brother", "had an argument with my brother about money"),
+    ("sourdough baking", "fed the sourdough starter and baked a loaf"),
+    ("marathon training", "long run for marathon training, twenty kilometres"),
+    ("feeling grateful", "grateful for small things today, the light and the tea"),
+)
+
+TOPICS: dict[str, list[str]] = {
+    "work": [
+        "the meeting ran long and nobody decided anything",
+        "finished the quarterly report before lunch",
+        "my manager asked about the roadmap again",
+        "spent the afternoon fixing a stubborn bug",
+        "emails piled up while I was in workshops",
+    ],
+    "home": [
+        "cleaned the kitchen and did two loads of laundry",
+        "the radiator is making that noise again",
+        "watered the plants on the balcony",
+        "cooked lentil soup and froze half of it",
+        "rearranged the bookshelf by colour",
+    ],
+    "social": [
+        "coffee with Maya, we talked for hours",
+        "called my parents, they sound well",
+        "dinner party at Jonas's place, too much wine",
+        "texted an old friend I had not spoken to in years",
+        "board game night, I lost every round",
+    ],
+    "mood": [
+        "felt restless most of the day",
+        "a quiet and calm evening, finally",
+        "anxious about things I cannot control",
+        "surprisingly good mood despite the rain",
+        "tired but content",
+    ],
+    "outside": [
+        "walked along the river at dusk",
+        "the park was full of people enjoying the sun",
+        "cycled to the market for vegetables",
+        "first snow of the year, everything muffled",
+        "sat on a bench and watched the pigeons",
+    ],
+}
+TAGS = ("work", "family", "health", "friends", "reading", "travel", "food", "mood")
+ASSISTANT_REPLIES = (
+    "That sounds like a full day. What stood out to you most?",
+    "It is good that you noticed that. How do you feel about it now?",
+    "Thank you for writing this down. Is there anything you want to remember?",
+)
+
+
+class HashingEmbedder:
+    """Deterministic stand-in for ``TextEmbedding`` using feature hashing."""
+
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+
+    def _vector(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        words = text.lower().split()
+        for gram in words + [" ".join(pair) for pair in zip(words, words[1:])]:
+            digest = hashlib.blake2b(gram.encode(), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dim
+            vec[bucket] += 1.0 if digest[4] & 1 else -1.0
+        return vec
+
+    def embed(self, texts: list[str], normalize: bool = True):
+        for text in texts:
+            vec = self._vector(text)
+            norm = float(np.linalg.norm(vec))
+            if normalize and norm > 0:
+                vec /= norm
+            yield vec
+
+
+def _apply_overrides(pairs: list[str]) -> dict[str, Any]:
+    applied: dict[str, Any] = {}
+    for pair in pairs:
+        key, _, raw = pair.partition("=")
+        if not key or not _:
+            raise SystemExit(f"--set expects KEY=VALUE, got {pair!r}")
+        try:
+            value = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            value = raw
+        settings.set(key.strip(), value)
+        applied[key.strip()] = value
+    return applied
+
+
+def _compose_entry(rng: random.Random) -> str:
+    topics = rng.sample(sorted(TOPICS), k=rng.randint(1, 3))
+    sentences = [rng.choice(TOPICS[topic]) for topic in topics]
+    return ". ".join(sentence.capitalize() for sentence in sentences) + "."
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    arr = np.asarray(samples)
+    return {
+        name: round(float(np.percentile(arr, q)), 2)
+        for name, q in (("p50", 50), ("p95", 95), ("p99", 99))
+    }
+
+
+async def _generate_journal(db, api, ctx, args) -> tuple[int, dict[str, set[str]]]:
+    rng = random.Random(args.seed)
+    start = date.today() - timedelta(days=int(args.years * 365))
+    days = int(args.years * 365)
+    needle_days = {
+        query: set(rng.sample(range(days), k=args.needles)) for query, _ in QUERIES
+    }
+    tag_hashes = {tag: await db.tags.resolve_or_create_tag(ctx, tag) for tag in TAGS}
+    needles: dict[str, set[str]] = {query: set() for query, _ in QUERIES}
+    jobs = []
+    count = 0
+
+    async def _flush() -> None:
+        if jobs:
+            await api.bulk_index(list(jobs))
+            jobs.clear()
+
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        planted = [
+            (query, phrase) for query, phrase in QUERIES if offset in needle_days[query]
+        ]
+        for slot in range(rng.randint(0, args.entries_per_day * 2)):
+            text = _compose_entry(rng)
+            planted_query = None
+            if slot == 0 and planted:
+                planted_query, phrase = planted.pop()
+                text = f"{text} Later I {phrase}."
+            created = datetime.combine(day, datetime.min.time(), timezone.utc)
+            created += timedelta(hours=8 + slot * 2)
+            entry_id = await db.entries.append_entry(
+                ctx,
+                "user",
+                text,
+                created_at=created.isoformat(),
+                created_date=day.isoformat(),
+            )
+            if planted_query is not None:
+                needles[planted_query].add(entry_id)
+            for tag in rng.sample(TAGS, k=rng.randint(0, 2)):
+                await db.tags.xref_tag_entry(
+                    ctx.user_id, tag_hashes[tag], entry_id, created_date=day.isoformat()
+                )
+            jobs.append((ctx, entry_id, orjson.dumps({"text": text}).decode()))
+            count += 1
+            if rng.random() < args.reply_rate:
+                reply = rng.choice(ASSISTANT_REPLIES)
+                reply_id = await db.entries.append_entry(
+                    ctx,
+                    "assistant",
+                    reply,
+                    reply_to=entry_id,
+                    created_at=(created + timedelta(minutes=1)).isoformat(),
+                    created_date=day.isoformat(),
+                )
+                jobs.append((ctx, reply_id, orjson.dumps({"text": reply}).decode()))
+                count += 1
+            if len(jobs) >= 256:
+                await _flush()
+    await _flush()
+    return count, needles
+
+
+async def _exact_scores(db, ctx, query_vecs: np.ndarray) -> list[dict[str, float]]:
+    """Return the best cosine per entry for every query, over all vectors."""
+
+    batch = await db.vectors.get_latest_vectors(ctx, 10_000_000)
+    if not len(batch):
+        return [{} for _ in range(len(query_vecs))]
+    matrix = batch.vectors / np.maximum(
+        np.linalg.norm(batch.vectors, axis=1, keepdims=True), 1e-12
+    )
+    exact: list[dict[str, float]] = []
+    for scores in query_vecs @ matrix.T:
+        best: dict[str, float] = {}
+        for entry_id, score in zip(batch.entry_ids, scores.tolist()):
+            if score > best.get(entry_id, -2.0):
+                best[entry_id] = score
+        exact.append(best)
+    return exact
+
+
+def _ann_recall(ann_ids: list[str], exact: dict[str, float], k: int) -> float:
+    """Share of the exact top ``k`` recovered, counting ties as hits.
+
+    Templated journal text yields many equal scores, so an id-set comparison
+    would punish the index for breaking ties differently.
+    """
+
+    if not exact:
+        return 0.0
+    ranked = sorted(exact.values(), reverse=True)[:k]
+    threshold = ranked[-1] - 1e-5
+    hits = sum(1 for entry_id in ann_ids[:k] if exact.get(entry_id, -2.0) >= threshold)
+    return hits / len(ranked)
+
+
+async def _run(args) -> dict[str, Any]:
+    from llamora.app.api.search import SearchAPI
+    from llamora.app.embed import model as embed_model
+    from llamora.app.embed.model import async_embed_texts
+    from llamora.app.index import entry_ann
+    from llamora.app.services.crypto import CryptoContext
+    from llamora.persistence.local_db import LocalDB
+
+    if args.embedder == "hash":
+        embed_model._cached_model = HashingEmbedder(args.dim)  # type: ignore[assignment]
+    if args.hnsw_m:
+        entry_ann._HNSW_M = int(args.hnsw_m)
+
+    workdir = Path(args.db_dir or tempfile.mkdtemp(prefix="llamora-bench-"))
+    db = LocalDB(str(workdir / "bench.sqlite3"))
+    await db.init()
+    try:
+        user_id = await db.users.create_user(
+            "bench", "-", b"s", b"n", b"c", b"s", b"n", b"c"
+        )
+        ctx = CryptoContext(user_id=user_id, dek=os.urandom(32), epoch=1)
+        api = SearchAPI(db)
+
+        started = time.perf_counter()
+        entry_count, needles = await _generate_journal(db, api, ctx, args)
+        ingest_s = time.perf_counter() - started
+
+        decrypted: list[int] = []
+        get_entries = db.entries.get_entries_by_ids
+
+        async def _counting_get_entries(c, ids, *a, **kw):
+            decrypted.append(len(ids))
+            return await get_entries(c, ids, *a, **kw)
+
+        db.entries.get_entries_by_ids = _counting_get_entries  # type: ignore[method-assign]
+
+        index = await api.vector_search.index_store.ensure_index(ctx)
+        if args.ef and index.index is not None:
+            index.index.set_ef(int(args.ef))
+
+        queries = [query for query, _ in QUERIES]
+        query_vecs = await async_embed_texts(queries, priority="query")
+        exact = await _exact_scores(db, ctx, query_vecs)
+
+        cold: list[float] = []
+        warm: list[float] = []
+        per_query: list[dict[str, Any]] = []
+        for qi, query in enumerate(queries):
+            candidates = await api.vector_search.search_candidates(
+                ctx, query, max(args.k, 128), args.k, hydrate_limit=0
+            )
+            ann_ids = [c["id"] for c in candidates[: args.k]]
+            ann_recall = _ann_recall(ann_ids, exact[qi], args.k)
+            api.result_cache.invalidate(user_id)
+            decrypted.clear()
+            run_times: list[float] = []
+            results: list[dict] = []
+            for run in range(max(args.repeat, 1)):
+                started = time.perf_counter()
+                _, results, _ = await api.search(ctx, query, k2=args.k)
+                run_times.append((time.perf_counter() - started) * 1000.0)
+                if run == 0:
+                    first_decrypts = sum(decrypted)
+            cold.append(run_times[0])
+            warm.extend(run_times[1:])
+            found = {r["id"] for r in results[: args.k]}
+            expected = needles[query]
+            per_query.append(
+                {
+                    "query": query,
+                    "needle_recall_at_k": round(
+                        len(found & expected) / len(expected), 4
+                    )
+                    if expected
+                    else None,
+                    "ann_recall_at_k": round(ann_recall, 4),
+                    "cold_ms": round(run_times[0], 2),
+                    "decrypted_entries": first_decrypts,
+                }
+            )
+
+        def _mean(key: str) -> float:
+            values = [q[key] for q in per_query if q[key] is not None]
+            return round(sum(values) / len(values), 4) if values else 0.0
+
+        index = api.vector_search.index_store.indexes.get(user_id)
+        report = {
+            "config": {
+                "embedder": args.embedder,
+                "years": args.years,
+                "entries": entry_count,
+                "k": args.k,
+                "repeat": args.repeat,
+                "seed": args.seed,
+                "ef": args.ef,
+                "hnsw_m": args.hnsw_m or entry_ann._HNSW_M,
+                "overrides": args.overrides,
+                "search": api.config.as_dict(),
+            },
+            "ingest_s": round(ingest_s, 2),
+            "needle_recall_at_k": _mean("needle_recall_at_k"),
+            "ann_recall_at_k": _mean("ann_recall_at_k"),
+            "latency_ms": {"cold": _percentiles(cold), "warm": _percentiles(warm)},
+            "decrypted_per_query": _mean("decrypted_entries"),
+            "index": {
+                "vectors": index.vector_count if index else 0,
+                "entries": index.entry_count if index else 0,
+                "exact": index.is_exact if index else None,
+                "memory_bytes": index.estimated_memory_bytes() if index else 0,
+            },
+            "queries": per_query,
+        }
+        await api.stop()
+        return report
+    finally:
+        await db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--years", type=float, default=3.0)
+    parser.add_argument(
+        "--entries-per-day", type=int, default=2, help="Average user entries per day"
+    )
+    parser.add_argument("--reply-rate", type=float, default=0.3)
+    parser.add_argument("--needles", type=int, default=5, help="Planted hits per query")
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--embedder", choices=("hash", "model"), default="hash")
+    parser.add_argument("--dim", type=int, default=384, help="Hash embedder size")
+    parser.add_argument("--ef", type=int, default=0, help="hnsw ef at query time")
+    parser.add_argument("--hnsw-m", type=int, default=0, help="hnsw M for new graphs")
+    parser.add_argument(
+        "--set",
+        dest="settings",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Override a setting, e.g. SEARCH.progressive.k1=256",
+    )
+    parser.add_argument("--db-dir", help="Keep the generated database here")
+    parser.add_argument("--json", action="store_true", help="Emit JSON only")
+    args = parser.parse_args()
+    args.overrides = _apply_overrides(args.settings)
+
+    report = asyncio.run(_run(args))
+    if args.json:
+        print(orjson.dumps(report, option=orjson.OPT_INDENT_2).decode())
+        return
+    latency = report["latency_ms"]
+    print(
+        f"{report['config']['entries']} entries, ingest {report['ingest_s']}s, "
+        f"index {report['index']['vectors']} vectors / "
+        f"{report['index']['memory_bytes'] / 1024:.0f} KiB"
+    )
+    print(
+        f"needle@k={report['needle_recall_at_k']:.4f}  "
+        f"ann@k={report['ann_recall_at_k']:.4f}  "
+        f"decrypted/query={report['decrypted_per_query']}"
+    )
+    for phase in ("cold", "warm"):
+        p = latency[phase]
+        print(f"{phase:>5}  p50={p['p50']}ms  p95={p['p95']}ms  p99={p['p99']}ms")
+    for row in report["queries"]:
+        print(
+            f"  {row['query'][:32]:<32}  needle={row['needle_recall_at_k']}  "
+            f"ann={row['ann_recall_at_k']}  cold={row['cold_ms']}ms  "
+            f"decrypted={row['decrypted_entries']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
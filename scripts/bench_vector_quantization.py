@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Measure recall and storage cost of the supported vector dtypes.
+
+Vectors are synthetic (clustered, unit-normalised, embedding-like). Every
+dtype is round-tripped through the same codec used by the vectors table,
+indexed with ``EntryIndex`` and queried; recall@k is measured against an
+exact float32 brute-force baseline. Each exact-search matrix dtype is
+measured the same way, with the resident bytes of the index.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import orjson
+
+from llamora.app.embed.quantization import VECTOR_DTYPES, decode_vector, encode_vector
+from llamora.app.index.entry_ann import EntryIndex
+
+
+# XChaCha20-Poly1305 tag plus the separately stored 24 byte nonce.
+_CIPHER_OVERHEAD = 16 + 24
+
+
+def _synthetic_vectors(
+    rng: np.random.Generator, count: int, dim: int, clusters: int
+) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    assignment = rng.integers(0, clusters, size=count)
+    noise = rng.standard_normal((count, dim)).astype(np.float32) * 0.35
+    vecs = centers[assignment] + noise
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+def _exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    scores = queries @ corpus.T
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return top
+
+
+def _bench_dtype(
+    dtype: str,
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    truth: np.ndarray,
+    k: int,
+) -> dict[str, float | int | str]:
+    dim = corpus.shape[1]
+    payloads = [encode_vector(vec, dtype)[1] for vec in corpus]
+    decoded = np.stack([decode_vector(payload, dtype, dim) for payload in payloads])
+    max_error = float(np.abs(decoded - corpus).max())
+    # Quantization error alone, independent of the approximate graph search.
+    exact = _exact_top_k(decoded, queries, k)
+    exact_hits = sum(
+        len(set(row.tolist()).intersection(expected.tolist()))
+        for row, expected in zip(exact, truth)
+    )
+
+    ids = [f"e{n:08d}::c0" for n in range(len(corpus))]
+    index = EntryIndex(dim, len(corpus), initial_capacity=len(corpus))
+    started = time.perf_counter()
+    index.add_batch(ids, decoded)
+    build_s = time.perf_counter() - started
+
+    hits = 0
+    started = time.perf_counter()
+    for query, expected in zip(queries, truth):
+        found, _ = index.search(query, k)
+        found_rows = {int(vector_id[1:9]) for vector_id in found}
+        hits += len(found_rows.intersection(expected.tolist()))
+    query_ms = (time.perf_counter() - started) * 1000.0 / max(len(queries), 1)
+
+    payload_bytes = sum(len(payload) for payload in payloads) / len(payloads)
+    return {
+        "dtype": dtype,
+        "recall_at_k": round(hits / (len(queries) * k), 4),
+        "exact_recall_at_k": round(exact_hits / (len(queries) * k), 4),
+        "max_abs_error": round(max_error, 6),
+        "payload_bytes": round(payload_bytes, 1),
+        "row_bytes": round(payload_bytes + _CIPHER_OVERHEAD, 1),
+        "build_s": round(build_s, 3),
+        "query_ms": round(query_ms, 3),
+    }
+
+
+def _bench_exact_dtype(
+    dtype: str,
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    truth: np.ndarray,
+    k: int,
+) -> dict[str, float | int | str]:
+    ids = [f"e{n:08d}::c0" for n in range(len(corpus))]
+    index = EntryIndex(
+        corpus.shape[1],
+        len(corpus),
+        initial_capacity=len(corpus),
+        exact_threshold=len(corpus),
+        exact_dtype=dtype,
+    )
+    index.add_batch(ids, corpus)
+
+    hits = 0
+    started = time.perf_counter()
+    for query, expected in zip(queries, truth):
+        found, _ = index.search(query, k)
+        found_rows = {int(vector_id[1:9]) for vector_id in found}
+        hits += len(found_rows.intersection(expected.tolist()))
+    query_ms = (time.perf_counter() - started) * 1000.0 / max(len(queries), 1)
+    return {
+        "exact_dtype": dtype,
+        "recall_at_k": round(hits / (len(queries) * k), 4),
+        "resident_bytes": index.estimated_memory_bytes(),
+        "query_ms": round(query_ms, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--clusters", type=int, default=64)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Emit JSON only")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    corpus = _synthetic_vectors(rng, args.count, args.dim, args.clusters)
+    queries = _synthetic_vectors(rng, args.queries, args.dim, args.clusters)
+    truth = _exact_top_k(corpus, queries, args.k)
+
+    results = [
+        _bench_dtype(dtype, corpus, queries, truth, args.k) for dtype in VECTOR_DTYPES
+    ]
+    exact_results = [
+        _bench_exact_dtype(dtype, corpus, queries, truth, args.k)
+        for dtype in VECTOR_DTYPES
+    ]
+    if args.json:
+        payload = {"storage": results, "exact_index": exact_results}
+        print(orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode())
+        return
+    for result in results:
+        print(
+            "{dtype:>8}  recall@k={recall_at_k:.4f}  "
+            "exact@k={exact_recall_at_k:.4f}  row={row_bytes:>7}B  "
+            "max_err={max_abs_error:.5f}  query={query_ms:.2f}ms".format(**result)
+        )
+    for result in exact_results:
+        print(
+            "{exact_dtype:>8}  exact index recall@k={recall_at_k:.4f}  "
+            "resident={resident_bytes}B  query={query_ms:.2f}ms".format(**result)
+        )
+
+
+if __name__ == "__main__":
+    main()
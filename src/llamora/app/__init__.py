@@ -142,6 +142,7 @@ def create_app():
         PERMANENT_SESSION_LIFETIME=settings.SESSION.permanent_lifetime,
         WTF_CSRF_TIME_LIMIT=settings.SESSION.csrf_time_limit,
         EMBED_MODEL=settings.EMBEDDING.model,
+        RELATED_ENTRIES_ENABLED=bool(settings.EMBEDDING.related.enabled),
         STATIC_BUNDLES=static_bundles,
         STATIC_MANIFEST=asset_manifest,
         STATIC_DIST_PATH=str(dist_dir),
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 import importlib
+import inspect
 import logging
 import time
-from typing import Any, Callable, Sequence, Tuple, Type
+from typing import Any, AsyncIterator, Callable, Sequence, Tuple, Type
 
 import orjson
 
 from llamora.app.services.index_worker import IndexWorker
+from llamora.app.services.lexical_index import LexicalIndexService
 from llamora.app.services.lexical_reranker import LexicalReranker
 from llamora.app.services.search_config import SearchConfig
+from llamora.app.services.search_filters import SearchFilters
 from llamora.app.services.crypto import CryptoContext
 from llamora.app.services.search_pipeline import (
     BaseSearchCandidateGenerator,
@@ -20,10 +23,12 @@ from llamora.app.services.search_pipeline import (
     DefaultSearchNormalizer,
     DefaultSearchReranker,
     DefaultTagEnricher,
+    FusionTagEnricher,
     InvalidSearchQuery,
     SearchPipeline,
     SearchPipelineComponents,
     SearchPipelineResult,
+    SearchResultCache,
 )
 from llamora.app.services.service_pulse import ServicePulse
 from llamora.app.services.tag_service import TagService
@@ -55,10 +60,12 @@ class SearchAPI:
         config: SearchConfig | None = None,
         service_pulse: ServicePulse | None = None,
         tag_service: TagService | None = None,
+        lexical_index: LexicalIndexService | None = None,
     ) -> None:
         self.db = db
         self.config = config or SearchConfig.from_settings(settings)
         self.vector_search = vector_search or VectorSearchService(db, self.config)
+        self.lexical_index = lexical_index or LexicalIndexService(db, self.config)
         self._tag_service = tag_service or TagService(db)
         self._service_pulse = service_pulse
         self._pipeline_overrides = self._read_pipeline_overrides(settings)
@@ -71,7 +78,17 @@ class SearchAPI:
             tag_enricher,
             reranker,
         )
-        self._pipeline = SearchPipeline(components)
+        self.result_cache = SearchResultCache(
+            self._index_revision,
+            max_entries=self.config.query_cache.max_entries_per_user,
+            max_users=self.config.query_cache.max_users,
+        )
+        self._pipeline = SearchPipeline(
+            components,
+            hydrator=self.vector_search.hydrate_candidates,
+            rerank_window=self.config.rerank_window,
+            result_cache=self.result_cache,
+        )
 
         reranker_component = components.reranker
         self.lexical_reranker = getattr(
@@ -82,6 +99,7 @@ class SearchAPI:
 
         self._stream_manager = SearchStreamManager(
             vector_search=self.vector_search,
+            lexical_index=self.lexical_index,
             pipeline_components=components,
             config=self.config,
             stream_ttl=float(getattr(settings.SEARCH, "stream_ttl", 900)),
@@ -93,6 +111,10 @@ class SearchAPI:
                 getattr(settings.SEARCH, "stream_global_memory_budget_bytes", 0)
             ),
             service_pulse=self._service_pulse,
+            stream_plaintext_cache_bytes=int(
+                getattr(settings.SEARCH, "stream_plaintext_cache_bytes", 0)
+            ),
+            result_cache=self.result_cache,
         )
 
         self._emit_config_diagnostics()
@@ -104,6 +126,12 @@ class SearchAPI:
             flush_interval=float(settings.WORKERS.index_worker.flush_interval),
         )
 
+    def _index_revision(self, user_id: str) -> tuple[int, int]:
+        return (
+            self.vector_search.index_store.revision(user_id),
+            self.lexical_index.revision(user_id),
+        )
+
     async def warm_index(self, ctx: CryptoContext) -> None:
         """Ensure the vector index for ``user_id`` is resident in memory."""
 
@@ -131,6 +159,11 @@ class SearchAPI:
         """Stop background services for the search API."""
 
         await self._index_worker.stop()
+        self.lexical_index.close()
+        try:
+            await self.vector_search.index_store.persist_snapshots(force=True)
+        except Exception:  # pragma: no cover - defensive logging
+            logger.exception("Failed to persist entry index snapshots on shutdown")
 
     async def enqueue_index_job(
         self,
@@ -161,8 +194,14 @@ class SearchAPI:
             else:
                 content = record.get("text", content)
             parsed.append((ctx, entry_id, content))
+            self._stream_manager.invalidate_entries(ctx.user_id, [entry_id])
 
         await self.vector_search.index_store.bulk_index(parsed)
+        await self.lexical_index.bulk_index(parsed)
+        # Searches that started before the write must not cache their result
+        # under the revision the write produced.
+        for user_id in {job[0].user_id for job in parsed}:
+            self.result_cache.bump(user_id)
 
         elapsed_ms = (time.perf_counter() - start) * 1000
         logger.info(
@@ -180,6 +219,8 @@ class SearchAPI:
         query: str,
         k1: int | None = None,
         k2: int | None = None,
+        *,
+        filters: SearchFilters | None = None,
     ) -> tuple[str, list[dict], bool]:
         cfg = self.config.progressive
         resolved_k1 = int(k1) if k1 is not None else cfg.k1
@@ -196,6 +237,7 @@ class SearchAPI:
             query,
             resolved_k1,
             resolved_k2,
+            filters=filters,
         )
 
         if not result.candidates:
@@ -243,9 +285,18 @@ class SearchAPI:
 
     async def maintenance_tick(self) -> None:
         await self.vector_search.maintenance_tick()
+        await self.lexical_index.maintenance()
 
     async def delete_entries(self, user_id: str, entry_ids: Sequence[str]) -> None:
         await self.vector_search.index_store.remove_entries(user_id, entry_ids)
+        self._stream_manager.invalidate_entries(user_id, entry_ids)
+        self.result_cache.bump(user_id)
+
+    def forget(self, user_id: str) -> None:
+        """Drop everything search keeps in memory for ``user_id`` but the index."""
+
+        self._stream_manager.forget(user_id)
+        self.result_cache.invalidate(user_id)
 
     async def search_stream(
         self,
@@ -257,6 +308,8 @@ class SearchAPI:
         result_window: int,
         k1: int | None = None,
         k2: int | None = None,
+        filters: SearchFilters | None = None,
+        backfill: bool | None = None,
     ) -> SearchStreamResult:
         """Incrementally fetch search results without computing the full window."""
 
@@ -268,6 +321,33 @@ class SearchAPI:
             result_window=result_window,
             k1=k1,
             k2=k2,
+            filters=filters,
+            backfill=backfill,
+        )
+
+    def search_stream_rounds(
+        self,
+        ctx: CryptoContext,
+        query: str,
+        *,
+        session_id: str | None,
+        page_limit: int,
+        result_window: int,
+        k1: int | None = None,
+        k2: int | None = None,
+        filters: SearchFilters | None = None,
+    ) -> AsyncIterator[SearchStreamResult]:
+        """Yield a refreshed first page after each progressive search round."""
+
+        return self._stream_manager.stream_rounds(
+            ctx=ctx,
+            query=query,
+            session_id=session_id,
+            page_limit=page_limit,
+            result_window=result_window,
+            k1=k1,
+            k2=k2,
+            filters=filters,
         )
 
     def _build_pipeline_components(
@@ -297,6 +377,9 @@ class SearchAPI:
                 lambda: {
                     "vector_search": self.vector_search,
                     "config": self.config,
+                    "lexical_index": self.lexical_index,
+                    "db": self.db,
+                    "tag_service": self._tag_service,
                 },
             ),
             "tag_enricher": (
@@ -317,6 +400,12 @@ class SearchAPI:
 
         components: dict[str, Any] = {}
         for key, (provided, default_cls, kwargs_factory) in component_builders.items():
+            if key == "tag_enricher" and getattr(
+                components["candidate_generator"], "provides_tag_matches", False
+            ):
+                # The generator already fetched tag matches alongside its
+                # other retrievers; enriching again would repeat the query.
+                default_cls = FusionTagEnricher
             components[key] = self._resolve_component(
                 provided,
                 key,
@@ -340,13 +429,25 @@ class SearchAPI:
         override_cls = self._load_component_class(key)
         if override_cls is not None:
             try:
-                return override_cls(**kwargs)
+                return override_cls(**self._accepted_kwargs(override_cls, kwargs))
             except Exception:  # pragma: no cover - defensive logging
                 logger.exception(
                     "Failed to initialise search pipeline override for %s", key
                 )
 
-        return default_cls(**kwargs)
+        return default_cls(**self._accepted_kwargs(default_cls, kwargs))
+
+    @staticmethod
+    def _accepted_kwargs(target: Type[Any], kwargs: dict[str, Any]) -> dict[str, Any]:
+        """Drop the dependencies ``target`` does not ask for in its constructor."""
+
+        try:
+            params = inspect.signature(target).parameters
+        except (TypeError, ValueError):
+            return kwargs
+        if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values()):
+            return kwargs
+        return {name: value for name, value in kwargs.items() if name in params}
 
     def _load_component_class(self, key: str) -> Type[Any] | None:
         path = self._pipeline_overrides.get(key)
@@ -2,6 +2,8 @@ from .users import UsersRepository
 from .entries import EntriesRepository
 from .tags import TagsRepository
 from .vectors import VectorsRepository
+from .lexical import LexicalIndexRepository
+from .related import RelatedEntriesRepository
 from .search_history import SearchHistoryRepository
 
 __all__ = [
@@ -9,5 +11,7 @@ __all__ = [
     "EntriesRepository",
     "TagsRepository",
     "VectorsRepository",
+    "LexicalIndexRepository",
+    "RelatedEntriesRepository",
     "SearchHistoryRepository",
 ]
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 import re
+import time
 from datetime import date as _date_type
-from typing import Awaitable, Callable, Iterable, Mapping
+from typing import Awaitable, Callable, Iterable, Mapping, Sequence
 
 import orjson
 from aiosqlitepool import SQLiteConnectionPool
@@ -12,7 +14,13 @@ from ulid import ULID
 from llamora.llm.tokenizers.tokenizer import count_message_tokens
 
 from llamora.app.services.crypto import CryptoContext
-from llamora.app.services.digest_policy import ENTRY_DIGEST_VERSION, day_digest
+from llamora.app.services.digest_policy import (
+    ENTRY_DIGEST_VERSION,
+    day_digest,
+    digest_policy_tag,
+)
+from llamora.app.services.entry_record_cache import EntryRecordCache
+from llamora.settings import settings
 
 from .base import BaseRepository
 from .events import (
@@ -21,12 +29,19 @@ from .events import (
     ENTRY_UPDATED_EVENT,
     RepositoryEventBus,
 )
-from .utils import cached_tag_name, get_month_bounds
+from .utils import adjust_tag_digests, cached_tag_name, get_month_bounds
+
+logger = logging.getLogger(__name__)
 
 EntryAppendedCallback = Callable[[CryptoContext, str, str], Awaitable[None]]
 
 _FLAG_PATTERN = re.compile(r"^[a-z0-9_]+$")
 _AUTO_OPENING_FLAG = "auto_opening"
+_METADATA_BATCH_SIZE = 500
+# Reads up to this many rows decrypt inline; larger ones go to worker threads
+# one chunk at a time so the event loop keeps serving other requests.
+_INLINE_DECRYPT_ROWS = 32
+_DECRYPT_CHUNK_ROWS = 256
 
 _ENTRY_COLUMNS: tuple[str, ...] = (
     "m.id",
@@ -88,10 +103,19 @@ class EntriesRepository(BaseRepository):
         super().__init__(pool)
         self._on_entry_appended: EntryAppendedCallback | None = None
         self._event_bus = event_bus
+        self.record_cache = EntryRecordCache(
+            int(settings.SESSION.entry_cache_bytes),
+            float(settings.SESSION.entry_cache_ttl),
+        )
 
     def set_on_entry_appended(self, callback: EntryAppendedCallback | None) -> None:
         self._on_entry_appended = callback
 
+    def forget(self, user_id: str) -> None:
+        """Drop the decrypted records cached for ``user_id``, e.g. on logout."""
+
+        self.record_cache.forget(user_id)
+
     @staticmethod
     def _decrypt_row_to_record(
         ctx: CryptoContext, row, *, alg_col: str = "alg"
@@ -113,35 +137,89 @@ class EntriesRepository(BaseRepository):
                 digests.append(digest)
         return digests
 
-    def _rows_to_entries(
-        self, rows, ctx: CryptoContext
-    ) -> list[dict]:  # pragma: no cover - trivial helper
-        entries: list[dict] = []
-        for row in rows:
-            rec = self._decrypt_row_to_record(ctx, row)
-            entries.append(
-                {
-                    "id": row["id"],
-                    "created_at": row["created_at"],
-                    "updated_at": row["updated_at"],
-                    "created_date": row["created_date"],
-                    "role": row["role"],
-                    "reply_to": row["reply_to"],
-                    "text": rec.get("text", ""),
-                    "meta": rec.get("meta", {}),
-                    "prompt_tokens": int(row["prompt_tokens"] or 0),
-                    "digest": row["digest"],
-                }
+    @classmethod
+    def _decrypt_rows(
+        cls, ctx: CryptoContext, rows, alg_col: str = "alg"
+    ) -> list[dict]:
+        return [cls._decrypt_row_to_record(ctx, row, alg_col=alg_col) for row in rows]
+
+    async def _decrypt_records(
+        self, ctx: CryptoContext, rows, *, alg_col: str = "alg"
+    ) -> list[dict]:
+        """Decrypt the record of each row, reusing cached plaintext.
+
+        Cache misses of large reads are decrypted off the event loop.
+        """
+
+        cache = self.record_cache
+        records: list[dict | None] = [
+            cache.get(ctx.user_id, row["id"], row["nonce"]) for row in rows
+        ]
+        missing = [row for row, rec in zip(rows, records) if rec is None]
+        if not missing:
+            return records  # type: ignore[return-value]
+
+        if len(missing) <= _INLINE_DECRYPT_ROWS:
+            decrypted = self._decrypt_rows(ctx, missing, alg_col)
+        else:
+            started = time.perf_counter()
+            decrypted = []
+            for start in range(0, len(missing), _DECRYPT_CHUNK_ROWS):
+                decrypted.extend(
+                    await asyncio.to_thread(
+                        self._decrypt_rows,
+                        ctx,
+                        missing[start : start + _DECRYPT_CHUNK_ROWS],
+                        alg_col,
+                    )
+                )
+            logger.debug(
+                "Decrypted %d entries for user %s in %.1fms",
+                len(missing),
+                ctx.user_id,
+                (time.perf_counter() - started) * 1000,
             )
-        return entries
 
-    def _rows_to_history(self, rows, ctx: CryptoContext) -> list[dict]:
+        fresh = iter(decrypted)
+        for position, row in enumerate(rows):
+            if records[position] is None:
+                rec = next(fresh)
+                cache.put(ctx.user_id, row["id"], row["nonce"], rec)
+                records[position] = rec
+        return records  # type: ignore[return-value]
+
+    async def _rows_to_entries(self, rows, ctx: CryptoContext) -> list[dict]:
+        records = await self._decrypt_records(ctx, rows)
+        return [
+            {
+                "id": row["id"],
+                "created_at": row["created_at"],
+                "updated_at": row["updated_at"],
+                "created_date": row["created_date"],
+                "role": row["role"],
+                "reply_to": row["reply_to"],
+                "text": rec.get("text", ""),
+                "meta": rec.get("meta", {}),
+                "prompt_tokens": int(row["prompt_tokens"] or 0),
+                "digest": row["digest"],
+            }
+            for row, rec in zip(rows, records)
+        ]
+
+    async def _rows_to_history(self, rows, ctx: CryptoContext) -> list[dict]:
+        # Rows repeat per tag; decrypt each entry once.
+        entry_rows = [
+            row
+            for position, row in enumerate(rows)
+            if position == 0 or rows[position - 1]["id"] != row["id"]
+        ]
+        records = iter(await self._decrypt_records(ctx, entry_rows, alg_col="msg_alg"))
         history: list[dict] = []
         current: dict | None = None
         for row in rows:
             entry_id = row["id"]
             if not history or history[-1]["id"] != entry_id:
-                rec = self._decrypt_row_to_record(ctx, row, alg_col="msg_alg")
+                rec = next(records)
                 current = {
                     "id": entry_id,
                     "created_at": row["created_at"],
@@ -213,6 +291,78 @@ class EntriesRepository(BaseRepository):
             "tags": [{"hash": tag_hash} for tag_hash in tag_hashes],
         }
 
+    async def _refresh_day_stats(
+        self, conn, user_id: str, created_dates: Iterable[str | None]
+    ) -> dict[str, str]:
+        """Recompute the ``day_stats`` rows of ``created_dates`` from entries.
+
+        Runs on ``conn`` so writers can call it inside the transaction that
+        changed the entries. Returns the aggregate digest of each date.
+        """
+
+        digests: dict[str, str] = {}
+        for created_date in sorted({value for value in created_dates if value}):
+            cursor = await conn.execute(
+                """
+                SELECT digest, flags
+                FROM entries
+                WHERE user_id = ? AND created_date = ?
+                """,
+                (user_id, created_date),
+            )
+            rows = await cursor.fetchall()
+            await cursor.close()
+            digest = day_digest(self._collect_digests(rows))
+            digests[created_date] = digest
+            if not rows:
+                await conn.execute(
+                    "DELETE FROM day_stats WHERE user_id = ? AND created_date = ?",
+                    (user_id, created_date),
+                )
+                continue
+            opening = sum(
+                1
+                for row in rows
+                if _AUTO_OPENING_FLAG in parse_entry_flags(row["flags"])
+            )
+            await conn.execute(
+                """
+                INSERT INTO day_stats
+                    (user_id, created_date, entry_count, opening_count, digest)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(user_id, created_date) DO UPDATE SET
+                    entry_count = excluded.entry_count,
+                    opening_count = excluded.opening_count,
+                    digest = excluded.digest
+                """,
+                (user_id, created_date, len(rows), opening, digest),
+            )
+        return digests
+
+    async def _current_day_digests(self, conn, user_id: str, rows) -> dict[str, str]:
+        """Map ``day_stats`` rows to digests, recomputing stale ones.
+
+        A digest is stale when the row was backfilled without one, or was
+        computed under an older digest policy or entry key.
+        """
+
+        policy_prefix = f"{digest_policy_tag()}:"
+        digests: dict[str, str] = {}
+        stale: list[str] = []
+        for row in rows:
+            digest = row["digest"]
+            if digest and digest.startswith(policy_prefix):
+                digests[row["created_date"]] = digest
+            else:
+                stale.append(row["created_date"])
+        if stale:
+            digests.update(
+                await self._run_in_transaction(
+                    conn, self._refresh_day_stats, conn, user_id, stale
+                )
+            )
+        return digests
+
     async def _emit_entry_date_event(
         self,
         event_name: str,
@@ -355,6 +505,10 @@ class EntriesRepository(BaseRepository):
                 cursor = await conn.execute(sql, tuple(params))
                 row = await cursor.fetchone()
                 await cursor.close()
+                if row:
+                    await self._refresh_day_stats(
+                        conn, ctx.user_id, (row["created_date"],)
+                    )
                 return row
 
             row = await self._run_in_transaction(conn, _execute_and_fetch)
@@ -438,6 +592,24 @@ class EntriesRepository(BaseRepository):
             tag_hashes = self._normalize_tag_hashes(tag_rows)
 
             async def _execute_deletes():
+                digest_cursor = await conn.execute(
+                    f"""
+                    SELECT x.tag_hash, e.digest
+                    FROM tag_entry_xref x
+                    JOIN entries e ON e.id = x.entry_id
+                    WHERE x.user_id = ? AND x.entry_id IN ({placeholders})
+                    """,
+                    (user_id, *delete_ids),
+                )
+                removed: dict[bytes, list[str]] = {}
+                for link in await digest_cursor.fetchall():
+                    removed.setdefault(link["tag_hash"], []).append(link["digest"])
+                await digest_cursor.close()
+                await adjust_tag_digests(
+                    conn,
+                    user_id,
+                    {tag: ((), digests) for tag, digests in removed.items()},
+                )
                 await conn.execute(
                     f"""
                     DELETE FROM tag_entry_xref
@@ -459,6 +631,7 @@ class EntriesRepository(BaseRepository):
                     """,
                     (user_id, *delete_ids),
                 )
+                await self._refresh_day_stats(conn, user_id, created_dates)
 
             await self._run_in_transaction(conn, _execute_deletes)
 
@@ -486,7 +659,7 @@ class EntriesRepository(BaseRepository):
         async with self.pool.connection() as conn:
             cursor = await conn.execute(
                 """
-                SELECT id, role, reply_to, nonce, ciphertext, alg, flags, created_at, updated_at, created_date
+                SELECT id, role, reply_to, nonce, ciphertext, alg, flags, digest, created_at, updated_at, created_date
                 FROM entries
                 WHERE id = ? AND user_id = ?
                 """,
@@ -543,6 +716,25 @@ class EntriesRepository(BaseRepository):
                 )
                 updated_row = await cursor.fetchone()
                 await cursor.close()
+                await self._refresh_day_stats(conn, ctx.user_id, (row["created_date"],))
+                if row["digest"] != digest:
+                    link_cursor = await conn.execute(
+                        """
+                        SELECT tag_hash FROM tag_entry_xref
+                        WHERE user_id = ? AND entry_id = ?
+                        """,
+                        (ctx.user_id, entry_id),
+                    )
+                    links = await link_cursor.fetchall()
+                    await link_cursor.close()
+                    await adjust_tag_digests(
+                        conn,
+                        ctx.user_id,
+                        {
+                            link["tag_hash"]: ((digest,), (row["digest"],))
+                            for link in links
+                        },
+                    )
                 return updated_row
 
             updated_row = await self._run_in_transaction(conn, _execute_update)
@@ -590,6 +782,28 @@ class EntriesRepository(BaseRepository):
             row = await cursor.fetchone()
         return row["created_date"] if row else None
 
+    async def get_entry_filter_metadata(
+        self, user_id: str, entry_ids: Sequence[str]
+    ) -> list[tuple[str, str, str | None]]:
+        """Return ``(id, role, created_date)`` for ``entry_ids`` without decrypting."""
+
+        ids = [entry_id for entry_id in entry_ids if entry_id]
+        rows = []
+        async with self.pool.connection() as conn:
+            for start in range(0, len(ids), _METADATA_BATCH_SIZE):
+                batch = ids[start : start + _METADATA_BATCH_SIZE]
+                placeholders = ",".join("?" for _ in batch)
+                cursor = await conn.execute(
+                    f"""
+                    SELECT id, role, created_date
+                    FROM entries
+                    WHERE user_id = ? AND id IN ({placeholders})
+                    """,
+                    (user_id, *batch),
+                )
+                rows.extend(await cursor.fetchall())
+        return [(row["id"], row["role"], row["created_date"]) for row in rows]
+
     async def broadcast_entry_changed(self, user_id: str, entry_id: str) -> None:
         created_date = await self.get_entry_date(user_id, entry_id)
         if not created_date:
@@ -618,7 +832,7 @@ class EntriesRepository(BaseRepository):
             )
             rows = await cursor.fetchall()
 
-        return self._rows_to_entries(rows, ctx)
+        return await self._rows_to_entries(rows, ctx)
 
     async def get_entries_older_than(
         self, ctx: CryptoContext, before_id: str, limit: int
@@ -636,7 +850,7 @@ class EntriesRepository(BaseRepository):
             )
             rows = await cursor.fetchall()
 
-        return self._rows_to_entries(rows, ctx)
+        return await self._rows_to_entries(rows, ctx)
 
     async def get_user_latest_entry_id(self, user_id: str) -> str | None:
         async with self.pool.connection() as conn:
@@ -670,7 +884,7 @@ class EntriesRepository(BaseRepository):
             )
             rows = await cursor.fetchall()
 
-        return self._rows_to_entries(rows, ctx)
+        return await self._rows_to_entries(rows, ctx)
 
     async def get_recall_candidates_by_ids(
         self,
@@ -713,7 +927,7 @@ class EntriesRepository(BaseRepository):
             cursor = await conn.execute(sql, params)
             rows = await cursor.fetchall()
 
-        return self._rows_to_entries(rows, ctx)
+        return await self._rows_to_entries(rows, ctx)
 
     async def get_entries_by_reply_to_ids(
         self, ctx: CryptoContext, reply_to_ids: list[str]
@@ -733,7 +947,7 @@ class EntriesRepository(BaseRepository):
             )
             rows = await cursor.fetchall()
 
-        return self._rows_to_entries(rows, ctx)
+        return await self._rows_to_entries(rows, ctx)
 
     async def get_entries_for_date(
         self, ctx: CryptoContext, created_date: str
@@ -763,7 +977,7 @@ class EntriesRepository(BaseRepository):
             )
             rows = await cursor.fetchall()
 
-        return self._rows_to_history(rows, ctx)
+        return await self._rows_to_history(rows, ctx)
 
     async def get_recent_entries(
         self, ctx: CryptoContext, created_date: str, limit: int
@@ -799,7 +1013,7 @@ class EntriesRepository(BaseRepository):
             )
             rows = await cursor.fetchall()
 
-        return self._rows_to_history(rows, ctx)
+        return await self._rows_to_history(rows, ctx)
 
     async def get_days_with_entries(
         self, user_id: str, year: int, month: int
@@ -808,35 +1022,27 @@ class EntriesRepository(BaseRepository):
         active_days: set[int] = set()
         opening_only_days: set[int] = set()
 
-        opening_like = f"%|{_AUTO_OPENING_FLAG}|%"
         async with self.pool.connection() as conn:
             cursor = await conn.execute(
                 """
-                SELECT created_date AS created_date,
-                       COUNT(*) AS total_entries,
-                       SUM(CASE WHEN flags LIKE ? THEN 1 ELSE 0 END) AS opening_entries
-                FROM entries
+                SELECT created_date, entry_count, opening_count
+                FROM day_stats
                 WHERE user_id = ? AND created_date >= ? AND created_date < ?
-                GROUP BY created_date
                 """,
-                (opening_like, user_id, month_start, next_month_start),
+                (user_id, month_start, next_month_start),
             )
             rows = await cursor.fetchall()
 
         for row in rows:
-            created_date = row["created_date"]
-            if not created_date:
-                continue
             try:
-                day = _date_type.fromisoformat(created_date).day
+                day = _date_type.fromisoformat(row["created_date"]).day
             except (TypeError, ValueError):
                 continue
-            total = row["total_entries"] or 0
-            opening = row["opening_entries"] or 0
+            total = row["entry_count"] or 0
             if total <= 0:
                 continue
             active_days.add(day)
-            if opening == total:
+            if (row["opening_count"] or 0) == total:
                 opening_only_days.add(day)
 
         return sorted(active_days), sorted(opening_only_days)
@@ -849,25 +1055,20 @@ class EntriesRepository(BaseRepository):
             cursor = await conn.execute(
                 """
                 SELECT created_date, digest
-                FROM entries
+                FROM day_stats
                 WHERE user_id = ? AND created_date >= ? AND created_date < ?
                 """,
                 (user_id, month_start, next_month_start),
             )
             rows = await cursor.fetchall()
+            digests = await self._current_day_digests(conn, user_id, rows)
         summary_digests: dict[int, str] = {}
-        digests_by_day: dict[int, list[str]] = {}
-        for row in rows:
-            created_date = row["created_date"] or ""
-            if not created_date:
-                continue
+        for created_date, digest in digests.items():
             try:
                 day = _date_type.fromisoformat(created_date).day
             except (TypeError, ValueError):
                 continue
-            digests_by_day.setdefault(day, []).append(row)
-        for day, digests in digests_by_day.items():
-            summary_digests[day] = day_digest(self._collect_digests(digests))
+            summary_digests[day] = digest
         return summary_digests
 
     async def get_day_summary_digest_for_date(
@@ -876,15 +1077,16 @@ class EntriesRepository(BaseRepository):
         async with self.pool.connection() as conn:
             cursor = await conn.execute(
                 """
-                SELECT digest
-                FROM entries
+                SELECT created_date, digest
+                FROM day_stats
                 WHERE user_id = ? AND created_date = ?
                 """,
                 (user_id, created_date),
             )
             rows = await cursor.fetchall()
+            digests = await self._current_day_digests(conn, user_id, rows)
 
-        return day_digest(self._collect_digests(rows))
+        return digests.get(created_date) or day_digest(())
 
     async def get_first_entry_date(self, user_id: str) -> str | None:
         async with self.pool.connection() as conn:
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable, Sequence
+
+from aiosqlitepool import SQLiteConnectionPool
+
+from .base import BaseRepository
+
+
+# (entry_id, document length, [(token_hash, term frequency), ...])
+LexicalDocument = tuple[str, int, Sequence[tuple[bytes, int]]]
+# (token_hash, entry_id, term frequency, document length)
+LexicalPosting = tuple[bytes, str, int, int]
+
+
+class LexicalIndexRepository(BaseRepository):
+    """Postings and term statistics for the blind lexical index.
+
+    Tokens are only ever seen here as keyed hashes; document frequencies and
+    corpus totals are maintained by triggers on the underlying tables.
+    """
+
+    def __init__(self, pool: SQLiteConnectionPool) -> None:
+        super().__init__(pool)
+
+    async def replace_documents(
+        self, user_id: str, documents: Sequence[LexicalDocument]
+    ) -> int:
+        """Replace the postings of ``documents`` in a single transaction.
+
+        Entries deleted before their index job ran are skipped. Returns the
+        number of documents written.
+        """
+
+        if not documents:
+            return 0
+        entry_ids = [doc[0] for doc in documents]
+        placeholders = ",".join("?" for _ in entry_ids)
+
+        async with self.pool.connection() as conn:
+
+            async def _write() -> int:
+                cursor = await conn.execute(
+                    f"""
+                    SELECT id FROM entries
+                    WHERE user_id = ? AND id IN ({placeholders})
+                    """,
+                    (user_id, *entry_ids),
+                )
+                existing = {row["id"] for row in await cursor.fetchall()}
+                written = 0
+                for entry_id, length, postings in documents:
+                    if entry_id not in existing:
+                        continue
+                    await conn.execute(
+                        "DELETE FROM lexical_postings WHERE entry_id = ?",
+                        (entry_id,),
+                    )
+                    await conn.execute(
+                        """
+                        INSERT INTO lexical_docs (entry_id, user_id, length)
+                        VALUES (?, ?, ?)
+                        ON CONFLICT(entry_id) DO UPDATE SET length = excluded.length
+                        """,
+                        (entry_id, user_id, int(length)),
+                    )
+                    if postings:
+                        await conn.executemany(
+                            """
+                            INSERT INTO lexical_postings (user_id, token_hash, entry_id, tf)
+                            VALUES (?, ?, ?, ?)
+                            """,
+                            [
+                                (user_id, token_hash, entry_id, int(tf))
+                                for token_hash, tf in postings
+                            ],
+                        )
+                    written += 1
+                return written
+
+            return await self._run_in_transaction(conn, _write)
+
+    async def get_corpus_stats(self, user_id: str) -> tuple[int, int]:
+        """Return ``(document count, total token count)`` for ``user_id``."""
+
+        async with self.pool.connection() as conn:
+            cursor = await conn.execute(
+                "SELECT doc_count, total_length FROM lexical_stats WHERE user_id = ?",
+                (user_id,),
+            )
+            row = await cursor.fetchone()
+        if not row:
+            return 0, 0
+        return int(row["doc_count"] or 0), int(row["total_length"] or 0)
+
+    async def get_document_frequencies(
+        self, user_id: str, token_hashes: Sequence[bytes]
+    ) -> dict[bytes, int]:
+        if not token_hashes:
+            return {}
+        placeholders = ",".join("?" for _ in token_hashes)
+        async with self.pool.connection() as conn:
+            cursor = await conn.execute(
+                f"""
+                SELECT token_hash, df FROM lexical_terms
+                WHERE user_id = ? AND token_hash IN ({placeholders})
+                """,
+                (user_id, *token_hashes),
+            )
+            rows = await cursor.fetchall()
+        return {bytes(row["token_hash"]): int(row["df"]) for row in rows}
+
+    async def get_postings(
+        self,
+        user_id: str,
+        token_hashes: Sequence[bytes],
+        *,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        roles: Iterable[str] = (),
+    ) -> list[LexicalPosting]:
+        """Return postings for ``token_hashes`` joined with document lengths.
+
+        Date and role restrictions are applied against ``entries`` in the
+        same query.
+        """
+
+        if not token_hashes:
+            return []
+        placeholders = ",".join("?" for _ in token_hashes)
+        params: list[object] = [user_id, *token_hashes]
+        joins = "JOIN lexical_docs d ON d.entry_id = p.entry_id"
+        conditions = [f"p.user_id = ? AND p.token_hash IN ({placeholders})"]
+        role_list = sorted(set(roles))
+        if date_from is not None or date_to is not None or role_list:
+            joins += " JOIN entries e ON e.id = p.entry_id"
+            if date_from is not None:
+                conditions.append("e.created_date >= ?")
+                params.append(date_from.isoformat())
+            if date_to is not None:
+                conditions.append("e.created_date <= ?")
+                params.append(date_to.isoformat())
+            if role_list:
+                conditions.append(f"e.role IN ({','.join('?' for _ in role_list)})")
+                params.extend(role_list)
+
+        async with self.pool.connection() as conn:
+            cursor = await conn.execute(
+                f"""
+                SELECT p.token_hash, p.entry_id, p.tf, d.length
+                FROM lexical_postings p
+                {joins}
+                WHERE {" AND ".join(conditions)}
+                """,
+                params,
+            )
+            rows = await cursor.fetchall()
+        return [
+            (
+                bytes(row["token_hash"]),
+                row["entry_id"],
+                int(row["tf"]),
+                int(row["length"]),
+            )
+            for row in rows
+        ]
+
+    async def get_unindexed_entry_ids(self, user_id: str, limit: int) -> list[str]:
+        """Return up to ``limit`` of the newest entries missing from the index."""
+
+        async with self.pool.connection() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT m.id FROM entries m
+                WHERE m.user_id = ?
+                  AND NOT EXISTS (
+                    SELECT 1 FROM lexical_docs d WHERE d.entry_id = m.id
+                  )
+                ORDER BY m.id DESC
+                LIMIT ?
+                """,
+                (user_id, int(limit)),
+            )
+            rows = await cursor.fetchall()
+        return [row["id"] for row in rows]
+
+    async def purge_user(self, user_id: str) -> None:
+        """Drop the user's index, e.g. after the hashing key changed."""
+
+        async with self.pool.connection() as conn:
+
+            async def _purge() -> None:
+                await conn.execute(
+                    "DELETE FROM lexical_postings WHERE user_id = ?", (user_id,)
+                )
+                await conn.execute(
+                    "DELETE FROM lexical_docs WHERE user_id = ?", (user_id,)
+                )
+
+            await self._run_in_transaction(conn, _purge)
+
+
+__all__ = ["LexicalDocument", "LexicalIndexRepository", "LexicalPosting"]
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import orjson
+from aiosqlitepool import SQLiteConnectionPool
+
+from .base import BaseRepository
+from llamora.app.services.crypto import CryptoContext
+
+
+# [(neighbour entry_id, cosine score), ...], best first
+Neighbors = list[tuple[str, float]]
+
+
+def _neighbors_aad_id(entry_id: str) -> str:
+    # Keeps a neighbour list from ever decrypting as the entry's own content.
+    return f"{entry_id}:related"
+
+
+class RelatedEntriesRepository(BaseRepository):
+    """Encrypted per-entry nearest-neighbour lists."""
+
+    def __init__(self, pool: SQLiteConnectionPool) -> None:
+        super().__init__(pool)
+        self._purges: dict[str, int] = {}
+
+    def purge_generation(self, user_id: str) -> int:
+        """Return how many times ``user_id``'s lists have been purged."""
+
+        return self._purges.get(user_id, 0)
+
+    async def get_entry_ids_with_neighbors(
+        self, user_id: str, entry_ids: Sequence[str]
+    ) -> set[str]:
+        """Return which of ``entry_ids`` already have a stored neighbour list."""
+
+        ids = [eid for eid in entry_ids if eid]
+        if not ids:
+            return set()
+        found: set[str] = set()
+        # Stay well below SQLite's bound parameter limit.
+        for start in range(0, len(ids), 500):
+            chunk = ids[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            async with self.pool.connection() as conn:
+                cursor = await conn.execute(
+                    f"""
+                    SELECT entry_id FROM entry_neighbors
+                    WHERE user_id = ? AND entry_id IN ({placeholders})
+                    """,
+                    (user_id, *chunk),
+                )
+                rows = await cursor.fetchall()
+            found.update(str(row["entry_id"]) for row in rows)
+        return found
+
+    async def get_neighbors(
+        self, ctx: CryptoContext, entry_ids: Sequence[str]
+    ) -> dict[str, Neighbors]:
+        """Return the decrypted neighbour lists stored for ``entry_ids``."""
+
+        ids = [eid for eid in entry_ids if eid]
+        if not ids:
+            return {}
+        rows = []
+        # Stay well below SQLite's bound parameter limit.
+        for start in range(0, len(ids), 500):
+            chunk = ids[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            async with self.pool.connection() as conn:
+                cursor = await conn.execute(
+                    f"""
+                    SELECT entry_id, nonce, ciphertext, alg
+                    FROM entry_neighbors
+                    WHERE user_id = ? AND entry_id IN ({placeholders})
+                    """,
+                    (ctx.user_id, *chunk),
+                )
+                rows.extend(await cursor.fetchall())
+
+        result: dict[str, Neighbors] = {}
+        for row in rows:
+            entry_id = str(row["entry_id"])
+            try:
+                plaintext = ctx.decrypt_entry(
+                    _neighbors_aad_id(entry_id),
+                    row["nonce"],
+                    row["ciphertext"],
+                    row["alg"].encode(),
+                )
+                payload = orjson.loads(plaintext)
+            except Exception:
+                continue
+            result[entry_id] = [
+                (str(neighbor), float(score)) for neighbor, score in payload
+            ]
+        return result
+
+    async def store_neighbors(
+        self, ctx: CryptoContext, lists: Sequence[tuple[str, Neighbors]]
+    ) -> int:
+        """Encrypt and upsert ``(entry_id, neighbours)`` lists.
+
+        Entries deleted in the meantime are skipped. Returns the number of
+        lists written.
+        """
+
+        if not lists:
+            return 0
+        ctx.require_write(operation="related.store_neighbors")
+        rows = []
+        for entry_id, neighbors in lists:
+            payload = orjson.dumps(
+                [[neighbor, round(float(score), 5)] for neighbor, score in neighbors]
+            ).decode()
+            nonce, ct, alg = ctx.encrypt_entry(_neighbors_aad_id(entry_id), payload)
+            rows.append((entry_id, ctx.user_id, nonce, ct, alg.decode()))
+
+        placeholders = ",".join("?" * len(rows))
+        async with self.pool.connection() as conn:
+
+            async def _write() -> int:
+                cursor = await conn.execute(
+                    f"""
+                    SELECT id FROM entries
+                    WHERE user_id = ? AND id IN ({placeholders})
+                    """,
+                    (ctx.user_id, *(row[0] for row in rows)),
+                )
+                existing = {row["id"] for row in await cursor.fetchall()}
+                live = [row for row in rows if row[0] in existing]
+                if live:
+                    await conn.executemany(
+                        """
+                        INSERT INTO entry_neighbors (entry_id, user_id, nonce, ciphertext, alg)
+                        VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT(entry_id) DO UPDATE SET
+                            nonce = excluded.nonce,
+                            ciphertext = excluded.ciphertext,
+                            alg = excluded.alg,
+                            computed_at = CURRENT_TIMESTAMP
+                        """,
+                        live,
+                    )
+                return len(live)
+
+            return await self._run_in_transaction(conn, _write)
+
+    async def purge_user(self, user_id: str) -> None:
+        """Drop the user's lists, e.g. after the DEK changed."""
+
+        async with self.pool.connection() as conn:
+
+            async def _purge() -> None:
+                await conn.execute(
+                    "DELETE FROM entry_neighbors WHERE user_id = ?", (user_id,)
+                )
+
+            await self._run_in_transaction(conn, _purge)
+        self._purges[user_id] = self._purges.get(user_id, 0) + 1
+
+
+__all__ = ["Neighbors", "RelatedEntriesRepository"]
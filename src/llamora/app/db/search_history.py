@@ -7,13 +7,22 @@ from aiosqlitepool import SQLiteConnectionPool
 from llamora.settings import settings
 from .base import BaseRepository
 from llamora.app.services.crypto import CryptoContext
+from llamora.app.services.search_history_index import (
+    QueryPrefixIndex,
+    SearchHistoryIndex,
+)
 
 
 class SearchHistoryRepository(BaseRepository):
-    """Persist and retrieve encrypted user search history."""
+    """Persist and retrieve encrypted user search history.
+
+    Reads are answered from a per-user :class:`QueryPrefixIndex` that is
+    decrypted once on first use and kept current by :meth:`record_search`.
+    """
 
     def __init__(self, pool: SQLiteConnectionPool) -> None:
         super().__init__(pool)
+        self._indexes = SearchHistoryIndex()
 
     async def record_search(self, ctx: CryptoContext, query: str) -> None:
         """Store or update a search query for the given user."""
@@ -61,23 +70,55 @@ class SearchHistoryRepository(BaseRepository):
 
             await self._run_in_transaction(conn, _tx)
 
+        index = self._indexes.get(ctx.user_id)
+        if index is not None:
+            index.record(normalized)
+
     async def get_recent_searches(self, ctx: CryptoContext, limit: int) -> list[str]:
         """Return the most recent search queries for the user."""
 
+        index = await self._get_index(ctx)
+        return index.recent(limit)
+
+    async def suggest_searches(
+        self, ctx: CryptoContext, prefix: str, limit: int
+    ) -> list[str]:
+        """Return past queries matching ``prefix``, ranked by frecency.
+
+        An empty prefix falls back to the most recent queries.
+        """
+
+        index = await self._get_index(ctx)
+        if not (prefix or "").strip():
+            return index.recent(limit)
+        return index.suggest(prefix, limit)
+
+    def forget(self, user_id: str) -> None:
+        """Drop the in-memory history index of ``user_id``."""
+
+        self._indexes.forget(user_id)
+
+    async def _get_index(self, ctx: CryptoContext) -> QueryPrefixIndex:
+        index = self._indexes.get(ctx.user_id)
+        if index is not None:
+            return index
+
+        max_queries = int(settings.SEARCH.recent_limit)
         async with self.pool.connection() as conn:
             cursor = await conn.execute(
                 """
-                SELECT query_hash, query_nonce, query_ct, alg
+                SELECT query_hash, query_nonce, query_ct, alg, usage_count,
+                       CAST(strftime('%s', last_used) AS REAL) AS last_used_ts
                 FROM search_history
                 WHERE user_id = ?
                 ORDER BY last_used DESC
                 LIMIT ?
                 """,
-                (ctx.user_id, limit),
+                (ctx.user_id, max_queries),
             )
             rows = await cursor.fetchall()
 
-        results: list[str] = []
+        index = QueryPrefixIndex(max_queries)
         for row in rows:
             try:
                 decrypted = ctx.decrypt_entry(
@@ -89,8 +130,10 @@ class SearchHistoryRepository(BaseRepository):
             except Exception:
                 continue
 
-            cleaned = decrypted.strip()
-            if cleaned and cleaned not in results:
-                results.append(cleaned)
-
-        return results[:limit]
+            index.record(
+                decrypted,
+                count=int(row["usage_count"] or 1),
+                last_used=row["last_used_ts"],
+            )
+        self._indexes.put(ctx.user_id, index)
+        return index
@@ -12,8 +12,12 @@ from .events import (
     TAG_LINKED_EVENT,
     TAG_UNLINKED_EVENT,
 )
-from .utils import cached_tag_name
+from .utils import adjust_tag_digests, cached_tag_name, tag_name_cache
 from llamora.app.services.crypto import CryptoContext
+from llamora.app.services.digest_policy import (
+    digest_multiset_update,
+    multiset_digest_aggregate,
+)
 from llamora.app.util.tags import canonicalize, tag_hash
 from llamora.app.util.frecency import DEFAULT_FRECENCY_DECAY, resolve_frecency_lambda
 
@@ -29,6 +33,11 @@ class TagsRepository(BaseRepository):
         super().__init__(pool)
         self._event_bus = event_bus
 
+    def forget(self, user_id: str) -> None:
+        """Drop the decrypted tag names cached for ``user_id``."""
+
+        tag_name_cache.forget(user_id)
+
     async def resolve_or_create_tag(self, ctx: CryptoContext, tag_name: str) -> bytes:
         ctx.require_write(operation="tags.resolve_or_create_tag")
         canonical = canonicalize(tag_name)
@@ -76,6 +85,8 @@ class TagsRepository(BaseRepository):
                         "UPDATE tags SET seen = seen + 1, last_seen = CURRENT_TIMESTAMP WHERE user_id = ? AND tag_hash = ?",
                         (user_id, tag_hash),
                     )
+                    digests = await self._entry_digests(conn, user_id, entry_id)
+                    await adjust_tag_digests(conn, user_id, {tag_hash: (digests, ())})
 
             await self._run_in_transaction(conn, _tx)
         if changed and self._event_bus:
@@ -88,6 +99,16 @@ class TagsRepository(BaseRepository):
             )
         return changed
 
+    @staticmethod
+    async def _entry_digests(conn, user_id: str, entry_id: str) -> list[str]:
+        cursor = await conn.execute(
+            "SELECT digest FROM entries WHERE user_id = ? AND id = ?",
+            (user_id, entry_id),
+        )
+        row = await cursor.fetchone()
+        await cursor.close()
+        return [row["digest"]] if row else []
+
     async def unlink_tag_entry(
         self,
         user_id: str,
@@ -107,6 +128,8 @@ class TagsRepository(BaseRepository):
                 )
                 if cursor.rowcount:
                     changed = True
+                    digests = await self._entry_digests(conn, user_id, entry_id)
+                    await adjust_tag_digests(conn, user_id, {tag_hash: ((), digests)})
 
             await self._run_in_transaction(conn, _tx)
         if changed and self._event_bus:
@@ -401,27 +424,83 @@ class TagsRepository(BaseRepository):
             )
         return index_rows
 
+    @staticmethod
+    async def _tag_entry_digests(conn, user_id: str, tag_hash: bytes) -> list[str]:
+        cursor = await conn.execute(
+            """
+            SELECT e.digest
+            FROM tag_entry_xref x
+            JOIN entries e
+              ON e.user_id = x.user_id AND e.id = x.entry_id
+            WHERE x.user_id = ? AND x.tag_hash = ?
+            """,
+            (user_id, tag_hash),
+        )
+        rows = await cursor.fetchall()
+        await cursor.close()
+        digests: list[str] = []
+        for row in rows:
+            digest = str(row["digest"] or "").strip()
+            if digest:
+                digests.append(digest)
+        return digests
+
     async def get_entry_digests_for_tag(
         self, user_id: str, tag_hash: bytes
     ) -> list[str]:
+        async with self.pool.connection() as conn:
+            return await self._tag_entry_digests(conn, user_id, tag_hash)
+
+    async def get_tag_digest(self, user_id: str, tag_hash: bytes) -> str:
+        """Return the aggregate digest of the entries linked to a tag.
+
+        Served from the stored multiset state, which is built from the tag's
+        entry digests the first time it is missing.
+        """
+
         async with self.pool.connection() as conn:
             cursor = await conn.execute(
-                """
-                SELECT e.digest
-                FROM tag_entry_xref x
-                JOIN entries e
-                  ON e.user_id = x.user_id AND e.id = x.entry_id
-                WHERE x.user_id = ? AND x.tag_hash = ?
-                """,
+                "SELECT digest_state FROM tags WHERE user_id = ? AND tag_hash = ?",
                 (user_id, tag_hash),
             )
+            row = await cursor.fetchone()
+            await cursor.close()
+            if row is None:
+                return multiset_digest_aggregate(None)
+            state = row["digest_state"]
+            if state is None:
+
+                async def _rebuild() -> str:
+                    digests = await self._tag_entry_digests(conn, user_id, tag_hash)
+                    rebuilt = digest_multiset_update(None, added=digests)
+                    await conn.execute(
+                        "UPDATE tags SET digest_state = ? WHERE user_id = ? AND tag_hash = ?",
+                        (rebuilt, user_id, tag_hash),
+                    )
+                    return rebuilt
+
+                state = await self._run_in_transaction(conn, _rebuild)
+        return multiset_digest_aggregate(state)
+
+    async def get_entry_ids_for_tags(
+        self, user_id: str, tag_hashes: Sequence[bytes]
+    ) -> set[str]:
+        """Return ids of entries linked to any of ``tag_hashes``."""
+
+        if not tag_hashes:
+            return set()
+        placeholders = ",".join("?" for _ in tag_hashes)
+        async with self.pool.connection() as conn:
+            cursor = await conn.execute(
+                f"""
+                SELECT DISTINCT entry_id
+                FROM tag_entry_xref
+                WHERE user_id = ? AND tag_hash IN ({placeholders})
+                """,
+                (user_id, *tag_hashes),
+            )
             rows = await cursor.fetchall()
-        digests: list[str] = []
-        for row in rows:
-            digest = str(row["digest"] or "").strip()
-            if digest:
-                digests.append(digest)
-        return digests
+        return {str(row["entry_id"]) for row in rows}
 
     async def get_tag_frecency(
         self, ctx: CryptoContext, limit: int, lambda_: Any
@@ -465,33 +544,68 @@ class TagsRepository(BaseRepository):
             )
         return tags
 
-    async def get_tag_match_counts(
-        self, user_id: str, tag_hashes: Sequence[bytes], entry_ids: Sequence[str]
-    ) -> dict[str, int]:
-        """Return the number of matching tag hashes for each ``entry_id``."""
+    async def get_tag_matches(
+        self,
+        user_id: str,
+        tag_hashes: Sequence[bytes],
+        entry_ids: Sequence[str] | None,
+        *,
+        limit: int,
+    ) -> tuple[list[str], dict[str, int]]:
+        """Return recent matches and per-entry match counts in one query.
+
+        The first item lists up to ``limit`` entry ids linked to any of
+        ``tag_hashes``, most recently tagged first. The second maps each of
+        those entries, plus any of ``entry_ids`` that match, to the number of
+        ``tag_hashes`` it carries. With ``entry_ids=None`` it covers every
+        matching entry.
+        """
 
         tags = [digest for digest in tag_hashes if digest]
-        ids = [eid for eid in entry_ids if eid]
-        if not tags or not ids:
-            return {}
+        ids = [eid for eid in entry_ids or () if eid]
+        if not tags:
+            return [], {}
+        limit = max(int(limit), 0)
 
         tag_placeholders = ",".join("?" * len(tags))
-        entry_placeholders = ",".join("?" * len(ids))
+        if entry_ids is None:
+            where_clause = ""
+        else:
+            known_clause = f"OR entry_id IN ({','.join('?' * len(ids))})" if ids else ""
+            where_clause = (
+                f"WHERE entry_id IN (SELECT entry_id FROM recent) {known_clause}"
+            )
         async with self.pool.connection() as conn:
             cursor = await conn.execute(
                 f"""
-                SELECT entry_id, COUNT(*) AS match_count
-                FROM tag_entry_xref
-                WHERE user_id = ?
-                  AND tag_hash IN ({tag_placeholders})
-                  AND entry_id IN ({entry_placeholders})
-                GROUP BY entry_id
+                WITH matches AS (
+                    SELECT x.entry_id,
+                           COUNT(*) AS match_count,
+                           MAX(x.ulid) AS latest_ulid
+                    FROM tag_entry_xref x
+                    JOIN entries m ON m.user_id = x.user_id AND m.id = x.entry_id
+                    WHERE x.user_id = ? AND x.tag_hash IN ({tag_placeholders})
+                    GROUP BY x.entry_id
+                ),
+                recent AS (
+                    SELECT entry_id FROM matches ORDER BY latest_ulid DESC LIMIT ?
+                )
+                SELECT entry_id, match_count, latest_ulid,
+                       entry_id IN (SELECT entry_id FROM recent) AS is_recent
+                FROM matches
+                {where_clause}
                 """,
-                (user_id, *tags, *ids),
+                (user_id, *tags, limit, *ids),
             )
             rows = await cursor.fetchall()
 
-        return {row["entry_id"]: int(row["match_count"]) for row in rows}
+        recent = sorted(
+            (row for row in rows if row["is_recent"]),
+            key=lambda row: row["latest_ulid"],
+            reverse=True,
+        )
+        counts = {str(row["entry_id"]): int(row["match_count"]) for row in rows}
+        return [str(row["entry_id"]) for row in recent], counts
 
     async def get_recent_entries_for_tag_hashes(
         self,
@@ -1,8 +1,23 @@
 from __future__ import annotations
 
+import logging
+import time
 from datetime import date
+from typing import TYPE_CHECKING, Any, Iterable, Mapping
+
+from cachetools import LRUCache
+
 from llamora.app.util.tags import canonicalize
 from llamora.app.services.crypto import CryptoContext
+from llamora.app.services.digest_policy import digest_multiset_update
+
+if TYPE_CHECKING:  # pragma: no cover - type checking only
+    from llamora.app.services.service_pulse import ServicePulse
+
+logger = logging.getLogger(__name__)
+
+# Hit/miss counters are published at most this often.
+_PULSE_INTERVAL_SECONDS = 30.0
 
 
 def get_month_bounds(year: int, month: int) -> tuple[str, str]:
@@ -16,6 +31,109 @@ def get_month_bounds(year: int, month: int) -> tuple[str, str]:
     return month_start.isoformat(), next_month_start.isoformat()
 
 
+async def adjust_tag_digests(
+    conn,
+    user_id: str,
+    changes: Mapping[bytes, tuple[Iterable[str], Iterable[str]]],
+) -> None:
+    """Fold ``tag_hash -> (added, removed)`` entry digests into tag state.
+
+    Runs on ``conn`` inside the caller's transaction. Tags whose state has
+    not been computed yet are left alone; they are rebuilt on first read.
+    """
+
+    for tag_hash, (added, removed) in changes.items():
+        cursor = await conn.execute(
+            "SELECT digest_state FROM tags WHERE user_id = ? AND tag_hash = ?",
+            (user_id, tag_hash),
+        )
+        row = await cursor.fetchone()
+        await cursor.close()
+        if row is None or row["digest_state"] is None:
+            continue
+        await conn.execute(
+            "UPDATE tags SET digest_state = ? WHERE user_id = ? AND tag_hash = ?",
+            (
+                digest_multiset_update(
+                    row["digest_state"], added=added, removed=removed
+                ),
+                user_id,
+                tag_hash,
+            ),
+        )
+
+
+class TagNameCache:
+    """Memory-only cache of decrypted tag names.
+
+    Names are kept per user, keyed by ``(epoch, tag_hash, nonce)`` so a
+    re-encrypted tag misses instead of returning a name for old ciphertext.
+    Both the number of users and the names per user are bounded, least
+    recently used first. Hit and miss counts are published to the attached
+    :class:`ServicePulse` under ``cache.tag_names``.
+    """
+
+    def __init__(self, *, max_users: int = 256, max_names: int = 4096) -> None:
+        self._max_names = max(int(max_names), 1)
+        self._users: LRUCache[str, LRUCache[tuple[int, bytes, bytes], str]] = LRUCache(
+            maxsize=max(int(max_users), 1)
+        )
+        self.hits = 0
+        self.misses = 0
+        self.service_pulse: ServicePulse | None = None
+        self._last_pulse = 0.0
+
+    def get(self, user_id: str, key: tuple[int, bytes, bytes]) -> str | None:
+        names = self._users.get(user_id)
+        name = names.get(key) if names is not None else None
+        if name is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        self._maybe_emit()
+        return name
+
+    def put(self, user_id: str, key: tuple[int, bytes, bytes], name: str) -> None:
+        names = self._users.get(user_id)
+        if names is None:
+            names = LRUCache(maxsize=self._max_names)
+            self._users[user_id] = names
+        names[key] = name
+
+    def invalidate(self, user_id: str, tag_hash: bytes) -> None:
+        names = self._users.get(user_id)
+        if names is None:
+            return
+        for key in [key for key in names if key[1] == tag_hash]:
+            names.pop(key, None)
+
+    def forget(self, user_id: str) -> None:
+        self._users.pop(user_id, None)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "users": len(self._users),
+            "names": sum(len(names) for names in self._users.values()),
+        }
+
+    def _maybe_emit(self) -> None:
+        if self.service_pulse is None:
+            return
+        now = time.monotonic()
+        if now - self._last_pulse < _PULSE_INTERVAL_SECONDS:
+            return
+        self._last_pulse = now
+        try:
+            self.service_pulse.emit("cache.tag_names", self.stats())
+        except Exception:  # pragma: no cover - defensive
+            logger.exception("Failed to emit tag name cache pulse")
+
+
+tag_name_cache = TagNameCache()
+
+
 def cached_tag_name(
     ctx: CryptoContext,
     tag_hash: bytes,
@@ -25,11 +143,17 @@ def cached_tag_name(
 ) -> str:
     """Decrypt and cache tag names by hash."""
 
+    key = (ctx.epoch, bytes(tag_hash), bytes(name_nonce))
+    name = tag_name_cache.get(ctx.user_id, key)
+    if name is not None:
+        return name
     plaintext = ctx.decrypt_entry(tag_hash.hex(), name_nonce, name_ct, alg)
     raw = (plaintext or "").strip()
-    if not raw:
-        return ""
-    try:
-        return canonicalize(raw)
-    except ValueError:
-        return ""
+    name = ""
+    if raw:
+        try:
+            name = canonicalize(raw)
+        except ValueError:
+            name = ""
+    tag_name_cache.put(ctx.user_id, key, name)
+    return name
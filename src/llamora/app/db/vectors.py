@@ -1,13 +1,44 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Mapping, Sequence
 
 import numpy as np
 from aiosqlitepool import SQLiteConnectionPool
 
 from .base import BaseRepository
+from llamora.app.embed.quantization import decode_vector_into, encode_vector
 from llamora.app.services.crypto import CryptoContext
 
+logger = logging.getLogger(__name__)
+
+_ID_BATCH_SIZE = 500
+# Rows per decrypt worker; smaller batches stay on a single thread.
+_DECRYPT_SLICE_ROWS = 256
+_DECRYPT_WORKERS = max(min(os.cpu_count() or 1, 8), 1)
+
+
+@dataclass(slots=True)
+class VectorBatch:
+    """Decrypted vectors as one row-aligned float32 matrix."""
+
+    ids: list[str] = field(default_factory=list)
+    entry_ids: list[str] = field(default_factory=list)
+    created_at: list[Any] = field(default_factory=list)
+    vectors: np.ndarray = field(
+        default_factory=lambda: np.empty((0, 0), dtype=np.float32)
+    )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def dim(self) -> int:
+        return int(self.vectors.shape[1]) if self.vectors.ndim == 2 else 0
+
 
 class VectorsRepository(BaseRepository):
     """Persistence helpers for encrypted vector embeddings."""
@@ -67,10 +98,22 @@ class VectorsRepository(BaseRepository):
         vectors: list[tuple[str, str, int, np.ndarray]],
         ctx: CryptoContext,
         dtype: str = "float32",
+        *,
+        chunk_digests: Sequence[str | None] | None = None,
+        chunk_counts: Mapping[str, int] | None = None,
     ) -> None:
-        if not vectors:
+        """Persist ``vectors`` and optionally prune stale chunks in one transaction.
+
+        ``chunk_digests`` runs parallel to ``vectors``. ``chunk_counts`` maps
+        entry ids to their current number of chunks; rows at or beyond that
+        chunk index are deleted alongside the inserts.
+        """
+
+        if not vectors and not chunk_counts:
             return
         ctx.require_write(operation="vectors.store_vectors_batch")
+        if chunk_digests is not None and len(chunk_digests) != len(vectors):
+            raise ValueError("chunk_digests must match vectors")
 
         records = await asyncio.to_thread(
             self._prepare_batch_records,
@@ -78,16 +121,29 @@ class VectorsRepository(BaseRepository):
             ctx,
             dtype,
         )
+        digests = chunk_digests if chunk_digests is not None else [None] * len(records)
 
-        async with self.pool.connection() as conn:
-            await self._run_in_transaction(
-                conn,
-                conn.executemany,
+        async def _write() -> None:
+            if chunk_counts:
+                await conn.executemany(
+                    """
+                    DELETE FROM vectors
+                    WHERE user_id = ? AND entry_id = ? AND chunk_index >= ?
+                    """,
+                    [
+                        (ctx.user_id, entry_id, int(count))
+                        for entry_id, count in chunk_counts.items()
+                    ],
+                )
+            if not records:
+                return
+            await conn.executemany(
                 """
                     INSERT OR REPLACE INTO vectors (
-                        id, entry_id, user_id, chunk_index, dim, nonce, ciphertext, alg, dtype
+                        id, entry_id, user_id, chunk_index, dim, nonce, ciphertext, alg,
+                        dtype, chunk_digest
                     )
-                    SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?
+                    SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
                     WHERE EXISTS (
                         SELECT 1
                         FROM entries
@@ -105,6 +161,7 @@ class VectorsRepository(BaseRepository):
                         ct,
                         alg,
                         record_dtype,
+                        digest,
                         entry_id,
                         record_user_id,
                     )
@@ -118,11 +175,50 @@ class VectorsRepository(BaseRepository):
                         ct,
                         alg,
                         record_dtype,
-                    ) in records
+                    ), digest in zip(records, digests)
                 ],
             )
 
-    async def get_latest_vectors(self, ctx: CryptoContext, limit: int) -> list[dict]:
+        async with self.pool.connection() as conn:
+            await self._run_in_transaction(conn, _write)
+
+    async def get_vectors_by_chunk_digests(
+        self, ctx: CryptoContext, digests: Sequence[str]
+    ) -> dict[str, tuple[str, np.ndarray]]:
+        """Map known chunk digests to one stored ``(vector_id, vector)``."""
+
+        unique = list(dict.fromkeys(digest for digest in digests if digest))
+        if not unique:
+            return {}
+        rows = []
+        async with self.pool.connection() as conn:
+            for start in range(0, len(unique), _ID_BATCH_SIZE):
+                batch = unique[start : start + _ID_BATCH_SIZE]
+                placeholders = ",".join("?" for _ in batch)
+                cursor = await conn.execute(
+                    f"""
+                    SELECT id, entry_id, dim, nonce, ciphertext, alg, dtype, created_at,
+                           chunk_digest
+                    FROM vectors
+                    WHERE rowid IN (
+                        SELECT MIN(rowid)
+                        FROM vectors
+                        WHERE user_id = ? AND chunk_digest IN ({placeholders})
+                        GROUP BY chunk_digest
+                    )
+                    """,
+                    (ctx.user_id, *batch),
+                )
+                rows.extend(await cursor.fetchall())
+
+        batch = await self._decrypt_vector_batch(rows, ctx)
+        by_id = {str(row["id"]): row["chunk_digest"] for row in rows}
+        return {
+            by_id[vector_id]: (vector_id, batch.vectors[position])
+            for position, vector_id in enumerate(batch.ids)
+        }
+
+    async def get_latest_vectors(self, ctx: CryptoContext, limit: int) -> VectorBatch:
         async with self.pool.connection() as conn:
             cursor = await conn.execute(
                 """
@@ -136,15 +232,11 @@ class VectorsRepository(BaseRepository):
             )
             rows = await cursor.fetchall()
 
-        return await asyncio.to_thread(
-            self._decrypt_vector_rows,
-            rows,
-            ctx,
-        )
+        return await self._decrypt_vector_batch(rows, ctx)
 
     async def get_vectors_older_than(
         self, ctx: CryptoContext, before_id: str, limit: int
-    ) -> list[dict]:
+    ) -> VectorBatch:
         async with self.pool.connection() as conn:
             cursor = await conn.execute(
                 """
@@ -159,11 +251,77 @@ class VectorsRepository(BaseRepository):
             )
             rows = await cursor.fetchall()
 
-        return await asyncio.to_thread(
-            self._decrypt_vector_rows,
-            rows,
-            ctx,
-        )
+        return await self._decrypt_vector_batch(rows, ctx)
+
+    async def get_vector_watermark(self, user_id: str) -> int:
+        """Return the highest vector rowid stored for ``user_id``."""
+
+        async with self.pool.connection() as conn:
+            cursor = await conn.execute(
+                "SELECT COALESCE(MAX(rowid), 0) AS watermark FROM vectors WHERE user_id = ?",
+                (user_id,),
+            )
+            row = await cursor.fetchone()
+        return int(row["watermark"] or 0) if row else 0
+
+    async def get_vectors_by_ids(
+        self, ctx: CryptoContext, vector_ids: list[str]
+    ) -> VectorBatch:
+        if not vector_ids:
+            return VectorBatch()
+        rows = []
+        async with self.pool.connection() as conn:
+            for start in range(0, len(vector_ids), _ID_BATCH_SIZE):
+                batch = vector_ids[start : start + _ID_BATCH_SIZE]
+                placeholders = ",".join("?" for _ in batch)
+                cursor = await conn.execute(
+                    f"""
+                    SELECT v.id, v.entry_id, v.dim, v.nonce, v.ciphertext, v.alg, v.dtype, m.created_at
+                    FROM vectors v
+                    JOIN entries m ON v.entry_id = m.id AND m.user_id = ?
+                    WHERE v.user_id = ? AND v.id IN ({placeholders})
+                    """,
+                    (ctx.user_id, ctx.user_id, *batch),
+                )
+                rows.extend(await cursor.fetchall())
+
+        return await self._decrypt_vector_batch(rows, ctx)
+
+    async def get_vector_manifest(self, user_id: str) -> dict[str, int]:
+        """Return a mapping of vector id to rowid without decrypting anything."""
+
+        async with self.pool.connection() as conn:
+            cursor = await conn.execute(
+                "SELECT id, rowid AS row_id FROM vectors WHERE user_id = ?",
+                (user_id,),
+            )
+            rows = await cursor.fetchall()
+        return {str(row["id"]): int(row["row_id"]) for row in rows}
+
+    async def get_entry_ids_without_vectors(
+        self, user_id: str, limit: int
+    ) -> list[str]:
+        """Return ids among the ``limit`` newest entries lacking vectors."""
+
+        async with self.pool.connection() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT m.id
+                FROM (
+                    SELECT id FROM entries
+                    WHERE user_id = ?
+                    ORDER BY id DESC
+                    LIMIT ?
+                ) m
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM vectors v WHERE v.entry_id = m.id
+                )
+                ORDER BY m.id DESC
+                """,
+                (user_id, limit),
+            )
+            rows = await cursor.fetchall()
+        return [str(row["id"]) for row in rows]
 
     def _prepare_encrypted_vector(
         self,
@@ -173,10 +331,8 @@ class VectorsRepository(BaseRepository):
         vector_id: str,
         dtype: str,
     ) -> tuple[int, bytes, bytes, bytes]:
-        np_dtype = np.float16 if dtype == "float16" else np.float32
-        vec_arr = np.asarray(vec, dtype=np_dtype)
-        dim = int(vec_arr.shape[0])
-        nonce, ct, alg = ctx.encrypt_vector(entry_id, vector_id, vec_arr.tobytes())
+        dim, payload = encode_vector(vec, dtype)
+        nonce, ct, alg = ctx.encrypt_vector(entry_id, vector_id, payload)
         return dim, nonce, ct, alg
 
     def _prepare_batch_records(
@@ -186,11 +342,9 @@ class VectorsRepository(BaseRepository):
         dtype: str,
     ) -> list[tuple[str, str, str, int, int, bytes, bytes, bytes, str]]:
         records: list[tuple[str, str, str, int, int, bytes, bytes, bytes, str]] = []
-        np_dtype = np.float16 if dtype == "float16" else np.float32
         for vector_id, entry_id, chunk_index, vec in vectors:
-            vec_arr = np.asarray(vec, dtype=np_dtype).ravel()
-            dim = int(vec_arr.shape[0])
-            nonce, ct, alg = ctx.encrypt_vector(entry_id, vector_id, vec_arr.tobytes())
+            dim, payload = encode_vector(vec, dtype)
+            nonce, ct, alg = ctx.encrypt_vector(entry_id, vector_id, payload)
             records.append(
                 (
                     vector_id,
@@ -206,17 +360,47 @@ class VectorsRepository(BaseRepository):
             )
         return records
 
-    def _decrypt_vector_rows(self, rows, ctx: CryptoContext) -> list[dict]:
-        vectors: list[dict] = []
-        for row in rows:
-            dtype = None
-            try:
-                if "dtype" in row.keys():
-                    dtype = row["dtype"]
-            except AttributeError:
-                dtype = row.get("dtype") if isinstance(row, dict) else None
-            dtype = (dtype or "float32").lower()
-            np_dtype = np.float16 if dtype == "float16" else np.float32
+    async def _decrypt_vector_batch(self, rows, ctx: CryptoContext) -> VectorBatch:
+        """Decrypt ``rows`` into a preallocated matrix across worker threads.
+
+        libsodium releases the GIL, so slices of the result matrix are filled
+        concurrently. Rows whose dimension differs from the first row are
+        skipped.
+        """
+
+        if not rows:
+            return VectorBatch()
+        dim = int(rows[0]["dim"])
+        kept = [row for row in rows if int(row["dim"]) == dim]
+        if len(kept) != len(rows):
+            logger.warning(
+                "Skipping %d vectors with mismatched dimension for user %s",
+                len(rows) - len(kept),
+                ctx.user_id,
+            )
+        matrix = np.empty((len(kept), dim), dtype=np.float32)
+        slice_rows = max(_DECRYPT_SLICE_ROWS, -(-len(kept) // _DECRYPT_WORKERS))
+        await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    self._decrypt_rows_into,
+                    kept[start : start + slice_rows],
+                    ctx,
+                    matrix[start : start + slice_rows],
+                )
+                for start in range(0, len(kept), slice_rows)
+            )
+        )
+        return VectorBatch(
+            ids=[row["id"] for row in kept],
+            entry_ids=[row["entry_id"] for row in kept],
+            created_at=[row["created_at"] for row in kept],
+            vectors=matrix,
+        )
+
+    @staticmethod
+    def _decrypt_rows_into(rows, ctx: CryptoContext, out: np.ndarray) -> None:
+        for position, row in enumerate(rows):
             vec_bytes = ctx.decrypt_vector(
                 row["entry_id"],
                 row["id"],
@@ -224,15 +408,5 @@ class VectorsRepository(BaseRepository):
                 row["ciphertext"],
                 row["alg"],
             )
-            vec = np.frombuffer(vec_bytes, dtype=np_dtype).reshape(row["dim"])
-            if np_dtype == np.float16:
-                vec = vec.astype(np.float32)
-            vectors.append(
-                {
-                    "id": row["id"],
-                    "entry_id": row["entry_id"],
-                    "created_at": row["created_at"],
-                    "vec": vec,
-                }
-            )
-        return vectors
+            dtype = (row["dtype"] or "float32").lower()
+            decode_vector_into(vec_bytes, dtype, out[position])
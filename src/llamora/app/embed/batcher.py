@@ -0,0 +1,200 @@
+"""Coalesce concurrent embedding requests into shared model calls."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Literal
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+EmbedPriority = Literal["query", "bulk"]
+
+
+@dataclass(slots=True)
+class _EmbedRequest:
+    texts: list[str]
+    future: asyncio.Future
+    offset: int = 0
+    inflight: int = 0
+    parts: dict[int, np.ndarray] = field(default_factory=dict)
+    dispatched: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def remaining(self) -> int:
+        return len(self.texts) - self.offset
+
+    def take(self, limit: int) -> tuple[int, list[str]]:
+        start = self.offset
+        end = min(start + limit, len(self.texts))
+        self.offset = end
+        self.inflight += 1
+        self.dispatched.set()
+        return start, self.texts[start:end]
+
+    def complete(self, start: int, vecs: np.ndarray) -> None:
+        self.inflight -= 1
+        if self.future.done():
+            return
+        self.parts[start] = vecs
+        if self.remaining == 0 and self.inflight == 0:
+            ordered = [self.parts[key] for key in sorted(self.parts)]
+            self.future.set_result(np.concatenate(ordered, axis=0))
+
+
+class EmbeddingBatcher:
+    """Gather pending embed requests and run them through one model call.
+
+    Requests wait at most ``max_wait_ms`` (``query_wait_ms`` once a query is
+    queued) for company before a batch of up to ``max_batch_size`` texts is
+    dispatched to a worker thread. Query requests are always drained before
+    bulk indexing work, and bulk requests larger than a batch are split so a
+    query never waits behind more than one in-flight batch per slot.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[list[str]], np.ndarray],
+        *,
+        concurrency: int = 1,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        query_wait_ms: float = 1.0,
+    ) -> None:
+        self._embed_fn = embed_fn
+        self._slots = asyncio.Semaphore(max(int(concurrency), 1))
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self.max_wait = max(float(max_wait_ms), 0.0) / 1000.0
+        self.query_wait = max(float(query_wait_ms), 0.0) / 1000.0
+        self._queries: deque[_EmbedRequest] = deque()
+        self._bulk: deque[_EmbedRequest] = deque()
+        self._wakeup = asyncio.Event()
+        self._dispatcher: asyncio.Task | None = None
+        self._inflight: set[asyncio.Task] = set()
+
+    async def embed(
+        self,
+        texts: list[str],
+        *,
+        priority: EmbedPriority = "bulk",
+        dispatch_timeout: float | None = None,
+    ) -> np.ndarray:
+        """Embed ``texts``, coalesced with whatever else is queued.
+
+        ``dispatch_timeout`` bounds only the wait until the first batch of
+        ``texts`` reaches a model call; once dispatched, the request runs to
+        completion however many batches it spans. On timeout the request is
+        withdrawn and :class:`asyncio.TimeoutError` is raised.
+        """
+
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        loop = asyncio.get_running_loop()
+        request = _EmbedRequest(list(texts), loop.create_future())
+        queue = self._queries if priority == "query" else self._bulk
+        queue.append(request)
+        self._wakeup.set()
+        self._ensure_dispatcher()
+        if dispatch_timeout is not None:
+            try:
+                await asyncio.wait_for(request.dispatched.wait(), dispatch_timeout)
+            except asyncio.TimeoutError:
+                request.future.cancel()
+                raise
+        return await request.future
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(
+                self._run(), name="llamora-embed-batcher"
+            )
+
+    def _pending_texts(self) -> int:
+        return sum(r.remaining for r in self._queries) + sum(
+            r.remaining for r in self._bulk
+        )
+
+    def _prune(self) -> None:
+        for queue in (self._queries, self._bulk):
+            while queue and (queue[0].future.done() or queue[0].remaining == 0):
+                queue.popleft()
+
+    async def _gather_window(self) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (self.query_wait if self._queries else self.max_wait)
+        while self._pending_texts() < self.max_batch_size:
+            if self._queries:
+                deadline = min(deadline, loop.time() + self.query_wait)
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                return
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return
+
+    def _next_batch(self) -> list[tuple[_EmbedRequest, int, list[str]]]:
+        batch: list[tuple[_EmbedRequest, int, list[str]]] = []
+        budget = self.max_batch_size
+        for queue in (self._queries, self._bulk):
+            while queue and budget > 0:
+                request = queue[0]
+                if request.future.done():
+                    queue.popleft()
+                    continue
+                start, texts = request.take(budget)
+                batch.append((request, start, texts))
+                budget -= len(texts)
+                if request.remaining == 0:
+                    queue.popleft()
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            self._prune()
+            if not self._queries and not self._bulk:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), 60.0)
+                except asyncio.TimeoutError:
+                    if not self._queries and not self._bulk:
+                        return
+                continue
+            await self._gather_window()
+            await self._slots.acquire()
+            batch = self._next_batch()
+            if not batch:
+                self._slots.release()
+                continue
+            task = asyncio.create_task(self._execute(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _execute(self, batch: list[tuple[_EmbedRequest, int, list[str]]]) -> None:
+        texts = [text for _, _, part in batch for text in part]
+        try:
+            logger.debug(
+                "Embedding batch of %d texts from %d requests", len(texts), len(batch)
+            )
+            vecs = await asyncio.to_thread(self._embed_fn, texts)
+        except Exception as exc:
+            for request, _, _ in batch:
+                request.inflight -= 1
+                if not request.future.done():
+                    request.future.set_exception(exc)
+            return
+        finally:
+            self._slots.release()
+        cursor = 0
+        for request, start, part in batch:
+            request.complete(start, vecs[cursor : cursor + len(part)])
+            cursor += len(part)
+
+
+__all__ = ["EmbedPriority", "EmbeddingBatcher"]
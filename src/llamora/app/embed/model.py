@@ -6,14 +6,16 @@ import threading
 import numpy as np
 from fastembed import TextEmbedding
 
+from llamora.app.embed.batcher import EmbeddingBatcher, EmbedPriority
 from llamora.settings import settings
 
 logger = logging.getLogger(__name__)
 
-_embed_semaphore = asyncio.Semaphore(
-    settings.EMBEDDING.concurrency or os.cpu_count() or 1
-)
-_SEMAPHORE_TIMEOUT = 30.0
+# Bounds the wait for a model slot, not the embedding work itself.
+_DISPATCH_TIMEOUT = 30.0
+
+_batcher: EmbeddingBatcher | None = None
+_batcher_loop: asyncio.AbstractEventLoop | None = None
 
 _model_lock = threading.Lock()
 _cached_model: TextEmbedding | None = None
@@ -42,16 +44,36 @@ def embed_texts(texts: list[str]) -> np.ndarray:
     return np.asarray(vecs, dtype=np.float32)
 
 
-async def async_embed_texts(texts: list[str]) -> np.ndarray:
-    """Run :func:`embed_texts` without blocking the event loop."""
+def _get_batcher() -> EmbeddingBatcher:
+    global _batcher, _batcher_loop
+    loop = asyncio.get_running_loop()
+    if _batcher is None or _batcher_loop is not loop:
+        batching = settings.get("EMBEDDING.batching", {}) or {}
+        _batcher = EmbeddingBatcher(
+            embed_texts,
+            concurrency=settings.EMBEDDING.concurrency or os.cpu_count() or 1,
+            max_batch_size=int(batching.get("max_batch_size", 64)),
+            max_wait_ms=float(batching.get("max_wait_ms", 5.0)),
+            query_wait_ms=float(batching.get("query_wait_ms", 1.0)),
+        )
+        _batcher_loop = loop
+    return _batcher
+
+
+async def async_embed_texts(
+    texts: list[str], *, priority: EmbedPriority = "bulk"
+) -> np.ndarray:
+    """Embed ``texts`` through the shared batcher without blocking the loop.
+
+    Pass ``priority="query"`` for latency-sensitive single queries so they
+    are dispatched ahead of queued indexing work.
+    """
 
     try:
-        await asyncio.wait_for(_embed_semaphore.acquire(), timeout=_SEMAPHORE_TIMEOUT)
+        return await _get_batcher().embed(
+            texts, priority=priority, dispatch_timeout=_DISPATCH_TIMEOUT
+        )
     except asyncio.TimeoutError:
         raise RuntimeError(
-            f"Embedding semaphore not acquired within {_SEMAPHORE_TIMEOUT}s"
+            f"Embedding request not dispatched within {_DISPATCH_TIMEOUT}s"
         )
-    try:
-        return await asyncio.to_thread(embed_texts, texts)
-    finally:
-        _embed_semaphore.release()
@@ -0,0 +1,92 @@
+"""Binary encodings for stored embedding vectors.
+
+``float32`` and ``float16`` vectors are stored as raw little-endian arrays.
+``int8`` vectors use per-vector affine scalar quantization: an 8 byte header
+holding the float32 ``scale`` and ``offset`` followed by one signed byte per
+dimension, so ``value ~= (code + 128) * scale + offset``.
+"""
+
+from __future__ import annotations
+
+import struct
+
+import numpy as np
+
+
+VECTOR_DTYPES = ("float32", "float16", "int8")
+
+_INT8_HEADER = struct.Struct("<ff")
+_INT8_LEVELS = 255
+
+
+def quantize_int8(vecs: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Quantize each row of ``vecs`` to int8 codes with its own scale/offset."""
+
+    arr = np.atleast_2d(np.asarray(vecs, dtype=np.float32))
+    lo = arr.min(axis=1)
+    hi = arr.max(axis=1)
+    scales = (hi - lo) / _INT8_LEVELS
+    safe = np.where(scales > 0, scales, 1.0).astype(np.float32)
+    codes = np.rint((arr - lo[:, None]) / safe[:, None]) - 128
+    codes = np.clip(codes, -128, 127).astype(np.int8)
+    return codes, scales.astype(np.float32), lo.astype(np.float32)
+
+
+def dequantize_int8(
+    codes: np.ndarray, scales: np.ndarray, offsets: np.ndarray
+) -> np.ndarray:
+    codes = np.atleast_2d(codes).astype(np.float32)
+    scales = np.asarray(scales, dtype=np.float32).reshape(-1, 1)
+    offsets = np.asarray(offsets, dtype=np.float32).reshape(-1, 1)
+    return (codes + 128.0) * scales + offsets
+
+
+def encode_vector(vec: np.ndarray, dtype: str) -> tuple[int, bytes]:
+    """Return ``(dim, payload)`` for ``vec`` in the requested storage dtype."""
+
+    flat = np.asarray(vec, dtype=np.float32).ravel()
+    dim = int(flat.shape[0])
+    if dtype == "int8":
+        codes, scales, offsets = quantize_int8(flat)
+        header = _INT8_HEADER.pack(float(scales[0]), float(offsets[0]))
+        return dim, header + codes.tobytes()
+    if dtype == "float16":
+        return dim, flat.astype(np.float16).tobytes()
+    return dim, flat.tobytes()
+
+
+def decode_vector(payload: bytes, dtype: str, dim: int) -> np.ndarray:
+    """Decode a stored payload back into a float32 vector."""
+
+    if dtype == "int8":
+        scale, offset = _INT8_HEADER.unpack_from(payload)
+        codes = np.frombuffer(payload, dtype=np.int8, offset=_INT8_HEADER.size)
+        return dequantize_int8(codes.reshape(1, dim), scale, offset)[0]
+    if dtype == "float16":
+        return np.frombuffer(payload, dtype=np.float16).reshape(dim).astype(np.float32)
+    return np.frombuffer(payload, dtype=np.float32).reshape(dim)
+
+
+def decode_vector_into(payload: bytes, dtype: str, out: np.ndarray) -> None:
+    """Decode a stored payload into the preallocated float32 row ``out``."""
+
+    if dtype == "int8":
+        scale, offset = _INT8_HEADER.unpack_from(payload)
+        codes = np.frombuffer(payload, dtype=np.int8, offset=_INT8_HEADER.size)
+        np.add(codes, 128.0, out=out, dtype=np.float32)
+        out *= scale
+        out += offset
+    elif dtype == "float16":
+        out[:] = np.frombuffer(payload, dtype=np.float16)
+    else:
+        out[:] = np.frombuffer(payload, dtype=np.float32)
+
+
+__all__ = [
+    "VECTOR_DTYPES",
+    "decode_vector",
+    "decode_vector_into",
+    "dequantize_int8",
+    "encode_vector",
+    "quantize_int8",
+]
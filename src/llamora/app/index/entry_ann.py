@@ -1,16 +1,33 @@
 import asyncio
 import logging
+import sys
 import time
-from typing import Dict, Iterable, Optional, cast
+from datetime import date
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, cast
 
 import hnswlib
 import numpy as np
 
 from llamora.app.embed.model import async_embed_texts
+from llamora.app.embed.quantization import (
+    VECTOR_DTYPES,
+    dequantize_int8,
+    quantize_int8,
+)
+from llamora.app.index.related import RelatedEntriesBuilder
+from llamora.app.index.snapshot import (
+    EntryIndexSnapshot,
+    EntryIndexSnapshotStore,
+    encode_snapshot,
+)
 from llamora.app.services.chunking import chunk_text
 from llamora.app.services.crypto import CryptoContext
+from llamora.app.util.tags import tag_hash
 from llamora.settings import settings
 
+if TYPE_CHECKING:  # pragma: no cover - type checking only
+    from llamora.app.services.search_filters import SearchFilters
+
 
 logger = logging.getLogger(__name__)
 
@@ -25,8 +42,53 @@ def _entry_id_from_vector_id(vector_id: str) -> str:
     return vector_id
 
 
+_HNSW_M = 32
+_MIN_CAPACITY = 256
+# hnswlib allocates one std::mutex per element slot for link list locks.
+_HNSW_LOCK_BYTES = 40
+# Dict slot, hash entry and list slot held per interned entry id.
+_ENTRY_SLOT_BYTES = 104
+# Per-entry filter metadata: role codes (0 = not loaded yet) and the
+# created_date as a proleptic ordinal (-1 = not loaded yet).
+_ROLE_CODES = {"user": 1, "assistant": 2}
+_ROLE_OTHER = 3
+# Filtered graph searches whose allowed set is at most this large score the
+# allowed vectors directly instead of walking the graph.
+_FILTER_EXACT_LIMIT = 2048
+_EXACT_DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+# An int8 exact matrix shortlists this many candidates per result by the raw
+# quantized dot product, then ranks them by cosine against the dequantized
+# rows, renormalised.
+_INT8_SHORTLIST_FACTOR = 4
+# Rows upcast per step when scoring int8 codes, bounding the float temporary.
+_INT8_SCORE_CHUNK = 4096
+
+
+def _next_power_of_two(value: int) -> int:
+    return 1 << max(int(value) - 1, 0).bit_length()
+
+
+def _normalize_rows(vecs: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+    return vecs / np.where(norms > 0, norms, 1.0)
+
+
 class EntryIndex:
-    """In-memory ANN index for a single user's entries."""
+    """In-memory ANN index for a single user's entries.
+
+    ``max_elements`` caps the number of live vectors (unless ``allow_growth``
+    is set); the underlying allocation starts at ``initial_capacity`` rounded
+    up to a power of two and doubles on demand.
+
+    While the index holds at most ``exact_threshold`` vectors it is a plain
+    normalised matrix searched by brute force (exact, no graph to build).
+    Crossing the threshold promotes it to an hnswlib graph for good. With
+    ``exact_dtype="int8"`` the matrix keeps per-row scalar-quantized codes,
+    a quarter of the float32 size; searches shortlist by the quantized dot
+    product and re-rank the shortlist by cosine against the renormalised
+    dequantized rows. No float vectors are kept, so that step only undoes
+    the norm drift quantization introduces, not its rounding error.
+    """
 
     def __init__(
         self,
@@ -34,46 +96,462 @@ class EntryIndex:
         max_elements: int = 100000,
         *,
         allow_growth: bool = False,
+        initial_capacity: int = 0,
+        exact_threshold: int = 0,
+        exact_dtype: str = "float32",
     ):
-        self.index = hnswlib.Index(space="cosine", dim=dim)
         self.allow_growth = bool(allow_growth)
-        self.index.init_index(
-            max_elements=max_elements,
+        self.exact_threshold = max(int(exact_threshold), 0)
+        self._exact_dtype = _EXACT_DTYPES.get(exact_dtype, np.float32)
+        self._init_bookkeeping(dim, max_elements)
+        self.index: hnswlib.Index | None = None
+        self._matrix: np.ndarray | None = None
+        # Per-row dequantization parameters of an int8 matrix.
+        self._matrix_scale: np.ndarray | None = None
+        self._matrix_offset: np.ndarray | None = None
+        if self.exact_threshold > 0 and initial_capacity <= self.exact_threshold:
+            self.capacity = self._capacity_for(
+                min(max(initial_capacity, 1), self.exact_threshold)
+            )
+            self._allocate_matrix(self.capacity)
+        else:
+            self.capacity = self._capacity_for(initial_capacity)
+            self.index = self._new_graph(self.capacity)
+
+    def _new_graph(self, capacity: int) -> hnswlib.Index:
+        index = hnswlib.Index(space="cosine", dim=self.dim)
+        index.init_index(
+            max_elements=capacity,
             ef_construction=200,
-            M=32,
-            allow_replace_deleted=not self.allow_growth,
+            M=_HNSW_M,
+            allow_replace_deleted=False,
+        )
+        index.set_ef(64)
+        return index
+
+    @property
+    def is_exact(self) -> bool:
+        return self.index is None
+
+    def _allocate_matrix(self, capacity: int) -> None:
+        matrix = np.zeros((capacity, self.dim), dtype=self._exact_dtype)
+        scale = offset = None
+        if self._exact_dtype == np.int8:
+            scale = np.zeros(capacity, dtype=np.float32)
+            offset = np.zeros(capacity, dtype=np.float32)
+            if self._matrix_scale is not None and self._matrix_offset is not None:
+                scale[: len(self._matrix_scale)] = self._matrix_scale
+                offset[: len(self._matrix_offset)] = self._matrix_offset
+        if self._matrix is not None:
+            matrix[: len(self._matrix)] = self._matrix
+        self._matrix = matrix
+        self._matrix_scale = scale
+        self._matrix_offset = offset
+
+    def _store_rows(self, labels: list[int], vecs: np.ndarray) -> None:
+        assert self._matrix is not None
+        rows = _normalize_rows(vecs)
+        if self._matrix_scale is None or self._matrix_offset is None:
+            self._matrix[labels] = rows
+            return
+        codes, scales, offsets = quantize_int8(rows)
+        self._matrix[labels] = codes
+        self._matrix_scale[labels] = scales
+        self._matrix_offset[labels] = offsets
+
+    def _matrix_rows(self, labels) -> np.ndarray:
+        """Return float32 vectors for ``labels`` of the exact matrix."""
+
+        assert self._matrix is not None
+        if self._matrix_scale is None or self._matrix_offset is None:
+            return self._matrix[labels].astype(np.float32)
+        return dequantize_int8(
+            self._matrix[labels],
+            self._matrix_scale[labels],
+            self._matrix_offset[labels],
+        )
+
+    def _promote_to_graph(self, required: int) -> None:
+        """Move every live vector from the exact matrix into an hnsw graph."""
+
+        assert self._matrix is not None
+        capacity = self._capacity_for(max(required, self.capacity))
+        live = np.flatnonzero(self._label_entry[: self.next_idx] >= 0)
+        logger.debug(
+            "Promoting entry index to hnsw graph with %d vectors (capacity %d)",
+            len(live),
+            capacity,
+        )
+        index = self._new_graph(capacity)
+        if len(live):
+            index.add_items(self._matrix_rows(live), live)
+        self.index = index
+        self.capacity = capacity
+        self._matrix = None
+        self._matrix_scale = None
+        self._matrix_offset = None
+
+    def _capacity_for(self, required: int) -> int:
+        capacity = _next_power_of_two(max(int(required), _MIN_CAPACITY))
+        if not self.allow_growth:
+            capacity = min(capacity, max(self.max_elements, 1))
+        return capacity
+
+    def _ensure_capacity(self, required: int) -> None:
+        """Grow the allocation geometrically to hold ``required`` slots."""
+
+        if required <= self.capacity:
+            return
+        new_capacity = self._capacity_for(max(required, self.capacity * 2))
+        if new_capacity <= self.capacity:
+            return
+        logger.debug(
+            "Resizing entry index from %d to %d slots", self.capacity, new_capacity
         )
-        self.index.set_ef(64)
-        self.id_to_idx: Dict[str, int] = {}
-        self.idx_to_id: Dict[int, str] = {}
-        self.entry_to_ids: Dict[str, set[str]] = {}
+        if self._matrix is not None:
+            self._allocate_matrix(new_capacity)
+        else:
+            assert self.index is not None
+            self.index.resize_index(new_capacity)
+        self.capacity = new_capacity
+
+    def _init_bookkeeping(self, dim: int, max_elements: int) -> None:
+        # Entry ids are interned once; everything per vector lives in int32
+        # arrays indexed by hnsw label. Labels of one entry form a linked
+        # list through ``_label_next`` starting at ``_entry_head[ordinal]``.
+        self._entry_ordinals: Dict[str, int] = {}
+        self._entry_ids: list[str] = []
+        self._free_ordinals: list[int] = []
+        self._entry_head = np.empty(0, dtype=np.int32)
+        self._entry_day = np.empty(0, dtype=np.int32)
+        self._entry_role = np.empty(0, dtype=np.int8)
+        self._label_entry = np.empty(0, dtype=np.int32)
+        self._label_chunk = np.empty(0, dtype=np.int32)
+        self._label_next = np.empty(0, dtype=np.int32)
         self._free_idxs: list[int] = []
-        self._free_set: set[int] = set()
+        self._vector_count = 0
+        self._interned_bytes = 0
         self.next_idx = 0
         self.last_used = time.monotonic()
         self.dim = dim
         self.max_elements = max_elements
+        # Bumped on every mutation so the store can tell when a snapshot is stale.
+        self.version = 0
+
+    @property
+    def vector_count(self) -> int:
+        return self._vector_count
+
+    @property
+    def entry_count(self) -> int:
+        return len(self._entry_ordinals)
+
+    def _grow_label_arrays(self, required: int) -> None:
+        size = len(self._label_entry)
+        if required <= size:
+            return
+        new_size = max(required, size * 2, _MIN_CAPACITY)
+        extra = new_size - size
+        self._label_entry = np.concatenate(
+            (self._label_entry, np.full(extra, -1, dtype=np.int32))
+        )
+        self._label_chunk = np.concatenate(
+            (self._label_chunk, np.zeros(extra, dtype=np.int32))
+        )
+        self._label_next = np.concatenate(
+            (self._label_next, np.full(extra, -1, dtype=np.int32))
+        )
+
+    def _intern_entry(self, entry_id: str) -> int:
+        ordinal = self._entry_ordinals.get(entry_id)
+        if ordinal is not None:
+            return ordinal
+        if self._free_ordinals:
+            ordinal = self._free_ordinals.pop()
+            self._entry_ids[ordinal] = entry_id
+        else:
+            ordinal = len(self._entry_ids)
+            self._entry_ids.append(entry_id)
+            self._grow_entry_arrays(ordinal + 1)
+        self._entry_head[ordinal] = -1
+        self._entry_day[ordinal] = -1
+        self._entry_role[ordinal] = 0
+        self._entry_ordinals[entry_id] = ordinal
+        self._interned_bytes += sys.getsizeof(entry_id) + _ENTRY_SLOT_BYTES
+        return ordinal
+
+    def _grow_entry_arrays(self, required: int) -> None:
+        size = len(self._entry_head)
+        if required > size:
+            extra = max(required - size, size, _MIN_CAPACITY)
+            self._entry_head = np.concatenate(
+                (self._entry_head, np.full(extra, -1, dtype=np.int32))
+            )
+        size = len(self._entry_head)
+        if len(self._entry_day) < size:
+            extra = size - len(self._entry_day)
+            self._entry_day = np.concatenate(
+                (self._entry_day, np.full(extra, -1, dtype=np.int32))
+            )
+            self._entry_role = np.concatenate(
+                (self._entry_role, np.zeros(extra, dtype=np.int8))
+            )
+
+    def _release_entry(self, ordinal: int) -> None:
+        entry_id = self._entry_ids[ordinal]
+        self._entry_ordinals.pop(entry_id, None)
+        self._entry_ids[ordinal] = ""
+        self._free_ordinals.append(ordinal)
+        self._interned_bytes -= sys.getsizeof(entry_id) + _ENTRY_SLOT_BYTES
+
+    @staticmethod
+    def _split_vector_id(vector_id: str) -> tuple[str, int]:
+        if "::c" in vector_id:
+            entry_id, chunk = vector_id.split("::c", 1)
+            return entry_id, int(chunk)
+        return vector_id, -1
+
+    def _vector_id_for_label(self, label: int) -> str:
+        entry_id = self._entry_ids[int(self._label_entry[label])]
+        chunk = int(self._label_chunk[label])
+        return entry_id if chunk < 0 else _vector_id(entry_id, chunk)
+
+    def _find_label(self, vector_id: str) -> int:
+        entry_id, chunk = self._split_vector_id(vector_id)
+        ordinal = self._entry_ordinals.get(entry_id)
+        if ordinal is None:
+            return -1
+        label = int(self._entry_head[ordinal])
+        while label >= 0:
+            if self._label_chunk[label] == chunk:
+                return label
+            label = int(self._label_next[label])
+        return -1
+
+    def _link_label(self, label: int, vector_id: str) -> None:
+        entry_id, chunk = self._split_vector_id(vector_id)
+        ordinal = self._intern_entry(entry_id)
+        self._grow_label_arrays(label + 1)
+        self._label_entry[label] = ordinal
+        self._label_chunk[label] = chunk
+        self._label_next[label] = self._entry_head[ordinal]
+        self._entry_head[ordinal] = label
+        self._vector_count += 1
+
+    def _unlink_label(self, label: int) -> None:
+        ordinal = int(self._label_entry[label])
+        nxt = int(self._label_next[label])
+        head = int(self._entry_head[ordinal])
+        if head == label:
+            self._entry_head[ordinal] = nxt
+        else:
+            prev = head
+            while prev >= 0:
+                following = int(self._label_next[prev])
+                if following == label:
+                    self._label_next[prev] = nxt
+                    break
+                prev = following
+        self._label_entry[label] = -1
+        self._label_next[label] = -1
+        self._vector_count -= 1
+        if self._entry_head[ordinal] < 0:
+            self._release_entry(ordinal)
+
+    def contains_vector(self, vector_id: str) -> bool:
+        return self._find_label(vector_id) >= 0
+
+    def vector_ids(self) -> list[str]:
+        """Return the ids of all live vectors."""
+
+        live = np.flatnonzero(self._label_entry[: self.next_idx] >= 0)
+        return [self._vector_id_for_label(int(label)) for label in live]
+
+    def export_snapshot(self) -> EntryIndexSnapshot:
+        """Capture the graph and id bookkeeping without touching disk."""
+
+        used = self.next_idx
+        hnsw_meta: dict[str, object] | None = None
+        arrays: dict[str, np.ndarray] = {}
+        if self._matrix is not None:
+            arrays["matrix"] = self._matrix[:used].copy()
+            if self._matrix_scale is not None and self._matrix_offset is not None:
+                arrays["matrix_scale"] = self._matrix_scale[:used].copy()
+                arrays["matrix_offset"] = self._matrix_offset[:used].copy()
+        else:
+            assert self.index is not None
+            # hnswlib's pickled parameter dict mixes scalars and ndarrays.
+            state = cast(tuple[dict[str, Any], ...], self.index.__getstate__())
+            params = dict(state[0])
+            count = int(params["cur_element_count"])
+            hnsw_meta = {}
+            for key, value in params.items():
+                if isinstance(value, np.ndarray):
+                    arrays[f"hnsw_{key}"] = value
+                else:
+                    hnsw_meta[key] = value
+            # element_levels is sized to capacity; only the used prefix matters.
+            arrays["hnsw_element_levels"] = params["element_levels"][:count]
+            hnsw_meta["max_elements"] = count
+
+        arrays["label_entry"] = self._label_entry[:used].copy()
+        arrays["label_chunk"] = self._label_chunk[:used].copy()
+        arrays["label_next"] = self._label_next[:used].copy()
+        arrays["entry_head"] = self._entry_head[: len(self._entry_ids)].copy()
+        arrays["entry_day"] = self._entry_day[: len(self._entry_ids)].copy()
+        arrays["entry_role"] = self._entry_role[: len(self._entry_ids)].copy()
+        arrays["free_idxs"] = np.asarray(self._free_idxs, dtype=np.int64)
+        arrays["free_ordinals"] = np.asarray(self._free_ordinals, dtype=np.int64)
+        meta = {
+            "dim": self.dim,
+            "max_elements": self.max_elements,
+            "allow_growth": self.allow_growth,
+            "next_idx": self.next_idx,
+            "vector_count": self._vector_count,
+            "hnsw": hnsw_meta,
+            "entry_ids": list(self._entry_ids),
+        }
+        return EntryIndexSnapshot(meta=meta, arrays=arrays)
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        snapshot: EntryIndexSnapshot,
+        *,
+        max_elements: int,
+        exact_threshold: int = 0,
+    ) -> "EntryIndex":
+        """Rebuild an index from :meth:`export_snapshot` output."""
+
+        meta = snapshot.meta
+        arrays = snapshot.arrays
+        matrix = arrays.get("matrix")
+        params: dict[str, Any] = {}
+        if matrix is None:
+            params = dict(meta["hnsw"])
+            for name, array in arrays.items():
+                if name.startswith("hnsw_"):
+                    params[name[len("hnsw_") :]] = array
+        entry_ids = [str(entry_id) for entry_id in meta["entry_ids"]]
+        if len(arrays["entry_head"]) != len(entry_ids):
+            raise ValueError("snapshot entry table length mismatch")
+
+        allow_growth = bool(meta["allow_growth"])
+        next_idx = int(meta["next_idx"])
+        count = next_idx if matrix is not None else int(params["cur_element_count"])
+        if not allow_growth and max(count, next_idx) > max_elements:
+            raise ValueError("snapshot exceeds configured index capacity")
+        if len(arrays["label_entry"]) != next_idx:
+            raise ValueError("snapshot label table length mismatch")
+
+        idx = cls.__new__(cls)
+        idx.allow_growth = allow_growth
+        idx.exact_threshold = max(int(exact_threshold), 0)
+        idx._init_bookkeeping(int(meta["dim"]), int(max_elements))
+        target = idx._capacity_for(count)
+        if matrix is not None:
+            if len(matrix) != next_idx:
+                raise ValueError("snapshot matrix length mismatch")
+            idx._exact_dtype = matrix.dtype.type
+            idx.index = None
+            idx.capacity = target
+            idx._matrix = matrix
+            idx._matrix_scale = arrays.get("matrix_scale")
+            idx._matrix_offset = arrays.get("matrix_offset")
+            if idx._exact_dtype == np.int8 and (
+                idx._matrix_scale is None
+                or idx._matrix_offset is None
+                or len(idx._matrix_scale) != next_idx
+                or len(idx._matrix_offset) != next_idx
+            ):
+                raise ValueError("snapshot matrix quantization mismatch")
+            idx._allocate_matrix(target)
+        else:
+            idx._exact_dtype = np.float32
+            idx._matrix = None
+            idx._matrix_scale = None
+            idx._matrix_offset = None
+            idx.index = hnswlib.Index(params)
+            idx.capacity = idx.index.get_max_elements()
+            if target > idx.capacity:
+                idx.index.resize_index(target)
+                idx.capacity = target
+            idx.index.set_ef(64)
+
+        idx._grow_label_arrays(next_idx)
+        idx._label_entry[:next_idx] = arrays["label_entry"]
+        idx._label_chunk[:next_idx] = arrays["label_chunk"]
+        idx._label_next[:next_idx] = arrays["label_next"]
+        idx._entry_head = np.asarray(arrays["entry_head"], dtype=np.int32).copy()
+        idx._grow_entry_arrays(len(idx._entry_head))
+        if "entry_day" in arrays and "entry_role" in arrays:
+            idx._entry_day[: len(entry_ids)] = arrays["entry_day"]
+            idx._entry_role[: len(entry_ids)] = arrays["entry_role"]
+        idx._entry_ids = entry_ids
+        idx._free_ordinals = [int(o) for o in arrays["free_ordinals"].tolist()]
+        for ordinal, entry_id in enumerate(entry_ids):
+            if entry_id:
+                idx._entry_ordinals[entry_id] = ordinal
+                idx._interned_bytes += sys.getsizeof(entry_id) + _ENTRY_SLOT_BYTES
+        idx._free_idxs = [int(free) for free in arrays["free_idxs"].tolist()]
+        idx._vector_count = int(meta["vector_count"])
+        idx.next_idx = next_idx
+        if idx._matrix is not None and idx._vector_count > idx.exact_threshold:
+            idx._promote_to_graph(idx._vector_count)
+        return idx
+
+    def allocated_graph_bytes(self) -> int:
+        """Return the bytes hnswlib holds for the current allocation.
+
+        Mirrors ``HierarchicalNSW``'s layout: a level-0 block per slot (links,
+        float32 vector, label), per-slot level/pointer/lock arrays and the
+        visited list, plus upper-layer links and the label map for elements
+        actually inserted.
+        """
+
+        if self.index is None:
+            return 0
+        capacity = self.capacity
+        count = self.index.get_current_count()
+        max_m0 = 2 * _HNSW_M
+        level0_links = max_m0 * 4 + 4
+        upper_links = _HNSW_M * 4 + 4
+        per_slot = (
+            level0_links
+            + self.dim * np.dtype(np.float32).itemsize
+            + 8  # label
+            + 8  # linkLists_ pointer
+            + 4  # element_levels_
+            + 2  # visited list marker
+            + _HNSW_LOCK_BYTES
+        )
+        # Levels are geometric with p = 1/M, so upper layers add ~1/(M-1) lists.
+        per_element = upper_links // (_HNSW_M - 1) + 48
+        return capacity * per_slot + count * per_element
 
     def estimated_memory_bytes(self) -> int:
-        vector_count = len(self.id_to_idx)
-        base_vectors = vector_count * self.dim * np.dtype(np.float32).itemsize
-        graph_overhead = vector_count * 128
-        id_bytes = sum(len(vector_id) for vector_id in self.id_to_idx)
-        reverse_id_bytes = sum(len(vector_id) for vector_id in self.idx_to_id.values())
-        mapping_overhead = (len(self.id_to_idx) + len(self.idx_to_id)) * 72
-        entry_map_bytes = 0
-        for entry_id, vector_ids in self.entry_to_ids.items():
-            entry_map_bytes += len(entry_id) + 64
-            entry_map_bytes += sum(len(vector_id) + 16 for vector_id in vector_ids)
-        free_list_bytes = len(self._free_idxs) * 8 + len(self._free_set) * 16
+        array_bytes = (
+            self._label_entry.nbytes
+            + self._label_chunk.nbytes
+            + self._label_next.nbytes
+            + self._entry_head.nbytes
+            + self._entry_day.nbytes
+            + self._entry_role.nbytes
+        )
+        list_bytes = (
+            len(self._entry_ids) + len(self._free_ordinals) + len(self._free_idxs)
+        ) * 8
+        matrix_bytes = sum(
+            array.nbytes
+            for array in (self._matrix, self._matrix_scale, self._matrix_offset)
+            if array is not None
+        )
         return (
-            base_vectors
-            + graph_overhead
-            + id_bytes
-            + reverse_id_bytes
-            + mapping_overhead
-            + entry_map_bytes
-            + free_list_bytes
+            self.allocated_graph_bytes()
+            + matrix_bytes
+            + array_bytes
+            + list_bytes
+            + self._interned_bytes
         )
 
     def touch(self) -> None:
@@ -81,7 +559,110 @@ class EntryIndex:
 
     def contains_entry(self, entry_id: str) -> bool:
         """Return True if any vectors for entry_id are indexed."""
-        return entry_id in self.entry_to_ids
+        return entry_id in self._entry_ordinals
+
+    def entry_ids(self) -> list[str]:
+        """Return the ids of all indexed entries."""
+
+        return list(self._entry_ordinals)
+
+    def nearest_entries(self, entry_id: str, k: int) -> list[tuple[str, float]]:
+        """Return up to ``k`` other entries closest to ``entry_id``.
+
+        Neighbours are scored by their best chunk-to-chunk cosine. The lookup
+        does not count as use, so background callers do not keep an idle
+        index alive.
+        """
+
+        ordinal = self._entry_ordinals.get(entry_id)
+        if ordinal is None or k <= 0:
+            return []
+        labels: list[int] = []
+        label = int(self._entry_head[ordinal])
+        while label >= 0:
+            labels.append(label)
+            label = int(self._label_next[label])
+        if self._matrix is not None:
+            vecs = self._matrix_rows(labels)
+        else:
+            assert self.index is not None
+            vecs = np.asarray(
+                self.index.get_items(labels, return_type="numpy"), dtype=np.float32
+            )
+
+        last_used = self.last_used
+        best: dict[str, float] = {}
+        try:
+            for vec in vecs:
+                ids, dists = self.search(vec, 2 * k + len(labels))
+                for vector_id, dist in zip(ids, dists.tolist()):
+                    other = _entry_id_from_vector_id(vector_id)
+                    if other == entry_id:
+                        continue
+                    score = 1.0 - float(dist)
+                    if score > best.get(other, -2.0):
+                        best[other] = score
+        finally:
+            self.last_used = last_used
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:k]
+
+    def entries_missing_metadata(self) -> list[str]:
+        """Return indexed entry ids whose filter metadata is not loaded."""
+
+        used = len(self._entry_ids)
+        missing = np.flatnonzero(self._entry_role[:used] == 0)
+        entry_ids = self._entry_ids
+        return [entry_ids[ordinal] for ordinal in missing if entry_ids[ordinal]]
+
+    def set_entry_metadata(
+        self, rows: Iterable[tuple[str, str | None, str | None]]
+    ) -> None:
+        """Record ``(entry_id, role, created_date)`` for filtered search."""
+
+        for entry_id, role, created_date in rows:
+            ordinal = self._entry_ordinals.get(entry_id)
+            if ordinal is None:
+                continue
+            self._entry_role[ordinal] = _ROLE_CODES.get(str(role or ""), _ROLE_OTHER)
+            day = -1
+            if created_date:
+                try:
+                    day = date.fromisoformat(str(created_date)[:10]).toordinal()
+                except ValueError:
+                    day = -1
+            self._entry_day[ordinal] = day
+
+    def _label_filter_mask(
+        self, filters: "SearchFilters | None", entry_ids: Iterable[str] | None
+    ) -> np.ndarray:
+        """Return a boolean mask over labels that satisfy the filters."""
+
+        used = len(self._entry_ids)
+        allowed = np.ones(used, dtype=bool)
+        if filters is not None:
+            days = self._entry_day[:used]
+            if filters.date_from is not None:
+                allowed &= days >= filters.date_from.toordinal()
+            if filters.date_to is not None:
+                allowed &= (days >= 0) & (days <= filters.date_to.toordinal())
+            if filters.roles:
+                codes = [_ROLE_CODES.get(role, _ROLE_OTHER) for role in filters.roles]
+                allowed &= np.isin(self._entry_role[:used], codes)
+        if entry_ids is not None:
+            ordinals = [
+                ordinal
+                for ordinal in map(self._entry_ordinals.get, entry_ids)
+                if ordinal is not None
+            ]
+            listed = np.zeros(used, dtype=bool)
+            listed[ordinals] = True
+            allowed &= listed
+        label_entry = self._label_entry[: self.next_idx]
+        live = label_entry >= 0
+        mask = np.zeros(self.next_idx, dtype=bool)
+        mask[live] = allowed[label_entry[live]]
+        return mask
 
     def add_batch(self, ids: list[str], vecs: np.ndarray) -> None:
         if not ids:
@@ -92,103 +673,103 @@ class EntryIndex:
         if vecs.shape[0] != len(ids):
             raise ValueError("ids and vecs length mismatch")
 
-        pairs = [(mid, vec) for mid, vec in zip(ids, vecs) if mid not in self.id_to_idx]
-        if not pairs:
+        seen: set[str] = set()
+        keep: list[int] = []
+        for position, mid in enumerate(ids):
+            if mid in seen or self._find_label(mid) >= 0:
+                continue
+            seen.add(mid)
+            keep.append(position)
+        if not keep:
             return
-
-        id_list, vec_list = zip(*pairs)
-        ids = list(id_list)
-        vecs = np.asarray(vec_list, dtype=np.float32)
+        if len(keep) != len(ids):
+            ids = [ids[position] for position in keep]
+            vecs = vecs[keep]
 
         self.touch()
+        self.version += 1
 
-        if self.allow_growth:
-            required = self.next_idx + len(ids)
-            current_capacity = self.max_elements
-            if required > current_capacity:
-                new_capacity = max(current_capacity * 2, required)
+        if not self.allow_growth:
+            if self.max_elements <= 0:
                 logger.warning(
-                    "Resizing entry index from %d to %d to accommodate %d new items",
-                    current_capacity,
-                    new_capacity,
-                    len(ids),
-                )
-                self.index.resize_index(new_capacity)
-                self.max_elements = new_capacity
-
-            idxs = list(range(self.next_idx, self.next_idx + len(ids)))
-            logger.debug(
-                "Adding %d vectors starting at index %d", len(ids), self.next_idx
-            )
-            self.index.add_items(vecs, idxs)
-            for entry_id, idx in zip(ids, idxs):
-                self.id_to_idx[entry_id] = int(idx)
-                self.idx_to_id[int(idx)] = entry_id
-                parent_id = _entry_id_from_vector_id(entry_id)
-                self.entry_to_ids.setdefault(parent_id, set()).add(entry_id)
-            self.next_idx += len(ids)
-            return
-
-        if self.max_elements <= 0:
-            logger.warning("Entry index capacity is zero; skipping %d items", len(ids))
-            return
-
-        incoming = len(ids)
-        if incoming > self.max_elements:
-            ids = ids[: self.max_elements]
-            vecs = vecs[: self.max_elements]
-            incoming = len(ids)
-
-        active = len(self.id_to_idx)
-        room = self.max_elements - active
-        if incoming > room:
-            to_evict = incoming - room
-            self._evict_oldest(to_evict)
-            active = len(self.id_to_idx)
-            room = self.max_elements - active
-            if room <= 0:
-                logger.warning(
-                    "Entry index at capacity after eviction; dropping %d items",
-                    incoming,
+                    "Entry index capacity is zero; skipping %d items", len(ids)
                 )
                 return
-            if incoming > room:
+            if len(ids) > self.max_elements:
+                ids = ids[: self.max_elements]
+                vecs = vecs[: self.max_elements]
+            room = self.max_elements - self._vector_count
+            if len(ids) > room:
+                self._evict_oldest(len(ids) - room)
+                room = self.max_elements - self._vector_count
+                if room <= 0:
+                    logger.warning(
+                        "Entry index at capacity after eviction; dropping %d items",
+                        len(ids),
+                    )
+                    return
                 ids = ids[:room]
                 vecs = vecs[:room]
-                incoming = len(ids)
 
+        # Freed labels are handed back to hnswlib as-is: adding an existing
+        # deleted label revives its slot in place, keeping labels and slots
+        # one-to-one so the graph never holds more than ``next_idx`` elements.
+        incoming = len(ids)
         idxs: list[int] = []
         while self._free_idxs and len(idxs) < incoming:
-            idx = self._free_idxs.pop()
-            self._free_set.discard(idx)
-            idxs.append(idx)
-
+            idxs.append(self._free_idxs.pop())
         if len(idxs) < incoming:
             needed = incoming - len(idxs)
-            start = self.next_idx
-            end = min(self.next_idx + needed, self.max_elements)
-            idxs.extend(range(start, end))
-            self.next_idx = end
-            if len(idxs) < incoming:
-                ids = ids[: len(idxs)]
-                vecs = vecs[: len(idxs)]
-                incoming = len(ids)
-
-        logger.debug("Adding %d vectors with cap=%d", incoming, self.max_elements)
-        self.index.add_items(vecs, idxs, replace_deleted=True)
-        for entry_id, idx in zip(ids, idxs):
-            self.id_to_idx[entry_id] = int(idx)
-            self.idx_to_id[int(idx)] = entry_id
-            parent_id = _entry_id_from_vector_id(entry_id)
-            self.entry_to_ids.setdefault(parent_id, set()).add(entry_id)
-
-    def search(self, query_vec: np.ndarray, k: int) -> tuple[list[str], np.ndarray]:
+            idxs.extend(range(self.next_idx, self.next_idx + needed))
+            self.next_idx += needed
+
+        if (
+            self._matrix is not None
+            and self._vector_count + incoming > self.exact_threshold
+        ):
+            self._promote_to_graph(self.next_idx)
+        self._ensure_capacity(self.next_idx)
+        logger.debug(
+            "Adding %d vectors (%d live, cap=%d)",
+            incoming,
+            self._vector_count,
+            self.capacity,
+        )
+        if self._matrix is not None:
+            self._store_rows(idxs, vecs)
+        else:
+            assert self.index is not None
+            self.index.add_items(vecs, idxs)
+        for vector_id, idx in zip(ids, idxs):
+            self._link_label(idx, vector_id)
+
+    def search(
+        self,
+        query_vec: np.ndarray,
+        k: int,
+        *,
+        filters: "SearchFilters | None" = None,
+        entry_ids: Iterable[str] | None = None,
+    ) -> tuple[list[str], np.ndarray]:
+        """Return the ``k`` nearest vector ids and their cosine distances.
+
+        ``filters`` and ``entry_ids`` restrict the search to matching labels;
+        the predicate is evaluated inside the query so rejected vectors never
+        take up result slots.
+        """
+
         self.touch()
         query_vec = np.asarray(query_vec, dtype=np.float32)
         if query_vec.ndim == 1:
             query_vec = query_vec.reshape(1, -1)
+        mask: np.ndarray | None = None
+        if entry_ids is not None or (filters is not None and not filters.is_empty):
+            mask = self._label_filter_mask(filters, entry_ids)
+        if self._matrix is not None:
+            return self._search_exact(query_vec[0], k, mask)
+        assert self.index is not None
         count = self.index.get_current_count()
-        available = len(self.idx_to_id)
+        available = self._vector_count if mask is None else int(mask.sum())
         if count == 0 or available == 0:
             logger.debug("Search invoked on empty index")
             return [], np.array([], dtype=np.float32)
@@ -196,53 +777,173 @@ class EntryIndex:
         if k <= 0:
             logger.debug("Search invoked with no available vectors")
             return [], np.array([], dtype=np.float32)
+        if mask is not None and available <= max(_FILTER_EXACT_LIMIT, k):
+            return self._search_labels(query_vec[0], k, np.flatnonzero(mask))
         ef = max(k, 64)
         self.index.set_ef(ef)
         logger.debug("Searching %d vectors with k=%d ef=%d", count, k, ef)
-        labels_arr, dists = cast(
-            tuple[np.ndarray, np.ndarray], self.index.knn_query(query_vec, k=k)
-        )
+        if mask is not None:
+            allowed = mask.tolist()
+            try:
+                labels_arr, dists = cast(
+                    tuple[np.ndarray, np.ndarray],
+                    self.index.knn_query(
+                        query_vec,
+                        k=k,
+                        filter=lambda label: (
+                            int(label) < len(allowed) and allowed[int(label)]
+                        ),
+                    ),
+                )
+            except RuntimeError:
+                # hnswlib raises when the filtered walk finds fewer than k.
+                return self._search_labels(query_vec[0], k, np.flatnonzero(mask))
+        else:
+            labels_arr, dists = cast(
+                tuple[np.ndarray, np.ndarray], self.index.knn_query(query_vec, k=k)
+            )
         ids: list[str] = []
-        for label in labels_arr[0]:
+        keep: list[int] = []
+        size = len(self._label_entry)
+        for pos, label in enumerate(labels_arr[0]):
             idx_label = int(label)
-            vector_id = self.idx_to_id.get(idx_label)
-            if vector_id is not None:
-                ids.append(vector_id)
-        return ids, dists[0][: len(ids)]
+            if idx_label < size and self._label_entry[idx_label] >= 0:
+                ids.append(self._vector_id_for_label(idx_label))
+                keep.append(pos)
+        return ids, dists[0][keep]
+
+    def _search_labels(
+        self, query_vec: np.ndarray, k: int, labels: np.ndarray
+    ) -> tuple[list[str], np.ndarray]:
+        """Score ``labels`` directly against the query (selective filters)."""
+
+        assert self.index is not None
+        if len(labels) == 0:
+            return [], np.array([], dtype=np.float32)
+        vecs = np.asarray(self.index.get_items(labels, return_type="numpy"))
+        query = _normalize_rows(query_vec.reshape(1, -1))[0]
+        scores = _normalize_rows(vecs.astype(np.float32, copy=False)) @ query
+        k = min(k, len(labels))
+        if k < len(labels):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(labels))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        logger.debug("Filtered exact search over %d vectors with k=%d", len(labels), k)
+        ids = [self._vector_id_for_label(int(labels[pos])) for pos in top]
+        return ids, (1.0 - scores[top]).astype(np.float32)
+
+    def _search_exact(
+        self, query_vec: np.ndarray, k: int, mask: np.ndarray | None = None
+    ) -> tuple[list[str], np.ndarray]:
+        assert self._matrix is not None
+        used = self.next_idx
+        available = self._vector_count if mask is None else int(mask.sum())
+        k = min(k, available)
+        if k <= 0 or used == 0:
+            logger.debug("Search invoked on empty index")
+            return [], np.array([], dtype=np.float32)
+        query = _normalize_rows(query_vec.reshape(1, -1))[0]
+        if self._matrix_scale is not None:
+            scores = self._quantized_scores(query, used)
+        else:
+            matrix = self._matrix[:used]
+            if matrix.dtype != np.float32:
+                # float16 matmul has no BLAS path; upcasting is far cheaper.
+                matrix = matrix.astype(np.float32)
+            scores = matrix @ query
+        scores[self._label_entry[:used] < 0] = -np.inf
+        if mask is not None:
+            scores[~mask[:used]] = -np.inf
+        if self._matrix_scale is not None:
+            # Renormalise a wider quantized shortlist to cosine scores.
+            shortlist = min(k * _INT8_SHORTLIST_FACTOR, available)
+            if shortlist < used:
+                top = np.argpartition(-scores, shortlist - 1)[:shortlist]
+            else:
+                top = np.arange(used)
+            top = top[np.isfinite(scores[top])]
+            scores[top] = _normalize_rows(self._matrix_rows(top)) @ query
+            top = top[np.argsort(-scores[top], kind="stable")[:k]]
+        else:
+            if k < used:
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(used)
+            top = top[np.argsort(-scores[top], kind="stable")]
+        logger.debug("Exact search over %d vectors with k=%d", used, k)
+        ids = [self._vector_id_for_label(int(label)) for label in top]
+        return ids, (1.0 - scores[top]).astype(np.float32)
+
+    def _quantized_scores(self, query: np.ndarray, used: int) -> np.ndarray:
+        """Score the first ``used`` int8 rows against ``query``.
+
+        With ``row ~= (code + 128) * scale + offset`` the dot product expands
+        to ``scale * (code . q + 128 * sum(q)) + offset * sum(q)``, so only
+        the codes need upcasting, a chunk at a time.
+        """
+
+        assert self._matrix is not None
+        assert self._matrix_scale is not None and self._matrix_offset is not None
+        total = float(query.sum())
+        scores = np.empty(used, dtype=np.float32)
+        for start in range(0, used, _INT8_SCORE_CHUNK):
+            end = min(start + _INT8_SCORE_CHUNK, used)
+            scores[start:end] = self._matrix[start:end].astype(np.float32) @ query
+        scores += 128.0 * total
+        scores *= self._matrix_scale[:used]
+        scores += self._matrix_offset[:used] * total
+        return scores
 
     def remove_entries(self, entry_ids: Iterable[str]) -> None:
         removed = False
         for entry_id in entry_ids:
-            vector_ids = self.entry_to_ids.pop(entry_id, set())
-            for vector_id in vector_ids:
-                removed |= self._remove_vector_id(vector_id)
+            ordinal = self._entry_ordinals.get(entry_id)
+            if ordinal is None:
+                continue
+            label = int(self._entry_head[ordinal])
+            while label >= 0:
+                following = int(self._label_next[label])
+                self._remove_label(label)
+                removed = True
+                label = following
         if removed:
             self.touch()
 
+    def remove_vectors(self, vector_ids: Iterable[str]) -> int:
+        return sum(1 for vector_id in vector_ids if self._remove_vector_id(vector_id))
+
     def _remove_vector_id(self, vector_id: str) -> bool:
-        idx = self.id_to_idx.pop(vector_id, None)
-        if idx is None:
+        label = self._find_label(vector_id)
+        if label < 0:
             return False
-        self.idx_to_id.pop(idx, None)
-        parent_id = _entry_id_from_vector_id(vector_id)
-        vector_set = self.entry_to_ids.get(parent_id)
-        if vector_set is not None:
-            vector_set.discard(vector_id)
-            if not vector_set:
-                self.entry_to_ids.pop(parent_id, None)
-        if hasattr(self.index, "mark_deleted"):
-            self.index.mark_deleted(idx)
-        if idx not in self._free_set:
-            self._free_idxs.append(idx)
-            self._free_set.add(idx)
+        self._remove_label(label)
         return True
 
+    def _remove_label(self, label: int) -> None:
+        self._unlink_label(label)
+        if self.index is not None:
+            self.index.mark_deleted(label)
+        self.version += 1
+        self._free_idxs.append(label)
+
     def _evict_oldest(self, count: int) -> None:
         remaining = max(int(count), 0)
         if remaining <= 0:
             return
-        for vector_id in sorted(self.id_to_idx.keys())[:remaining]:
-            self._remove_vector_id(vector_id)
+        for entry_id in sorted(self._entry_ordinals):
+            ordinal = self._entry_ordinals[entry_id]
+            labels = []
+            label = int(self._entry_head[ordinal])
+            while label >= 0:
+                labels.append(label)
+                label = int(self._label_next[label])
+            labels.sort(key=lambda item: int(self._label_chunk[item]))
+            for label in labels[:remaining]:
+                self._remove_label(label)
+            remaining -= min(len(labels), remaining)
+            if remaining <= 0:
+                return
 
 
 class EntryIndexStore:
@@ -284,7 +985,7 @@ class EntryIndexStore:
         self.embed_batch_size = int(index_cfg.get("embed_batch_size", 128))
         self.warm_entry_batch = int(index_cfg.get("warm_entry_batch", 200))
         dtype = str(vector_cfg.get("dtype", "float32")).lower()
-        if dtype not in {"float32", "float16"}:
+        if dtype not in VECTOR_DTYPES:
             logger.warning(
                 "Unsupported vector dtype '%s'; defaulting to float32", dtype
             )
@@ -325,7 +1026,35 @@ class EntryIndexStore:
         self._backfill_cursor = 0
         self._contexts: Dict[str, CryptoContext] = {}
         self._coverage_cache: Dict[str, dict[str, float | int | str]] = {}
+        # Bumped whenever a user's index content changes; never reset, so a
+        # rebuilt index does not reuse an old revision.
+        self._revisions: Dict[str, int] = {}
         self._last_coverage_emit: Dict[str, float] = {}
+        self.exact_search_threshold = max(
+            int(index_cfg.get("exact_search_threshold", 4096)), 0
+        )
+        exact_dtype = str(index_cfg.get("exact_search_dtype", "float32")).lower()
+        if exact_dtype not in _EXACT_DTYPES:
+            logger.warning(
+                "Unsupported exact search dtype '%s'; defaulting to float32",
+                exact_dtype,
+            )
+            exact_dtype = "float32"
+        self.exact_search_dtype = exact_dtype
+        self.snapshot_enabled = bool(index_cfg.get("snapshot_enabled", True))
+        self.snapshot_interval = max(
+            float(index_cfg.get("snapshot_interval_s", 300.0)), 1.0
+        )
+        self._snapshots = EntryIndexSnapshotStore(db)
+        related_cfg = embedding_cfg.get("related", {})
+        self.related = RelatedEntriesBuilder(
+            db,
+            k=int(related_cfg.get("k", 6)),
+            batch_size=int(related_cfg.get("batch_size", 64)),
+            enabled=bool(related_cfg.get("enabled", True)),
+        )
+        self._snapshot_versions: Dict[str, int] = {}
+        self._snapshot_times: Dict[str, float] = {}
 
     def _estimate_total_memory_bytes(self) -> int:
         return sum(index.estimated_memory_bytes() for index in self.indexes.values())
@@ -347,7 +1076,7 @@ class EntryIndexStore:
         except Exception:  # pragma: no cover - defensive
             logger.exception("Failed to emit entry index budget pulse")
 
-    def _enforce_global_budget(self) -> None:
+    async def _enforce_global_budget(self) -> None:
         budget = self._global_memory_budget_bytes
         if budget <= 0 or not self.indexes:
             return
@@ -359,10 +1088,13 @@ class EntryIndexStore:
                 if total_bytes <= budget:
                     break
                 reclaimed = index.estimated_memory_bytes()
+                await self._persist_snapshot(user_id, force=True)
                 self.indexes.pop(user_id, None)
                 self.cursors.pop(user_id, None)
                 self.locks.pop(user_id, None)
                 self._warm_tasks.pop(user_id, None)
+                self._forget_snapshot_state(user_id)
+                self.related.forget(user_id)
                 ctx = self._contexts.pop(user_id, None)
                 if ctx is not None:
                     ctx.drop()
@@ -370,6 +1102,149 @@ class EntryIndexStore:
                 evicted += 1
         self._emit_budget_pressure(evicted=evicted, total_bytes=total_bytes)
 
+    def _forget_snapshot_state(self, user_id: str) -> None:
+        self._snapshot_versions.pop(user_id, None)
+        self._snapshot_times.pop(user_id, None)
+
+    async def _persist_snapshot(self, user_id: str, *, force: bool = False) -> bool:
+        """Seal the user's index into the lockbox if it changed since last time."""
+
+        if not self.snapshot_enabled:
+            return False
+        idx = self.indexes.get(user_id)
+        ctx = self._contexts.get(user_id)
+        if idx is None or ctx is None:
+            return False
+        if idx.version == self._snapshot_versions.get(user_id):
+            return False
+        if idx.next_idx == 0:
+            return False
+        last = self._snapshot_times.get(user_id)
+        if (
+            not force
+            and last is not None
+            and time.monotonic() - last < self.snapshot_interval
+        ):
+            return False
+        try:
+            save_ctx = ctx.fork()
+        except ValueError:
+            return False
+
+        try:
+            async with self._get_lock(user_id):
+                if self.indexes.get(user_id) is not idx:
+                    return False
+                version = idx.version
+                watermark = await self.db.vectors.get_vector_watermark(user_id)
+                snapshot = await asyncio.to_thread(idx.export_snapshot)
+                snapshot.meta["cursor"] = self.cursors.get(user_id)
+                snapshot.meta["vector_watermark"] = watermark
+            data = await asyncio.to_thread(encode_snapshot, snapshot)
+            await self._snapshots.save(save_ctx, data)
+        except Exception:
+            logger.exception("Failed to persist entry index snapshot for %s", user_id)
+            return False
+        finally:
+            save_ctx.drop()
+
+        self._snapshot_versions[user_id] = version
+        self._snapshot_times[user_id] = time.monotonic()
+        logger.debug(
+            "Persisted entry index snapshot for user %s (%d bytes)",
+            user_id,
+            len(data),
+        )
+        return True
+
+    async def persist_snapshots(self, *, force: bool = False) -> int:
+        """Persist snapshots for every resident index that changed."""
+
+        saved = 0
+        for user_id in list(self.indexes):
+            if await self._persist_snapshot(user_id, force=force):
+                saved += 1
+        return saved
+
+    async def _restore_snapshot(self, ctx: CryptoContext) -> Optional[EntryIndex]:
+        """Load the sealed snapshot and reconcile it with the vectors table.
+
+        Vectors deleted since the snapshot are dropped, and vectors whose
+        rowid moved past the snapshot watermark (new or re-embedded chunks)
+        are decrypted and applied. Vectors for entries newer than the backfill
+        cursor that the snapshot lacks are applied as well, which covers
+        SQLite reusing the rowid of a deleted tail row.
+        """
+
+        if not self.snapshot_enabled:
+            return None
+        user_id = ctx.user_id
+        snapshot = await self._snapshots.load(ctx)
+        if snapshot is None:
+            return None
+        if bool(snapshot.meta.get("allow_growth")) != self.allow_growth:
+            return None
+        try:
+            idx = await asyncio.to_thread(
+                EntryIndex.from_snapshot,
+                snapshot,
+                max_elements=self.max_elements,
+                exact_threshold=self.exact_search_threshold,
+            )
+        except Exception:
+            logger.warning(
+                "Discarding incompatible entry index snapshot for user %s",
+                user_id,
+                exc_info=True,
+            )
+            return None
+
+        cursor = snapshot.meta.get("cursor")
+        watermark = int(snapshot.meta.get("vector_watermark") or 0)
+        manifest = await self.db.vectors.get_vector_manifest(user_id)
+        stale = [
+            vector_id for vector_id in idx.vector_ids() if vector_id not in manifest
+        ]
+        fresh = [
+            vector_id
+            for vector_id, rowid in manifest.items()
+            if rowid > watermark
+            or (
+                not idx.contains_vector(vector_id)
+                and cursor is not None
+                and _entry_id_from_vector_id(vector_id) >= cursor
+            )
+        ]
+        idx.remove_vectors(stale)
+        if fresh:
+            batch = await self.db.vectors.get_vectors_by_ids(ctx, fresh)
+            if batch:
+                idx.remove_vectors(batch.ids)
+                idx.add_batch(batch.ids, batch.vectors)
+
+        self.cursors[user_id] = cursor
+        if not stale and not fresh:
+            self._snapshot_versions[user_id] = idx.version
+        self._snapshot_times[user_id] = time.monotonic()
+        logger.debug(
+            "Restored entry index snapshot for user %s (%d vectors, -%d/+%d delta)",
+            user_id,
+            idx.vector_count,
+            len(stale),
+            len(fresh),
+        )
+        return idx
+
+    def _new_index(self, dim: int, expected: int = 0) -> EntryIndex:
+        return EntryIndex(
+            dim,
+            self.max_elements,
+            allow_growth=self.allow_growth,
+            initial_capacity=expected,
+            exact_threshold=self.exact_search_threshold,
+            exact_dtype=self.exact_search_dtype,
+        )
+
     def _to_storage_vecs(self, vecs: np.ndarray) -> np.ndarray:
         if self._vector_np_dtype == np.float32:
             return vecs
@@ -398,7 +1273,13 @@ class EntryIndexStore:
             previous.drop()
         self._contexts[ctx.user_id] = forked
 
-    def _invalidate_coverage(self, user_id: str) -> None:
+    def revision(self, user_id: str) -> int:
+        """Return a counter that changes whenever the user's index does."""
+
+        return self._revisions.get(user_id, 0)
+
+    def _index_changed(self, user_id: str) -> None:
+        self._revisions[user_id] = self._revisions.get(user_id, 0) + 1
         self._coverage_cache.pop(user_id, None)
 
     def _emit_coverage(
@@ -472,19 +1353,20 @@ class EntryIndexStore:
 
     async def process_backfill_batches(self) -> int:
         users = self._fair_backfill_users()
-        if not users:
-            return 0
-
         wall_start = time.monotonic()
         cpu_start = time.process_time()
-        batches = 0
-        for user_id in users:
+
+        def _over_budget() -> bool:
             wall_ms = (time.monotonic() - wall_start) * 1000.0
             cpu_ms = (time.process_time() - cpu_start) * 1000.0
-            if (
+            return (
                 wall_ms >= self.backfill_wall_budget_ms
                 or cpu_ms >= self.backfill_cpu_budget_ms
-            ):
+            )
+
+        batches = 0
+        for user_id in users:
+            if _over_budget():
                 break
             ctx = self._contexts.get(user_id)
             if ctx is None:
@@ -512,10 +1394,32 @@ class EntryIndexStore:
                 batch_ctx.drop()
             await asyncio.sleep(0)
 
-        if self._backfill_order:
+        if users and self._backfill_order:
             self._backfill_cursor = (self._backfill_cursor + max(batches, 1)) % len(
                 self._backfill_order
             )
+
+        # Related entries come from vectors already in memory, so they share
+        # whatever budget embedding backfill left over.
+        for user_id, idx in list(self.indexes.items()):
+            if _over_budget():
+                break
+            if not self.related.has_work(user_id, idx):
+                continue
+            ctx = self._contexts.get(user_id)
+            if ctx is None:
+                continue
+            try:
+                batch_ctx = ctx.fork()
+            except ValueError:
+                continue
+            try:
+                await self.related.process(batch_ctx, idx)
+            except Exception:
+                logger.exception("Related entries update failed for user %s", user_id)
+            finally:
+                batch_ctx.drop()
+            await asyncio.sleep(0)
         return batches
 
     async def _get_default_dim(self) -> int:
@@ -542,7 +1446,7 @@ class EntryIndexStore:
             if idx is not None:
                 return idx
             dim = await self._get_default_dim()
-            fresh = EntryIndex(dim, self.max_elements, allow_growth=self.allow_growth)
+            fresh = self._new_index(dim)
             self.indexes[ctx.user_id] = fresh
             return fresh
 
@@ -550,21 +1454,19 @@ class EntryIndexStore:
         vector_ids: list[str] = []
         vector_entries: list[str] = []
         vector_chunks: list[int] = []
+        vector_digests: list[str] = []
         for entry in entry_list:
             entry_id = entry["id"]
             chunks = self._chunk_entry(entry.get("text", ""))
             for chunk_index, chunk in enumerate(chunks):
                 vector_texts.append(chunk)
+                vector_digests.append(ctx.chunk_digest(chunk))
                 vector_entries.append(entry_id)
                 vector_chunks.append(chunk_index)
                 vector_ids.append(_vector_id(entry_id, chunk_index))
 
         if not vector_texts:
-            return idx or EntryIndex(
-                await self._get_default_dim(),
-                self.max_elements,
-                allow_growth=self.allow_growth,
-            )
+            return idx or self._new_index(await self._get_default_dim())
 
         batch_size = max(self.embed_batch_size, 1)
         for start in range(0, len(vector_texts), batch_size):
@@ -576,7 +1478,7 @@ class EntryIndexStore:
             vecs = await async_embed_texts(batch_texts)
             if idx is None:
                 dim = vecs.shape[1]
-                idx = EntryIndex(dim, self.max_elements, allow_growth=self.allow_growth)
+                idx = self._new_index(dim, len(vector_texts))
             idx.add_batch(batch_ids, vecs)
             store_vecs = self._to_storage_vecs(vecs)
             await self.db.vectors.store_vectors_batch(
@@ -588,6 +1490,7 @@ class EntryIndexStore:
                 ],
                 ctx,
                 self.vector_dtype,
+                chunk_digests=vector_digests[start:end],
             )
             await asyncio.sleep(0)
         if entry_list:
@@ -600,7 +1503,7 @@ class EntryIndexStore:
         # iteration assigns idx if it was None (line 352).
         assert idx is not None
         self.indexes[ctx.user_id] = idx
-        self._invalidate_coverage(ctx.user_id)
+        self._index_changed(ctx.user_id)
         return idx
 
     async def ensure_index(self, ctx: CryptoContext) -> EntryIndex:
@@ -615,22 +1518,35 @@ class EntryIndexStore:
                 idx.touch()
                 return idx
 
-            rows = await self.db.vectors.get_latest_vectors(ctx, self.warm_limit)
-            if rows:
+            idx = await self._restore_snapshot(ctx)
+            if idx is not None:
+                self.indexes[user_id] = idx
+                self._index_changed(user_id)
+                missing_ids = await self.db.vectors.get_entry_ids_without_vectors(
+                    user_id, self.warm_limit
+                )
+                if missing_ids:
+                    entries = await self.db.entries.get_entries_by_ids(ctx, missing_ids)
+                    entries.sort(key=lambda entry: entry["id"], reverse=True)
+                    logger.debug(
+                        "Queueing %d entries missing vectors for user %s",
+                        len(entries),
+                        user_id,
+                    )
+                    self._schedule_warm(ctx, entries)
+                return idx
+
+            batch = await self.db.vectors.get_latest_vectors(ctx, self.warm_limit)
+            if batch:
                 logger.debug(
-                    "Warming index for user %s with %d vectors", user_id, len(rows)
+                    "Warming index for user %s with %d vectors", user_id, len(batch)
                 )
-                dim = rows[0]["vec"].shape[0]
-                idx = EntryIndex(dim, self.max_elements, allow_growth=self.allow_growth)
-                ids = [r["id"] for r in rows]
-                vecs = np.array([r["vec"] for r in rows], dtype=np.float32)
-                if vecs.ndim == 1:
-                    vecs = vecs.reshape(1, -1)
-                idx.add_batch(ids, vecs)
-                cursor = rows[-1]["entry_id"]
+                idx = self._new_index(batch.dim, len(batch))
+                idx.add_batch(batch.ids, batch.vectors)
+                cursor = batch.entry_ids[-1]
                 self.cursors[user_id] = cursor
                 self.indexes[user_id] = idx
-                self._invalidate_coverage(user_id)
+                self._index_changed(user_id)
 
                 entries = await self.db.entries.get_latest_entries(ctx, self.warm_limit)
                 missing = [
@@ -653,9 +1569,9 @@ class EntryIndexStore:
                     user_id,
                 )
                 dim = await self._get_default_dim()
-                idx = EntryIndex(dim, self.max_elements, allow_growth=self.allow_growth)
+                idx = self._new_index(dim, len(entries))
                 self.indexes[user_id] = idx
-                self._invalidate_coverage(user_id)
+                self._index_changed(user_id)
                 cursor = entries[-1]["id"]
                 self.cursors[user_id] = cursor
                 self._schedule_warm(ctx, entries)
@@ -663,7 +1579,7 @@ class EntryIndexStore:
 
             logger.debug("No existing data for user %s, creating empty index", user_id)
             dim = await self._get_default_dim()
-            idx = EntryIndex(dim, self.max_elements, allow_growth=self.allow_growth)
+            idx = self._new_index(dim)
             latest = await self.db.entries.get_user_latest_entry_id(user_id)
             self.cursors[user_id] = latest
             self.indexes[user_id] = idx
@@ -724,21 +1640,17 @@ class EntryIndexStore:
             added = 0
             new_cursor = cursor
 
-            rows = await self.db.vectors.get_vectors_older_than(ctx, cursor, batch)
-            if rows:
+            stored = await self.db.vectors.get_vectors_older_than(ctx, cursor, batch)
+            if stored:
                 logger.debug(
                     "Loaded %d stored vectors older than %s for user %s",
-                    len(rows),
+                    len(stored),
                     cursor,
                     user_id,
                 )
-                ids = [r["id"] for r in rows]
-                vecs = np.array([r["vec"] for r in rows], dtype=np.float32)
-                if vecs.ndim == 1:
-                    vecs = vecs.reshape(1, -1)
-                idx.add_batch(ids, vecs)
-                added += len(ids)
-                new_cursor = rows[-1]["entry_id"]
+                idx.add_batch(stored.ids, stored.vectors)
+                added += len(stored)
+                new_cursor = stored.entry_ids[-1]
 
             entries = await self.db.entries.get_entries_older_than(ctx, cursor, batch)
             missing = [
@@ -762,9 +1674,28 @@ class EntryIndexStore:
             existing = self.cursors.get(user_id)
             if existing is None or new_cursor < existing:
                 self.cursors[user_id] = new_cursor
-            self._invalidate_coverage(user_id)
+            self._index_changed(user_id)
             return added
 
+    async def load_filter_metadata(self, user_id: str, idx: EntryIndex) -> None:
+        """Fetch role/date metadata for indexed entries that lack it."""
+
+        missing = idx.entries_missing_metadata()
+        if not missing:
+            return
+        rows = await self.db.entries.get_entry_filter_metadata(user_id, missing)
+        found = {row[0] for row in rows}
+        # Entries gone from the database are marked too, so they are not
+        # re-queried on every filtered search until the index drops them.
+        rows.extend(
+            (entry_id, None, None) for entry_id in missing if entry_id not in found
+        )
+        idx.set_entry_metadata(rows)
+
+    async def entry_ids_for_tags(self, user_id: str, tags: Iterable[str]) -> set[str]:
+        hashes = [tag_hash(user_id, tag) for tag in tags]
+        return await self.db.tags.get_entry_ids_for_tags(user_id, hashes)
+
     async def hydrate_entries(
         self, ctx: CryptoContext, entry_ids: list[str]
     ) -> list[dict]:
@@ -785,67 +1716,124 @@ class EntryIndexStore:
         if not items:
             return
 
-        pending: list[tuple[CryptoContext, str, str, int, str]] = []
+        # Chunks are addressed by a keyed digest of their text so re-indexing
+        # an edited entry only embeds the chunks whose content changed.
+        per_user: Dict[str, list[tuple[CryptoContext, str, list[str], list[str]]]] = {}
         for ctx, entry_id, content in items:
             chunks = self._chunk_entry(content)
-            for chunk_index, chunk_part in enumerate(chunks):
-                vector_id = _vector_id(entry_id, chunk_index)
-                pending.append((ctx, entry_id, vector_id, chunk_index, chunk_part))
-
-        if not pending:
-            return
-
-        texts = [chunk_text for _, _, _, _, chunk_text in pending]
-        vecs = await async_embed_texts(texts)
-        if vecs.shape[0] != len(pending):  # pragma: no cover - defensive
-            raise ValueError("Embedding count does not match input items")
-
-        per_user_vectors: Dict[
-            str, list[tuple[str, str, int, np.ndarray, CryptoContext]]
-        ] = {}
-        for (ctx, entry_id, vector_id, chunk_index, _), vec in zip(pending, vecs):
-            per_user_vectors.setdefault(ctx.user_id, []).append(
-                (vector_id, entry_id, chunk_index, vec, ctx)
+            digests = [ctx.chunk_digest(chunk) for chunk in chunks]
+            per_user.setdefault(ctx.user_id, []).append(
+                (ctx, entry_id, chunks, digests)
             )
 
+        cached: Dict[str, dict[str, tuple[str, np.ndarray]]] = {}
+        misses: dict[tuple[str, str], str] = {}
+        for user_id, user_items in per_user.items():
+            ctx = user_items[0][0]
+            digests = [digest for _, _, _, ds in user_items for digest in ds]
+            try:
+                hits = await self.db.vectors.get_vectors_by_chunk_digests(ctx, digests)
+            except Exception:
+                logger.warning(
+                    "Chunk embedding cache lookup failed for user %s; re-embedding",
+                    user_id,
+                    exc_info=True,
+                )
+                hits = {}
+            cached[user_id] = hits
+            for _, _, chunks, ds in user_items:
+                for chunk, digest in zip(chunks, ds):
+                    if digest not in hits:
+                        misses.setdefault((user_id, digest), chunk)
+
+        fresh: dict[tuple[str, str], np.ndarray] = {}
+        if misses:
+            vecs = await async_embed_texts(list(misses.values()))
+            if vecs.shape[0] != len(misses):  # pragma: no cover - defensive
+                raise ValueError("Embedding count does not match input items")
+            fresh = dict(zip(misses.keys(), vecs))
+
+        total_chunks = sum(
+            len(ds) for user_items in per_user.values() for _, _, _, ds in user_items
+        )
         logger.debug(
-            "Bulk indexing %d entries across %d users",
+            "Bulk indexing %d entries across %d users (%d/%d chunks embedded)",
             len(items),
-            len(per_user_vectors),
+            len(per_user),
+            len(fresh),
+            total_chunks,
         )
 
-        for user_id, user_entries in per_user_vectors.items():
-            ctx = user_entries[0][4]
-            idx = await self.ensure_index(ctx)
+        for user_id, user_items in per_user.items():
+            ctx = user_items[0][0]
+            hits = cached[user_id]
+            ids: list[str] = []
+            index_vecs: list[np.ndarray] = []
+            changed: list[str] = []
+            writes: list[tuple[str, str, int, np.ndarray]] = []
+            write_digests: list[str] = []
+            chunk_counts: dict[str, int] = {}
+            for _, entry_id, _, digests in user_items:
+                chunk_counts[entry_id] = len(digests)
+                for chunk_index, digest in enumerate(digests):
+                    vector_id = _vector_id(entry_id, chunk_index)
+                    hit = hits.get(digest)
+                    vec = hit[1] if hit is not None else fresh[(user_id, digest)]
+                    ids.append(vector_id)
+                    index_vecs.append(vec)
+                    if hit is not None and hit[0] == vector_id:
+                        continue
+                    changed.append(vector_id)
+                    writes.append((vector_id, entry_id, chunk_index, vec))
+                    write_digests.append(digest)
+
+            # Entries that no longer produce chunks only need their rows pruned.
+            idx = await self.ensure_index(ctx) if ids else self.indexes.get(user_id)
             lock = self._get_lock(user_id)
-            ids = [vector_id for vector_id, _, _, _, _ in user_entries]
-            vec_arr = np.asarray(
-                [vec for _, _, _, vec, _ in user_entries], dtype=np.float32
-            )
             async with lock:
-                store_vecs = self._to_storage_vecs(vec_arr)
+                store_vecs = (
+                    self._to_storage_vecs(
+                        np.asarray([vec for _, _, _, vec in writes], dtype=np.float32)
+                    )
+                    if writes
+                    else []
+                )
                 await self.db.vectors.store_vectors_batch(
                     [
                         (vector_id, entry_id, chunk_index, vec)
-                        for vector_id, entry_id, chunk_index, vec in zip(
-                            ids,
-                            [entry_id for _, entry_id, _, _, _ in user_entries],
-                            [chunk_index for _, _, chunk_index, _, _ in user_entries],
-                            store_vecs,
+                        for (vector_id, entry_id, chunk_index, _), vec in zip(
+                            writes, store_vecs
                         )
                     ],
                     ctx,
                     self.vector_dtype,
+                    chunk_digests=write_digests,
+                    chunk_counts=chunk_counts,
                 )
-                idx.add_batch(ids, vec_arr)
-                for entry_id in {entry_id for _, entry_id, _, _, _ in user_entries}:
+                if idx is None:
+                    continue
+                stale = list(changed)
+                for entry_id, count in chunk_counts.items():
+                    chunk_index = count
+                    while idx.contains_vector(_vector_id(entry_id, chunk_index)):
+                        stale.append(_vector_id(entry_id, chunk_index))
+                        chunk_index += 1
+                idx.remove_vectors(stale)
+                if ids:
+                    idx.add_batch(ids, np.asarray(index_vecs, dtype=np.float32))
+                for entry_id, count in chunk_counts.items():
+                    if not count:
+                        continue
                     current = self.cursors.get(user_id)
                     if current is None or entry_id < current:
                         self.cursors[user_id] = entry_id
                 self.indexes[user_id] = idx
-                self._invalidate_coverage(user_id)
+                self._index_changed(user_id)
+                self.related.mark_stale(
+                    user_id, [entry_id for entry_id, n in chunk_counts.items() if n]
+                )
 
-    def _evict_idle(self) -> None:
+    async def _evict_idle(self) -> None:
         now = time.monotonic()
         to_remove = [
             uid for uid, idx in self.indexes.items() if now - idx.last_used > self.ttl
@@ -853,8 +1841,11 @@ class EntryIndexStore:
         if to_remove:
             logger.debug("Evicting %d idle indexes", len(to_remove))
         for uid in to_remove:
+            await self._persist_snapshot(uid, force=True)
+            self._forget_snapshot_state(uid)
             self.indexes.pop(uid, None)
             self.cursors.pop(uid, None)
+            self.related.forget(uid)
             lock = self.locks.pop(uid, None)
             if lock and lock.locked():
                 logger.debug("Lock for user %s remained locked during eviction", uid)
@@ -867,18 +1858,23 @@ class EntryIndexStore:
         if now < self._next_maintenance:
             return
         self._next_maintenance = now + self.maintenance_interval
-        self._evict_idle()
+        await self._evict_idle()
         await self.process_backfill_batches()
-        self._enforce_global_budget()
+        await self.persist_snapshots()
+        await self._enforce_global_budget()
 
     async def remove_entries(self, user_id: str, entry_ids: Iterable[str]) -> None:
         ids = [entry_id for entry_id in entry_ids if entry_id]
         if not ids:
             return
+        self.related.discard(user_id, ids)
         idx = self.indexes.get(user_id)
         if not idx:
+            # Nothing in memory to update, but results cached against the
+            # current revision may still list these entries.
+            self._index_changed(user_id)
             return
         lock = self._get_lock(user_id)
         async with lock:
             idx.remove_entries(ids)
-            self._invalidate_coverage(user_id)
+            self._index_changed(user_id)
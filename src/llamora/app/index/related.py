@@ -0,0 +1,152 @@
+"""Background maintenance of each entry's stored nearest neighbours."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Dict, Iterable
+
+from llamora.app.services.crypto import CryptoContext
+
+if TYPE_CHECKING:  # pragma: no cover - type checking only
+    from llamora.app.index.entry_ann import EntryIndex
+
+logger = logging.getLogger(__name__)
+
+
+class RelatedEntriesBuilder:
+    """Compute and store top-``k`` related entries from a loaded index.
+
+    Every entry in a user's index whose neighbour list is missing or stale is
+    queued, newest first. Each :meth:`process` call handles one batch: it
+    queries the index for the batch's neighbours, folds the batch entries into
+    the stored lists of the neighbours they found, and writes everything in a
+    single transaction. Nothing is embedded; entries the index has not loaded
+    yet are picked up once backfill adds them.
+    """
+
+    def __init__(
+        self, db, *, k: int = 6, batch_size: int = 64, enabled: bool = True
+    ) -> None:
+        self.db = db
+        self.k = max(int(k), 1)
+        self.batch_size = max(int(batch_size), 1)
+        self.enabled = bool(enabled)
+        self._pending: Dict[str, set[str]] = {}
+        # Entries known to have a current list; only these take reverse updates.
+        self._stored: Dict[str, set[str]] = {}
+        self._scanned_versions: Dict[str, int] = {}
+        # Repository purge generation each user's known state was built at.
+        self._generations: Dict[str, int] = {}
+
+    def _sync_generation(self, user_id: str) -> None:
+        # A purge (key rotation) drops every stored list behind our back.
+        generation = self.db.related.purge_generation(user_id)
+        if self._generations.get(user_id, generation) != generation:
+            self.forget(user_id)
+        self._generations[user_id] = generation
+
+    def has_work(self, user_id: str, idx: "EntryIndex") -> bool:
+        if not self.enabled:
+            return False
+        self._sync_generation(user_id)
+        return bool(self._pending.get(user_id)) or (
+            self._scanned_versions.get(user_id) != idx.version
+        )
+
+    def mark_stale(self, user_id: str, entry_ids: Iterable[str]) -> None:
+        """Queue ``entry_ids`` for recomputation, e.g. after re-indexing."""
+
+        if not self.enabled:
+            return
+        ids = set(entry_ids)
+        self._stored.get(user_id, set()).difference_update(ids)
+        self._pending.setdefault(user_id, set()).update(ids)
+
+    def discard(self, user_id: str, entry_ids: Iterable[str]) -> None:
+        ids = set(entry_ids)
+        self._stored.get(user_id, set()).difference_update(ids)
+        self._pending.get(user_id, set()).difference_update(ids)
+
+    def forget(self, user_id: str) -> None:
+        self._pending.pop(user_id, None)
+        self._stored.pop(user_id, None)
+        self._scanned_versions.pop(user_id, None)
+        self._generations.pop(user_id, None)
+
+    async def _scan(self, user_id: str, idx: "EntryIndex") -> None:
+        version = idx.version
+        stored = self._stored.setdefault(user_id, set())
+        pending = self._pending.setdefault(user_id, set())
+        unknown = [
+            entry_id
+            for entry_id in idx.entry_ids()
+            if entry_id not in stored and entry_id not in pending
+        ]
+        if unknown:
+            have = await self.db.related.get_entry_ids_with_neighbors(user_id, unknown)
+            stored.update(have)
+            pending.update(entry_id for entry_id in unknown if entry_id not in have)
+        self._scanned_versions[user_id] = version
+
+    async def process(self, ctx: CryptoContext, idx: "EntryIndex") -> int:
+        """Store neighbour lists for one batch of queued entries."""
+
+        user_id = ctx.user_id
+        self._sync_generation(user_id)
+        if self._scanned_versions.get(user_id) != idx.version:
+            await self._scan(user_id, idx)
+        pending = self._pending.get(user_id)
+        if not pending:
+            return 0
+
+        batch: list[str] = []
+        for entry_id in sorted(pending, reverse=True):
+            if not idx.contains_entry(entry_id):
+                # Removed or evicted; a later scan re-queues it if it returns.
+                pending.discard(entry_id)
+                continue
+            batch.append(entry_id)
+            if len(batch) >= self.batch_size:
+                break
+        if not batch:
+            return 0
+
+        stored = self._stored.setdefault(user_id, set())
+        in_batch = set(batch)
+        lists = [
+            (entry_id, idx.nearest_entries(entry_id, self.k)) for entry_id in batch
+        ]
+        incoming: dict[str, list[tuple[str, float]]] = {}
+        for entry_id, neighbors in lists:
+            for other, score in neighbors:
+                if other in stored and other not in in_batch:
+                    incoming.setdefault(other, []).append((entry_id, score))
+
+        updates: list[tuple[str, list[tuple[str, float]]]] = []
+        if incoming:
+            current = await self.db.related.get_neighbors(ctx, list(incoming))
+            for other, additions in incoming.items():
+                existing = current.get(other)
+                if existing is None:
+                    continue
+                merged = dict(existing)
+                for entry_id, score in additions:
+                    merged[entry_id] = max(score, merged.get(entry_id, score))
+                top = sorted(merged.items(), key=lambda item: item[1], reverse=True)
+                top = top[: self.k]
+                if top != existing:
+                    updates.append((other, top))
+
+        await self.db.related.store_neighbors(ctx, lists + updates)
+        pending.difference_update(in_batch)
+        stored.update(in_batch)
+        logger.debug(
+            "Stored related entries for %d entries of user %s (%d lists updated)",
+            len(batch),
+            user_id,
+            len(updates),
+        )
+        return len(batch)
+
+
+__all__ = ["RelatedEntriesBuilder"]
@@ -0,0 +1,119 @@
+"""Encrypted persistence for per-user entry index snapshots.
+
+Snapshots hold the serialized hnswlib graph plus the id bookkeeping of an
+``EntryIndex``. They are sealed with the user's DEK via the lockbox and are
+treated as a best-effort cache: any decode or decryption failure simply
+falls back to a rebuild from the vectors table.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import zipfile
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import orjson
+
+from llamora.app.services.crypto import CryptoContext
+from llamora.app.services.lockbox_provider import get_lockbox_store_for_db
+
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 2
+SNAPSHOT_NAMESPACE = "entry_index"
+SNAPSHOT_KEY = "snapshot"
+
+_META_KEY = "__meta__"
+
+
+@dataclass(slots=True)
+class EntryIndexSnapshot:
+    """Scalar metadata plus the NumPy arrays needed to restore an index."""
+
+    meta: dict[str, Any]
+    arrays: dict[str, np.ndarray]
+
+
+def _write_npz(buffer: io.BytesIO, arrays: dict[str, np.ndarray]) -> None:
+    # Same layout as ``np.savez``, without routing array names through its
+    # keyword arguments.
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for name, array in arrays.items():
+            with archive.open(f"{name}.npy", mode="w", force_zip64=True) as member:
+                np.lib.format.write_array(member, array, allow_pickle=False)
+
+
+def encode_snapshot(snapshot: EntryIndexSnapshot) -> bytes:
+    meta = dict(snapshot.meta)
+    meta["format_version"] = SNAPSHOT_FORMAT_VERSION
+    buffer = io.BytesIO()
+    arrays = {
+        name: np.ascontiguousarray(array) for name, array in snapshot.arrays.items()
+    }
+    arrays[_META_KEY] = np.frombuffer(orjson.dumps(meta), dtype=np.uint8)
+    _write_npz(buffer, arrays)
+    return buffer.getvalue()
+
+
+def decode_snapshot(data: bytes) -> EntryIndexSnapshot | None:
+    try:
+        with np.load(io.BytesIO(data), allow_pickle=False) as archive:
+            arrays = {name: archive[name] for name in archive.files}
+        meta_raw = arrays.pop(_META_KEY)
+        meta = orjson.loads(meta_raw.tobytes())
+    except Exception:
+        logger.debug("Discarding unreadable entry index snapshot", exc_info=True)
+        return None
+    if not isinstance(meta, dict):
+        return None
+    if meta.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        logger.debug(
+            "Ignoring entry index snapshot with format version %r",
+            meta.get("format_version"),
+        )
+        return None
+    return EntryIndexSnapshot(meta=meta, arrays=arrays)
+
+
+class EntryIndexSnapshotStore:
+    """Load and save sealed entry index snapshots in the lockbox."""
+
+    def __init__(self, db) -> None:
+        self.db = db
+
+    def _lockbox(self):
+        return get_lockbox_store_for_db(self.db).lockbox
+
+    async def load(self, ctx: CryptoContext) -> EntryIndexSnapshot | None:
+        try:
+            data = await self._lockbox().get(ctx, SNAPSHOT_NAMESPACE, SNAPSHOT_KEY)
+        except Exception:
+            logger.debug(
+                "Failed to read entry index snapshot for user %s",
+                ctx.user_id,
+                exc_info=True,
+            )
+            return None
+        if not data:
+            return None
+        return decode_snapshot(data)
+
+    async def save(self, ctx: CryptoContext, data: bytes) -> None:
+        ctx.require_write(operation="entry_index_snapshot.save")
+        await self._lockbox().set(ctx, SNAPSHOT_NAMESPACE, SNAPSHOT_KEY, data)
+
+    async def delete(self, user_id: str) -> None:
+        await self._lockbox().delete(user_id, SNAPSHOT_NAMESPACE, SNAPSHOT_KEY)
+
+
+__all__ = [
+    "EntryIndexSnapshot",
+    "EntryIndexSnapshotStore",
+    "SNAPSHOT_FORMAT_VERSION",
+    "decode_snapshot",
+    "encode_snapshot",
+]
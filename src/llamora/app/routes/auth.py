@@ -114,6 +114,13 @@ async def _issue_logged_out_response(
         else await make_response(body)
     )
     assert isinstance(resp, Response)
+    user = await manager.get_current_user()
+    if user:
+        db = get_services().db
+        db.search_history.forget(str(user["id"]))
+        db.entries.forget(str(user["id"]))
+        db.tags.forget(str(user["id"]))
+        get_services().search_api.forget(str(user["id"]))
     await manager.clear_session_dek()
     manager.clear_secure_cookie(resp)
     if hx_redirect:
@@ -207,6 +207,48 @@ async def entry_tags(entry_id: str):
     return html
 
 
+_RELATED_PREVIEW_CHARS = 160
+
+
+@entries_bp.get("/e/entry/<entry_id>/related")
+@login_required
+async def entry_related(entry_id: str):
+    _, user, ctx = await require_encryption_context()
+    db = get_services().db
+    await ensure_entry_exists(db, user["id"], entry_id)
+    neighbors = (await db.related.get_neighbors(ctx, [entry_id])).get(entry_id)
+    items: list[dict[str, Any]] = []
+    if neighbors:
+        rows = await db.entries.get_entries_by_ids(
+            ctx, [neighbor_id for neighbor_id, _ in neighbors]
+        )
+        by_id = {row["id"]: row for row in rows}
+        for neighbor_id, score in neighbors:
+            row = by_id.get(neighbor_id)
+            if row is None:
+                continue
+            text = " ".join(str(row.get("text") or "").split())
+            if len(text) > _RELATED_PREVIEW_CHARS:
+                text = text[:_RELATED_PREVIEW_CHARS].rstrip() + "…"
+            items.append(
+                {
+                    "id": neighbor_id,
+                    "created_at": row.get("created_at") or "",
+                    "created_date": row.get("created_date")
+                    or str(row.get("created_at") or "")[:10],
+                    "preview": text,
+                    "score": score,
+                }
+            )
+    html = await render_template(
+        "components/entries/entry_related.html",
+        entry_id=entry_id,
+        items=items,
+        pending=neighbors is None,
+    )
+    return html
+
+
 @entries_bp.route("/e/entry/<entry_id>", methods=["DELETE"])
 @login_required
 async def delete_entry(entry_id: str):
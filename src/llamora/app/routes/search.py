@@ -1,11 +1,23 @@
 import logging
 from dataclasses import dataclass
 from typing import Any
+from urllib.parse import urlencode
 
-from quart import Blueprint, Request, jsonify, render_template, request, abort
+from quart import (
+    Blueprint,
+    Request,
+    abort,
+    jsonify,
+    render_template,
+    request,
+    stream_with_context,
+    url_for,
+)
 from llamora.app.api.search import InvalidSearchQuery
 from llamora.app.services.container import get_search_api, get_services
+from llamora.app.services.entry_helpers import StreamSession, format_sse_event
 from llamora.app.services.auth_helpers import login_required
+from llamora.app.services.search_filters import SearchFilters, parse_search_filters
 from llamora.settings import settings
 from llamora.app.routes.helpers import require_encryption_context
 from llamora.app.util.tags import replace_emoji_shortcodes
@@ -37,12 +49,20 @@ class SearchViewModel:
     returned_session_id: str | None = None
     warming: bool = False
     index_coverage: dict[str, Any] | None = None
+    refining: bool = False
 
 
 def _empty_search_view_model() -> SearchViewModel:
     return SearchViewModel(results=[])
 
 
+def resolve_search_filters(req: Request) -> SearchFilters:
+    try:
+        return parse_search_filters(req.args)
+    except ValueError as exc:
+        abort(400, description=str(exc))
+
+
 def resolve_search_context(req: Request) -> SearchContext:
     sanitized_query = replace_emoji_shortcodes(req.args.get("q") or "").strip()
     max_query_length = int(settings.LIMITS.max_search_query_length)
@@ -69,6 +89,7 @@ async def _run_search(
     context: SearchContext,
     use_cursor: bool,
     cursor: str,
+    filters: SearchFilters | None = None,
 ) -> SearchViewModel:
     model = _empty_search_view_model()
     if not context.query:
@@ -85,6 +106,10 @@ async def _run_search(
             session_id=cursor or None,
             page_limit=page_limit,
             result_window=context.result_window,
+            filters=filters,
+            # The first page answers from memory; older vectors stream in
+            # afterwards over /search/stream.
+            backfill=None if use_cursor else False,
         )
         model.returned_session_id = stream_result.session_id
         if use_cursor and model.returned_session_id != cursor:
@@ -96,6 +121,7 @@ async def _run_search(
         model.total_known = stream_result.total_known
         model.warming = stream_result.warming
         model.index_coverage = stream_result.index_coverage
+        model.refining = stream_result.refining
         if stream_result.truncated:
             model.truncation_notice = (
                 "Your search was truncated to the first "
@@ -121,7 +147,11 @@ async def search():
     search_mode = (request.args.get("search_mode") or "").strip()
     cursor = (request.args.get("cursor") or "").strip()
     use_cursor = bool(cursor) and search_mode == "chunk"
-    vm = await _run_search(context=context, use_cursor=use_cursor, cursor=cursor)
+    filters = resolve_search_filters(request)
+    filter_query = urlencode(filters.as_query_params())
+    vm = await _run_search(
+        context=context, use_cursor=use_cursor, cursor=cursor, filters=filters
+    )
     if use_cursor and vm.returned_session_id and vm.returned_session_id != cursor:
         return ""
     page_results = vm.results
@@ -139,6 +169,7 @@ async def search():
             results=page_results,
             has_more=vm.has_more,
             session_id=vm.returned_session_id,
+            filter_query=filter_query,
         )
 
     return await render_template(
@@ -150,11 +181,79 @@ async def search():
         showing_count=vm.showing_count,
         has_more=vm.has_more,
         session_id=vm.returned_session_id,
+        filter_query=filter_query,
         warming=vm.warming,
         index_coverage=vm.index_coverage,
+        refine_url=_refine_url(context.query, vm, filters) if vm.refining else None,
     )
 
 
+def _refine_url(query: str, vm: SearchViewModel, filters: SearchFilters) -> str:
+    params = [("q", query), ("cursor", vm.returned_session_id or "")]
+    params.extend(filters.as_query_params())
+    return f"{url_for('search.search_stream')}?{urlencode(params)}"
+
+
+@search_bp.get("/search/stream")
+@login_required
+async def search_stream():
+    """Stream refined first pages while older entries are searched."""
+
+    context = resolve_search_context(request)
+    cursor = (request.args.get("cursor") or "").strip()
+    filters = resolve_search_filters(request)
+    if not context.query:
+        return StreamSession.raw(format_sse_event("done", {}))
+
+    _, _user, request_ctx = await require_encryption_context()
+    # The request context's key is dropped at teardown, before the body ends.
+    ctx = request_ctx.fork()
+    search_api = get_search_api()
+    filter_query = urlencode(filters.as_query_params())
+
+    @stream_with_context
+    async def _body():
+        session_id = cursor or None
+        try:
+            async for result in search_api.search_stream_rounds(
+                ctx,
+                context.query,
+                session_id=session_id,
+                page_limit=context.initial_page_size,
+                result_window=context.result_window,
+                filters=filters,
+            ):
+                session_id = result.session_id
+                html = await render_template(
+                    "components/search/search_results.html",
+                    results=result.results,
+                    has_query=True,
+                    truncation_notice=(
+                        "Your search was truncated to the first "
+                        f"{context.max_query_length} characters."
+                        if result.truncated
+                        else None
+                    ),
+                    total_known=result.total_known,
+                    showing_count=result.showing_count,
+                    has_more=result.has_more,
+                    session_id=result.session_id,
+                    filter_query=filter_query,
+                    warming=result.warming,
+                )
+                yield format_sse_event("message", html)
+        except InvalidSearchQuery:
+            logger.info("Discarding invalid streamed search query")
+        except Exception:
+            logger.exception("Progressive search stream failed")
+            yield format_sse_event("error", "Search refinement failed")
+        finally:
+            ctx.drop()
+        yield format_sse_event("done", {"session_id": session_id})
+
+    return StreamSession(_body())
+
+
 @search_bp.get("/search/recent")
 @login_required
 async def recent_searches():
@@ -163,7 +262,7 @@ async def recent_searches():
 
     limit = context.recent_limit
     history_repo = get_services().db.search_history
-    queries = await history_repo.get_recent_searches(ctx, limit)
+    queries = await history_repo.suggest_searches(ctx, context.query, limit)
 
     return jsonify(
         {
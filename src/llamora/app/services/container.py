@@ -16,6 +16,7 @@ from llamora.app.embed.model import async_embed_texts, _cached_model
 from llamora.persistence.local_db import LocalDB
 from llamora.app.db.ttl_store import TTLStore
 from llamora.app.db.login_failures import LoginFailuresRepository
+from llamora.app.db.utils import tag_name_cache
 from llamora.app.api.search import SearchAPI
 from llamora.app.services.lexical_reranker import LexicalReranker
 from llamora.app.services.llm_service import LLMService
@@ -159,6 +160,7 @@ class AppLifecycle:
                     ttl=int(settings.AUTH.login_lockout_ttl),
                 )
 
+                tag_name_cache.service_pulse = self._services.service_pulse
                 events = self._services.db._events
                 if events is not None:
                     self._invalidation_coordinator = InvalidationCoordinator(
@@ -166,6 +168,9 @@ class AppLifecycle:
                         lockbox_store=get_lockbox_store(self._services.db),
                         service_pulse=self._services.service_pulse,
                         tag_service=self._services.tag_service,
+                        entry_records=self._services.db.entries.record_cache,
+                        tag_names=tag_name_cache,
+                        search_results=self._services.search_api.result_cache,
                     )
                     self._invalidation_coordinator.subscribe()
                 await self._services.search_api.start()
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from logging import getLogger
+from typing import Iterable
 
 from nacl import pwhash, utils
 import hashlib
@@ -16,6 +17,9 @@ ALG = b"xchacha20poly1305_ietf"
 OPSLIMIT = pwhash.argon2id.OPSLIMIT_MODERATE
 MEMLIMIT = pwhash.argon2id.MEMLIMIT_MODERATE
 ENTRY_DIGEST_CONTEXT = b"llamora:entry-digest:v2"
+LEXICAL_INDEX_CONTEXT = b"llamora:lexical-index:v1"
+# Truncated HMAC length for blind-index token hashes.
+TOKEN_DIGEST_SIZE = 16
 
 CURRENT_SUITE = "xchacha20poly1305_ietf/argon2id_moderate/hmac_sha256_v2"
 
@@ -132,6 +136,22 @@ class CryptoContext:
         payload = f"{entry_id}\0{role}\0{text}".encode("utf-8")
         return hmac.new(key, payload, hashlib.sha256).hexdigest()
 
+    def chunk_digest(self, text: str) -> str:
+        """Return a keyed digest identifying an embedded chunk by content."""
+
+        key = derive_entry_digest_key(self._require_key())
+        payload = f"chunk\0{text}".encode("utf-8")
+        return hmac.new(key, payload, hashlib.sha256).hexdigest()
+
+    def token_digests(self, tokens: Iterable[str]) -> list[bytes]:
+        """Return blind-index hashes for lexical search tokens."""
+
+        key = derive_lexical_index_key(self._require_key())
+        return [
+            hmac.digest(key, token.encode("utf-8"), "sha256")[:TOKEN_DIGEST_SIZE]
+            for token in tokens
+        ]
+
     def encrypt_vector(self, entry_id: str, vector_id: str, vec: bytes):
         epoch = _require_epoch(self.epoch, operation="encrypt_vector")
         nonce = utils.random(24)
@@ -240,6 +260,10 @@ def derive_entry_digest_key(dek: bytes) -> bytes:
     return hmac.new(ENTRY_DIGEST_CONTEXT, dek, hashlib.sha256).digest()
 
 
+def derive_lexical_index_key(dek: bytes) -> bytes:
+    return hmac.new(LEXICAL_INDEX_CONTEXT, dek, hashlib.sha256).digest()
+
+
 def entry_digest(dek: bytes, entry_id: str, role: str, text: str) -> str:
     key = derive_entry_digest_key(dek)
     payload = f"{entry_id}\0{role}\0{text}".encode("utf-8")
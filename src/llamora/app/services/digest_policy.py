@@ -9,13 +9,14 @@ from __future__ import annotations
 import hashlib
 from typing import Iterable
 
-DIGEST_POLICY_VERSION = 1
+DIGEST_POLICY_VERSION = 2
 """Version for aggregate digest policy and derived cache inputs."""
 
 ENTRY_DIGEST_VERSION = 2
 """Version stored with per-entry digests in the database."""
 
 _EMPTY_DIGEST_LIST_TAG = "empty"
+_MULTISET_MODULUS = 1 << 256
 
 
 def digest_policy_tag() -> str:
@@ -34,22 +35,51 @@ def _normalized_digests(entry_digests: Iterable[str]) -> list[str]:
     return cleaned
 
 
+def _multiset_element(digest: str) -> int:
+    return int.from_bytes(hashlib.sha256(digest.encode("utf-8")).digest(), "big")
+
+
+def digest_multiset_update(
+    state: str | None,
+    *,
+    added: Iterable[str] = (),
+    removed: Iterable[str] = (),
+) -> str:
+    """Return the multiset state ``state`` with digests added and removed.
+
+    The state is the sum of the SHA256 of every member digest modulo
+    ``2**256``, as 64 hex characters; ``None`` is the empty multiset. Sums do
+    not depend on order, so a stored state can be updated one entry at a
+    time instead of being rebuilt from every digest.
+    """
+
+    total = int(state, 16) if state else 0
+    for digest in _normalized_digests(added):
+        total += _multiset_element(digest)
+    for digest in _normalized_digests(removed):
+        total -= _multiset_element(digest)
+    return f"{total % _MULTISET_MODULUS:064x}"
+
+
+def multiset_digest_aggregate(state: str | None) -> str:
+    """Return the policy-tagged aggregate digest for a multiset ``state``."""
+
+    policy_tag = digest_policy_tag()
+    if not state or int(state, 16) == 0:
+        return f"{policy_tag}:{_EMPTY_DIGEST_LIST_TAG}"
+    return f"{policy_tag}:{state}"
+
+
 def entry_digest_aggregate(entry_digests: Iterable[str]) -> str:
     """Build a policy-tagged aggregate digest for entry digest lists.
 
     Rules:
     - Empty digest lists produce a tagged sentinel value.
-    - Non-empty digest lists are sorted, joined with ``|``, hashed with SHA256,
-      then tagged with the active digest-policy version.
+    - Non-empty digest lists are combined with :func:`digest_multiset_update`
+      and tagged with the active digest-policy version.
     """
 
-    normalized = _normalized_digests(entry_digests)
-    policy_tag = digest_policy_tag()
-    if not normalized:
-        return f"{policy_tag}:{_EMPTY_DIGEST_LIST_TAG}"
-    payload = "|".join(normalized).encode("utf-8")
-    digest = hashlib.sha256(payload).hexdigest()
-    return f"{policy_tag}:{digest}"
+    return multiset_digest_aggregate(digest_multiset_update(None, added=entry_digests))
 
 
 def day_digest(entry_digests: Iterable[str]) -> str:
@@ -89,6 +119,8 @@ __all__ = [
     "DIGEST_POLICY_VERSION",
     "ENTRY_DIGEST_VERSION",
     "digest_policy_tag",
+    "digest_multiset_update",
+    "multiset_digest_aggregate",
     "entry_digest_aggregate",
     "day_digest",
     "tag_digest",
@@ -0,0 +1,90 @@
+"""In-memory cache of decrypted entry records."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+# Rough per-record bookkeeping cost on top of the text itself.
+_RECORD_OVERHEAD_BYTES = 256
+
+
+class EntryRecordCache:
+    """Byte-bounded LRU of decrypted entry records shared across requests.
+
+    Records are keyed by ``(user_id, entry_id)`` and tagged with the nonce of
+    the ciphertext they were decrypted from, so a lookup with any other nonce
+    misses and an edited entry can never be served stale. Records idle for
+    ``ttl`` seconds are dropped on access; a user's records are dropped
+    explicitly on logout through :meth:`forget`.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float) -> None:
+        self._max_bytes = max(int(max_bytes), 0)
+        self._ttl = float(ttl)
+        self._records: OrderedDict[tuple[str, str], tuple[bytes, dict, int, float]] = (
+            OrderedDict()
+        )
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, user_id: str, entry_id: str, revision: bytes) -> dict | None:
+        key = (user_id, entry_id)
+        item = self._records.get(key)
+        now = time.monotonic()
+        if item is None or item[0] != revision or now - item[3] > self._ttl:
+            if item is not None:
+                self._pop(key)
+            self.misses += 1
+            return None
+        _, record, size, _ = item
+        self._records[key] = (revision, record, size, now)
+        self._records.move_to_end(key)
+        self.hits += 1
+        # Callers get their own meta so edits to it never leak into the cache.
+        return {**record, "meta": dict(record.get("meta") or {})}
+
+    def put(self, user_id: str, entry_id: str, revision: bytes, record: dict) -> None:
+        if self._max_bytes <= 0:
+            return
+        size = (
+            len(entry_id)
+            + len(str(record.get("text") or ""))
+            + len(str(record.get("meta") or ""))
+            + _RECORD_OVERHEAD_BYTES
+        )
+        if size > self._max_bytes:
+            return
+        key = (user_id, entry_id)
+        self._pop(key)
+        self._records[key] = (
+            revision,
+            {**record, "meta": dict(record.get("meta") or {})},
+            size,
+            time.monotonic(),
+        )
+        self.nbytes += size
+        while self.nbytes > self._max_bytes and self._records:
+            _, (_, _, evicted, _) = self._records.popitem(last=False)
+            self.nbytes -= evicted
+
+    def invalidate(self, user_id: str, entry_ids: Iterable[str]) -> None:
+        for entry_id in entry_ids:
+            self._pop((user_id, entry_id))
+
+    def forget(self, user_id: str) -> None:
+        for key in [key for key in self._records if key[0] == user_id]:
+            self._pop(key)
+
+    def _pop(self, key: tuple[str, str]) -> None:
+        item = self._records.pop(key, None)
+        if item is not None:
+            self.nbytes -= item[2]
+
+
+__all__ = ["EntryRecordCache"]
@@ -30,6 +30,7 @@ from llamora.app.db.events import (
     TAG_UNLINKED_EVENT,
     RepositoryEventBus,
 )
+from llamora.app.db.utils import TagNameCache
 from llamora.app.services.cache_registry import (
     CacheInvalidation,
     MUTATION_ENTRY_CHANGED,
@@ -38,7 +39,9 @@ from llamora.app.services.cache_registry import (
     MutationLineagePlan,
     build_mutation_lineage_plan,
 )
+from llamora.app.services.entry_record_cache import EntryRecordCache
 from llamora.app.services.lockbox_store import LockboxStore
+from llamora.app.services.search_pipeline import SearchResultCache
 from llamora.app.services.service_pulse import ServicePulse
 from llamora.app.services.tag_service import TagService
 
@@ -53,14 +56,20 @@ class InvalidationCoordinator:
     lockbox_store: LockboxStore
     service_pulse: ServicePulse | None = None
     tag_service: TagService | None = None
+    entry_records: EntryRecordCache | None = None
+    tag_names: TagNameCache | None = None
+    search_results: SearchResultCache | None = None
 
     def subscribe(self) -> None:
         """Wire supported repository events to coordinator handlers.
 
         Mapping:
         - ``entry.inserted``, ``entry.updated``, ``entry.deleted`` -> entry lineage
-        - ``tag.linked``, ``tag.unlinked`` -> tag-link lineage
-        - ``tag.deleted`` -> tag-deleted lineage
+          and the entry's decrypted record cache
+        - ``tag.linked``, ``tag.unlinked`` -> tag-link lineage and cached search
+          candidates
+        - ``tag.deleted`` -> tag-deleted lineage, the tag's cached name and
+          cached search candidates
         """
 
         subscriptions = (
@@ -85,6 +94,8 @@ class InvalidationCoordinator:
         tag_hashes: tuple[str, ...] | list[str] | None = None,
         **_: object,
     ) -> None:
+        if self.entry_records is not None:
+            self.entry_records.invalidate(user_id, (entry_id,))
         await self._apply_lineage(
             user_id=user_id,
             plan=build_mutation_lineage_plan(
@@ -106,6 +117,8 @@ class InvalidationCoordinator:
     ) -> None:
         if self.tag_service is not None:
             self.tag_service.invalidate_tag_index(user_id)
+        if self.search_results is not None:
+            self.search_results.bump(user_id)
         await self._apply_lineage(
             user_id=user_id,
             plan=build_mutation_lineage_plan(
@@ -128,6 +141,10 @@ class InvalidationCoordinator:
     ) -> None:
         if self.tag_service is not None:
             self.tag_service.invalidate_tag_index(user_id)
+        if self.search_results is not None:
+            self.search_results.bump(user_id)
+        if self.tag_names is not None:
+            self.tag_names.invalidate(user_id, bytes.fromhex(tag_hash))
         dates: set[str] = {
             created_date for _, created_date in affected_entries if created_date
         }
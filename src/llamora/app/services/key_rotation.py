@@ -223,6 +223,16 @@ async def reencrypt_entries(
                     """,
                     updates,
                 )
+                # Entry digests are keyed by the DEK; day and tag digests
+                # are rebuilt on read.
+                await conn.execute(
+                    "UPDATE day_stats SET digest = NULL WHERE user_id = ?",
+                    (user_id,),
+                )
+                await conn.execute(
+                    "UPDATE tags SET digest_state = NULL WHERE user_id = ?",
+                    (user_id,),
+                )
 
             await db.entries._run_in_transaction(conn, _batch_update)
             total += len(updates)
@@ -294,11 +304,13 @@ async def reencrypt_vectors(
                 old_ctx.drop()
                 new_ctx.drop()
 
+            # Chunk digests are keyed by the old DEK and would never match
+            # again, so the embedding cache starts over for rotated rows.
             async def _batch_update():
                 await conn.executemany(
                     """
                     UPDATE vectors
-                    SET nonce = ?, ciphertext = ?, alg = ?
+                    SET nonce = ?, ciphertext = ?, alg = ?, chunk_digest = NULL
                     WHERE id = ? AND user_id = ?
                     """,
                     updates,
@@ -385,6 +397,7 @@ async def reencrypt_tags(
             await db.tags._run_in_transaction(conn, _batch_update)
             total += len(updates)
 
+    db.tags.forget(user_id)
     logger.info("Re-encrypted %d tags for user %s", total, user_id)
     return total
 
@@ -488,6 +501,27 @@ async def purge_lockbox(db: LocalDB, user_id: str) -> None:
     logger.info("Purged lockbox data for user %s", user_id)
 
 
+async def purge_lexical_index(db: LocalDB, user_id: str) -> None:
+    """Drop the blind lexical index; its token hashes are keyed by the DEK.
+
+    The search service rebuilds it in the background from the re-encrypted
+    entries.
+    """
+
+    await db.lexical.purge_user(user_id)
+    logger.info("Purged lexical index for user %s", user_id)
+
+
+async def purge_related(db: LocalDB, user_id: str) -> None:
+    """Drop stored related-entry lists; they are encrypted under the old DEK.
+
+    The index service recomputes them in the background.
+    """
+
+    await db.related.purge_user(user_id)
+    logger.info("Purged related entries for user %s", user_id)
+
+
 async def full_reencryption(
     db: LocalDB,
     user_id: str,
@@ -497,8 +531,8 @@ async def full_reencryption(
     """Re-encrypt all user data to *target_epoch*.  Idempotent and safe to resume.
 
     Walks the DEK chain to find the old DEK, then re-encrypts entries,
-    vectors, tags, and search history in batches.  Purges lockbox data and
-    marks old epochs as retired.
+    vectors, tags, and search history in batches.  Purges lockbox data, the
+    lexical index and related-entry lists, and marks old epochs as retired.
     """
 
     current_epoch = await db.users.get_current_epoch(user_id)
@@ -528,6 +562,10 @@ async def full_reencryption(
     await reencrypt_tags(db, user_id, old_dek, current_dek, current_epoch)
     await reencrypt_search_history(db, user_id, old_dek, current_dek, current_epoch)
     await purge_lockbox(db, user_id)
+    await purge_lexical_index(db, user_id)
+    await purge_related(db, user_id)
+    if db.search_api is not None:
+        db.search_api.forget(user_id)
 
     # Mark all epochs before the current one as retired
     for ep in range(1, current_epoch):
@@ -0,0 +1,236 @@
+"""BM25 retrieval over a per-user blind inverted index.
+
+Entry text is tokenized like :class:`LexicalReranker` does, and every token is
+replaced by a keyed HMAC (see :meth:`CryptoContext.token_digests`) before it
+is written, so the SQLite postings never contain plaintext words. Queries hash
+their tokens the same way and score the matching postings with BM25.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import Counter
+from typing import Iterable, Sequence
+
+from llamora.app.db.lexical import LexicalDocument
+from llamora.app.services.crypto import CryptoContext
+from llamora.app.services.lexical_reranker import TOKEN_PATTERN
+from llamora.app.services.search_config import SearchConfig
+from llamora.app.services.search_filters import SearchFilters
+from llamora.app.util.tags import tag_hash
+
+logger = logging.getLogger(__name__)
+
+_MIN_TOKEN_CHARS = 2
+_MAX_TOKEN_CHARS = 64
+# How long a user with a complete index goes before coverage is checked again.
+_COVERAGE_RECHECK_S = 300.0
+
+
+def tokenize(text: str) -> Counter[str]:
+    """Return term frequencies for the indexable tokens in ``text``."""
+
+    return Counter(
+        token
+        for token in TOKEN_PATTERN.findall((text or "").lower())
+        if _MIN_TOKEN_CHARS <= len(token) <= _MAX_TOKEN_CHARS
+    )
+
+
+def _build_document(ctx: CryptoContext, entry_id: str, text: str) -> LexicalDocument:
+    counts = tokenize(text)
+    terms = list(counts)
+    hashes = ctx.token_digests(terms)
+    return entry_id, sum(counts.values()), list(zip(hashes, counts.values()))
+
+
+class LexicalIndexService:
+    """Maintain and query the blind lexical index for entry search."""
+
+    def __init__(self, db, config: SearchConfig) -> None:
+        self.db = db
+        self._config = config.lexical
+        # Users whose index is missing entries, with a context to backfill them.
+        self._pending: dict[str, CryptoContext] = {}
+        self._checked_at: dict[str, float] = {}
+        self._revisions: dict[str, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._config.enabled
+
+    def revision(self, user_id: str) -> int:
+        """Return a counter bumped whenever the user's postings change."""
+
+        return self._revisions.get(user_id, 0)
+
+    async def bulk_index(
+        self, entries: Iterable[tuple[CryptoContext, str, str]]
+    ) -> None:
+        """Replace the postings of each ``(ctx, entry_id, text)`` item."""
+
+        if not self.enabled:
+            return
+        per_user: dict[str, list[tuple[CryptoContext, str, str]]] = {}
+        for item in entries:
+            per_user.setdefault(item[0].user_id, []).append(item)
+
+        for user_id, items in per_user.items():
+            try:
+                documents = await asyncio.to_thread(
+                    lambda batch=items: [
+                        _build_document(ctx, entry_id, text)
+                        for ctx, entry_id, text in batch
+                    ]
+                )
+                await self.db.lexical.replace_documents(user_id, documents)
+            except Exception:
+                logger.exception(
+                    "Failed to update lexical index for %d entries of user %s",
+                    len(items),
+                    user_id,
+                )
+            finally:
+                self._revisions[user_id] = self._revisions.get(user_id, 0) + 1
+
+    async def search(
+        self,
+        ctx: CryptoContext,
+        query: str,
+        limit: int | None = None,
+        *,
+        filters: SearchFilters | None = None,
+    ) -> list[tuple[str, float]]:
+        """Return ``(entry_id, bm25)`` pairs for ``query``, best first."""
+
+        if not self.enabled:
+            return []
+        limit = self._config.limit if limit is None else int(limit)
+        terms = list(tokenize(query))
+        if limit <= 0 or not terms:
+            return []
+        user_id = ctx.user_id
+        await self._check_coverage(ctx)
+
+        doc_count, total_length = await self.db.lexical.get_corpus_stats(user_id)
+        if doc_count <= 0:
+            return []
+        hashes = ctx.token_digests(terms)
+        dfs = await self.db.lexical.get_document_frequencies(user_id, hashes)
+        if not dfs:
+            return []
+        # Very common terms cost the most postings and contribute the least.
+        max_df = max(self._config.max_df_ratio * doc_count, 1.0)
+        selected = [h for h, df in dfs.items() if df <= max_df] or [
+            min(dfs, key=dfs.__getitem__)
+        ]
+
+        if filters is not None and filters.is_empty:
+            filters = None
+        allowed: set[str] | None = None
+        if filters is not None and filters.tags:
+            allowed = await self.db.tags.get_entry_ids_for_tags(
+                user_id, [tag_hash(user_id, tag) for tag in filters.tags]
+            )
+            if not allowed:
+                return []
+        postings = await self.db.lexical.get_postings(
+            user_id,
+            selected,
+            date_from=filters.date_from if filters else None,
+            date_to=filters.date_to if filters else None,
+            roles=filters.roles if filters else (),
+        )
+
+        k1 = self._config.bm25_k1
+        b = self._config.bm25_b
+        avgdl = max(total_length / doc_count, 1.0)
+        idf = {
+            h: math.log(1.0 + (doc_count - df + 0.5) / (df + 0.5))
+            for h, df in dfs.items()
+        }
+        scores: dict[str, float] = {}
+        for token_hash, entry_id, tf, length in postings:
+            if allowed is not None and entry_id not in allowed:
+                continue
+            norm = k1 * (1.0 - b + b * length / avgdl)
+            scores[entry_id] = scores.get(entry_id, 0.0) + idf[token_hash] * (
+                tf * (k1 + 1.0) / (tf + norm)
+            )
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        logger.debug(
+            "Lexical search for user %s matched %d entries from %d postings",
+            user_id,
+            len(ranked),
+            len(postings),
+        )
+        return ranked[:limit]
+
+    async def _check_coverage(self, ctx: CryptoContext) -> None:
+        user_id = ctx.user_id
+        if user_id in self._pending:
+            return
+        now = time.monotonic()
+        if now - self._checked_at.get(user_id, -_COVERAGE_RECHECK_S) < (
+            _COVERAGE_RECHECK_S
+        ):
+            return
+        self._checked_at[user_id] = now
+        missing = await self.db.lexical.get_unindexed_entry_ids(user_id, 1)
+        if missing:
+            logger.debug("Scheduling lexical index backfill for user %s", user_id)
+            self._pending[user_id] = ctx.fork()
+
+    def _finish_backfill(self, user_id: str) -> None:
+        ctx = self._pending.pop(user_id, None)
+        if ctx is not None:
+            ctx.drop()
+        self._checked_at[user_id] = time.monotonic()
+
+    async def maintenance(self) -> int:
+        """Index one batch of missing entries per pending user."""
+
+        if not self.enabled or not self._pending:
+            return 0
+        batch_size = self._config.backfill_batch_size
+        indexed = 0
+        for user_id, ctx in list(self._pending.items()):
+            try:
+                ids = await self.db.lexical.get_unindexed_entry_ids(user_id, batch_size)
+                rows = await self.db.entries.get_entries_by_ids(ctx, ids) if ids else []
+                await self.bulk_index(
+                    (ctx, row["id"], row.get("text", "")) for row in rows
+                )
+            except Exception:
+                logger.exception("Lexical index backfill failed for user %s", user_id)
+                self._finish_backfill(user_id)
+                continue
+            indexed += len(rows)
+            if len(ids) < batch_size or not rows:
+                self._finish_backfill(user_id)
+            await asyncio.sleep(0)
+        if indexed:
+            logger.info("Lexical index backfill added %d entries", indexed)
+        return indexed
+
+    def close(self) -> None:
+        for user_id in list(self._pending):
+            self._finish_backfill(user_id)
+
+
+def normalize_scores(hits: Sequence[tuple[str, float]]) -> dict[str, float]:
+    """Scale BM25 scores into ``(0, 1]`` relative to the best hit."""
+
+    if not hits:
+        return {}
+    top = max(score for _, score in hits)
+    if top <= 0:
+        return {entry_id: 0.0 for entry_id, _ in hits}
+    return {entry_id: score / top for entry_id, score in hits}
+
+
+__all__ = ["LexicalIndexService", "normalize_scores", "tokenize"]
@@ -1,5 +1,6 @@
 import logging
 import re
+from collections import OrderedDict
 from typing import List
 
 import ahocorasick
@@ -12,8 +13,90 @@ TOKEN_PATTERN = re.compile(r"\w+")
 logger = logging.getLogger(__name__)
 
 
+# Compiled matchers kept per reranker; one per recent distinct query.
+_MATCHER_CACHE_SIZE = 64
+
+
+class QueryMatcher:
+    """Aho-Corasick matcher for one query, reusable across candidates."""
+
+    __slots__ = ("query", "tokens", "_automaton")
+
+    def __init__(self, query: str) -> None:
+        self.query = query.lower()
+        self.tokens = [
+            t for t in dict.fromkeys(TOKEN_PATTERN.findall(self.query)) if len(t) >= 2
+        ]
+        automaton = ahocorasick.Automaton()
+        automaton.add_word(self.query, ("E", self.query))
+        for tok in self.tokens:
+            automaton.add_word(tok, ("T", tok))
+        automaton.make_automaton()
+        self._automaton = automaton
+
+    def score(self, text_lower: str) -> tuple[bool, float]:
+        """Return ``(exact, token overlap)`` for lowercased ``text_lower``."""
+
+        matched: set[str] = set()
+        exact = False
+        token_count = len(self.tokens)
+        for _, (kind, word) in self._automaton.iter(text_lower):
+            if kind == "T":
+                matched.add(word)
+            else:
+                exact = True
+            if exact and len(matched) == token_count:
+                break
+        overlap = len(matched) / token_count if token_count else 0.0
+        return exact, overlap
+
+    def spans(self, text_lower: str) -> List[dict]:
+        """Return merged, sorted hit spans for snippet highlighting."""
+
+        spans = []
+        for end, (kind, word) in self._automaton.iter(text_lower):
+            start = end - len(word) + 1
+            spans.append({"start": start, "end": end + 1, "kind": kind})
+
+        spans.sort(key=lambda s: s["start"])
+        merged: List[dict] = []
+        for s in spans:
+            if not merged or s["start"] > merged[-1]["end"]:
+                merged.append(s.copy())
+            else:
+                m = merged[-1]
+                m["end"] = max(m["end"], s["end"])
+                if s["kind"] == "E" or m["kind"] == "E":
+                    m["kind"] = "E"
+        for m in merged:
+            if text_lower[m["start"] : m["end"]] == self.query:
+                m["kind"] = "E"
+        return merged
+
+
 class LexicalReranker:
-    """Builds snippets and reranks vector candidates using lexical cues."""
+    """Reranks vector candidates using lexical cues and builds snippets.
+
+    Candidates are ordered by a cheap pass over the compiled query matcher;
+    highlight spans and snippets are only built for the results returned.
+    """
+
+    def __init__(self) -> None:
+        self._matchers: OrderedDict[str, QueryMatcher] = OrderedDict()
+
+    def compile(self, query: str) -> QueryMatcher:
+        """Return the matcher for ``query``, reusing a recent compilation."""
+
+        key = query.lower()
+        matcher = self._matchers.get(key)
+        if matcher is not None:
+            self._matchers.move_to_end(key)
+            return matcher
+        matcher = QueryMatcher(key)
+        self._matchers[key] = matcher
+        if len(self._matchers) > _MATCHER_CACHE_SIZE:
+            self._matchers.popitem(last=False)
+        return matcher
 
     def rerank(
         self,
@@ -25,84 +108,54 @@ class LexicalReranker:
         if not candidates:
             logger.debug("Lexical reranker received no candidates for query %r", query)
             return []
-        lower_query = query.lower()
-        automaton = ahocorasick.Automaton()
-        automaton.add_word(lower_query, ("E", lower_query))
-        tokens = [
-            t for t in dict.fromkeys(TOKEN_PATTERN.findall(lower_query)) if len(t) >= 2
-        ]
-        for tok in tokens:
-            automaton.add_word(tok, ("T", tok))
-        automaton.make_automaton()
-        token_count = len(tokens)
+        matcher = self.compile(query)
+        poor_max_cos = float(settings.SEARCH.progressive.poor_match_max_cos)
 
-        results: List[dict] = []
+        scored: List[tuple[tuple, dict, str, str, bool]] = []
         for cand in candidates:
-            content = cand["content"]
-            text_lower = content.lower()
-            spans = []
-            matched_tokens = set()
-            exact = False
-            for end, (kind, word) in automaton.iter(text_lower):
-                start = end - len(word) + 1
-                spans.append({"start": start, "end": end + 1, "kind": kind})
-                if kind == "T":
-                    matched_tokens.add(word)
-                else:
-                    exact = True
-
-            spans.sort(key=lambda s: s["start"])
-            merged: List[dict] = []
-            for s in spans:
-                if not merged or s["start"] > merged[-1]["end"]:
-                    merged.append(s.copy())
-                else:
-                    m = merged[-1]
-                    m["end"] = max(m["end"], s["end"])
-                    if s["kind"] == "E" or m["kind"] == "E":
-                        m["kind"] = "E"
-            for m in merged:
-                if text_lower[m["start"] : m["end"]] == lower_query:
-                    m["kind"] = "E"
-
-            overlap = len(matched_tokens) / token_count if token_count else 0.0
+            text_lower = cand["content"].lower()
+            exact, overlap = matcher.score(text_lower)
             boost = tag_boosts.get(cand["id"], 0.0) if tag_boosts else 0.0
-
-            snippet = self._build_snippet(content, merged)
-
             cosine = cand["cosine"]
-            poor = cosine < float(settings.SEARCH.progressive.poor_match_max_cos)
+            # Entries matched by the lexical index are never poor matches.
+            poor = "bm25" not in cand and cosine < poor_max_cos
             status = (
                 "exact"
                 if exact
                 else ("token" if overlap > 0 else ("tag" if boost > 0 else "semantic"))
             )
-            css_class = f"search-result-item status-{status}"
-            if poor:
-                css_class += " status-poor"
             sort_key = (
                 2 if exact else (1 if overlap > 0 else 0),
                 overlap + boost,
                 cosine,
             )
+            scored.append((sort_key, cand, text_lower, status, poor))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        results: List[dict] = []
+        for _, cand, text_lower, status, poor in scored[: max(limit, 0)]:
+            css_class = f"search-result-item status-{status}"
+            if poor:
+                css_class += " status-poor"
             results.append(
                 {
                     "id": cand["id"],
                     "created_at": cand["created_at"],
                     "created_date": cand.get("created_date"),
                     "role": cand["role"],
-                    "snippet": snippet,
+                    "snippet": self._build_snippet(
+                        cand["content"], matcher.spans(text_lower)
+                    ),
                     "status": status,
                     "css_class": css_class,
-                    "_sort": sort_key,
                 }
             )
-
-        results.sort(key=lambda r: r["_sort"], reverse=True)
-        for r in results:
-            r.pop("_sort", None)
-        logger.debug("Lexical reranker returning %d results", len(results[:limit]))
-        return results[:limit]
+        logger.debug(
+            "Lexical reranker scored %d candidates, returning %d",
+            len(scored),
+            len(results),
+        )
+        return results
 
     def _build_snippet(self, content: str, spans: List[dict]) -> dict:
         max_len = 500
@@ -38,6 +38,52 @@ class SearchLimits:
         return asdict(self)
 
 
+@dataclass(slots=True, frozen=True)
+class LexicalSearchConfig:
+    """Configuration for BM25 candidates from the blind lexical index."""
+
+    enabled: bool = True
+    limit: int = 50
+    bm25_k1: float = 1.2
+    bm25_b: float = 0.75
+    max_df_ratio: float = 0.5
+    backfill_batch_size: int = 100
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the configuration as a plain dictionary."""
+
+        return asdict(self)
+
+
+FUSION_RETRIEVERS = ("vector", "lexical", "tags")
+
+
+@dataclass(slots=True, frozen=True)
+class FusionSearchConfig:
+    """Configuration for reciprocal rank fusion of candidate retrievers."""
+
+    rrf_k: int = 60
+    retrievers: tuple[str, ...] = FUSION_RETRIEVERS
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the configuration as a plain dictionary."""
+
+        return {"rrf_k": self.rrf_k, "retrievers": list(self.retrievers)}
+
+
+@dataclass(slots=True, frozen=True)
+class QueryCacheConfig:
+    """Bounds for the per-user cache of query vectors and candidates."""
+
+    max_entries_per_user: int = 32
+    max_users: int = 64
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the configuration as a plain dictionary."""
+
+        return asdict(self)
+
+
 @dataclass(slots=True, frozen=True)
 class SearchConfig:
     """Aggregate search configuration used across services."""
@@ -48,6 +94,10 @@ class SearchConfig:
     stream_global_memory_budget_bytes: int
     progressive_inline_backfill: bool
     include_index_coverage_hints: bool
+    rerank_window: int = 20
+    lexical: LexicalSearchConfig = LexicalSearchConfig()
+    fusion: FusionSearchConfig = FusionSearchConfig()
+    query_cache: QueryCacheConfig = QueryCacheConfig()
 
     @classmethod
     def from_settings(cls, settings: Any) -> "SearchConfig":
@@ -73,6 +123,37 @@ class SearchConfig:
             poor_match_max_cos=float(progressive_settings.poor_match_max_cos),
             poor_match_min_hits=int(progressive_settings.poor_match_min_hits),
         )
+        lexical_settings = getattr(search_settings, "lexical", None) or {}
+        lexical = LexicalSearchConfig(
+            enabled=bool(lexical_settings.get("enabled", True)),
+            limit=max(int(lexical_settings.get("limit", 50)), 0),
+            bm25_k1=float(lexical_settings.get("bm25_k1", 1.2)),
+            bm25_b=min(max(float(lexical_settings.get("bm25_b", 0.75)), 0.0), 1.0),
+            max_df_ratio=float(lexical_settings.get("max_df_ratio", 0.5)),
+            backfill_batch_size=max(
+                int(lexical_settings.get("backfill_batch_size", 100)), 1
+            ),
+        )
+        fusion_settings = getattr(search_settings, "fusion", None) or {}
+        retrievers = tuple(
+            name
+            for name in dict.fromkeys(
+                str(value).strip().lower()
+                for value in fusion_settings.get("retrievers", FUSION_RETRIEVERS)
+            )
+            if name in FUSION_RETRIEVERS
+        )
+        fusion = FusionSearchConfig(
+            rrf_k=max(int(fusion_settings.get("rrf_k", 60)), 1),
+            retrievers=retrievers or FUSION_RETRIEVERS,
+        )
+        cache_settings = getattr(search_settings, "query_cache", None) or {}
+        query_cache = QueryCacheConfig(
+            max_entries_per_user=max(
+                int(cache_settings.get("max_entries_per_user", 32)), 0
+            ),
+            max_users=max(int(cache_settings.get("max_users", 64)), 1),
+        )
         return cls(
             progressive=progressive,
             limits=limits,
@@ -88,6 +169,10 @@ class SearchConfig:
             include_index_coverage_hints=bool(
                 getattr(search_settings, "include_index_coverage_hints", False)
             ),
+            rerank_window=max(int(getattr(search_settings, "rerank_window", 20)), 0),
+            lexical=lexical,
+            fusion=fusion,
+            query_cache=query_cache,
         )
 
     def as_dict(self) -> dict[str, Any]:
@@ -100,11 +185,19 @@ class SearchConfig:
             "stream_global_memory_budget_bytes": self.stream_global_memory_budget_bytes,
             "progressive_inline_backfill": self.progressive_inline_backfill,
             "include_index_coverage_hints": self.include_index_coverage_hints,
+            "rerank_window": self.rerank_window,
+            "lexical": self.lexical.as_dict(),
+            "fusion": self.fusion.as_dict(),
+            "query_cache": self.query_cache.as_dict(),
         }
 
 
 __all__ = [
+    "FUSION_RETRIEVERS",
+    "FusionSearchConfig",
+    "LexicalSearchConfig",
     "ProgressiveSearchConfig",
+    "QueryCacheConfig",
     "SearchConfig",
     "SearchLimits",
 ]
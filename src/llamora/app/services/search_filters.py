@@ -0,0 +1,153 @@
+"""Structured filters applied inside the vector search."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Iterable, Mapping, Sequence
+
+from llamora.app.util.tags import canonicalize, tag_hash
+
+
+SEARCH_FILTER_ROLES = ("user", "assistant")
+
+
+@dataclass(frozen=True, slots=True)
+class SearchFilters:
+    """Restrict search to a ``created_date`` range, roles and/or tags.
+
+    Dates are inclusive. An empty ``roles`` or ``tags`` set means no
+    restriction; multiple tags match entries carrying any of them.
+    """
+
+    date_from: date | None = None
+    date_to: date | None = None
+    roles: frozenset[str] = frozenset()
+    tags: frozenset[str] = frozenset()
+
+    @property
+    def is_empty(self) -> bool:
+        return (
+            self.date_from is None
+            and self.date_to is None
+            and not self.roles
+            and not self.tags
+        )
+
+    def as_query_params(self) -> list[tuple[str, str]]:
+        """Return the filters as repeatable query string pairs."""
+
+        params: list[tuple[str, str]] = []
+        if self.date_from is not None:
+            params.append(("from", self.date_from.isoformat()))
+        if self.date_to is not None:
+            params.append(("to", self.date_to.isoformat()))
+        params.extend(("role", role) for role in sorted(self.roles))
+        params.extend(("tag", tag) for tag in sorted(self.tags))
+        return params
+
+
+def _split_values(values: Iterable[str]) -> list[str]:
+    parts: list[str] = []
+    for value in values:
+        parts.extend(part.strip() for part in str(value or "").split(","))
+    return [part for part in parts if part]
+
+
+def _parse_date(value: str | None, name: str) -> date | None:
+    raw = (value or "").strip()
+    if not raw:
+        return None
+    try:
+        return date.fromisoformat(raw)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be an ISO date (YYYY-MM-DD)") from exc
+
+
+def build_search_filters(
+    *,
+    date_from: str | date | None = None,
+    date_to: str | date | None = None,
+    roles: Iterable[str] = (),
+    tags: Iterable[str] = (),
+) -> SearchFilters:
+    """Validate raw filter values and return a :class:`SearchFilters`."""
+
+    start = date_from if isinstance(date_from, date) else _parse_date(date_from, "from")
+    end = date_to if isinstance(date_to, date) else _parse_date(date_to, "to")
+    if start and end and start > end:
+        raise ValueError("from must not be after to")
+
+    role_set = frozenset(role.lower() for role in _split_values(roles))
+    unknown = role_set.difference(SEARCH_FILTER_ROLES)
+    if unknown:
+        raise ValueError(f"Unknown role filter: {', '.join(sorted(unknown))}")
+
+    tag_set = frozenset(canonicalize(tag) for tag in _split_values(tags))
+    return SearchFilters(date_from=start, date_to=end, roles=role_set, tags=tag_set)
+
+
+def parse_search_filters(args: Mapping[str, Any]) -> SearchFilters:
+    """Read ``from``, ``to``, ``role`` and ``tag`` from query arguments.
+
+    ``role`` and ``tag`` may be repeated or comma separated.
+    """
+
+    getlist = getattr(args, "getlist", None)
+
+    def _values(key: str) -> list[str]:
+        if callable(getlist):
+            values = getlist(key)
+            return list(values) if isinstance(values, (list, tuple)) else []
+        value = args.get(key)
+        if value is None:
+            return []
+        return list(value) if isinstance(value, (list, tuple)) else [value]
+
+    return build_search_filters(
+        date_from=args.get("from"),
+        date_to=args.get("to"),
+        roles=_values("role"),
+        tags=_values("tag"),
+    )
+
+
+async def restrict_entry_ids(
+    db, user_id: str, entry_ids: Sequence[str], filters: SearchFilters | None
+) -> list[str]:
+    """Return the ids in ``entry_ids`` that satisfy ``filters``, in order.
+
+    For retrievers that cannot apply the filters in their own query.
+    """
+
+    ids = list(entry_ids)
+    if filters is None or filters.is_empty or not ids:
+        return ids
+    if filters.tags:
+        tagged = await db.tags.get_entry_ids_for_tags(
+            user_id, [tag_hash(user_id, tag) for tag in filters.tags]
+        )
+        ids = [entry_id for entry_id in ids if entry_id in tagged]
+    if ids and (filters.roles or filters.date_from or filters.date_to):
+        start = filters.date_from.isoformat() if filters.date_from else None
+        end = filters.date_to.isoformat() if filters.date_to else None
+        allowed = {
+            entry_id
+            for entry_id, role, created_date in await db.entries.get_entry_filter_metadata(
+                user_id, ids
+            )
+            if (not filters.roles or role in filters.roles)
+            and (start is None or (created_date is not None and created_date >= start))
+            and (end is None or (created_date is not None and created_date <= end))
+        }
+        ids = [entry_id for entry_id in ids if entry_id in allowed]
+    return ids
+
+
+__all__ = [
+    "SEARCH_FILTER_ROLES",
+    "SearchFilters",
+    "build_search_filters",
+    "parse_search_filters",
+    "restrict_entry_ids",
+]
@@ -0,0 +1,179 @@
+"""In-memory prefix index over a user's decrypted search history."""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+
+from cachetools import TTLCache
+
+from llamora.app.util.frecency import DEFAULT_FRECENCY_DECAY
+
+# Prefixes are indexed up to this many characters; longer ones are checked
+# against the candidates of the deepest node.
+_MAX_PREFIX_CHARS = 24
+
+
+@dataclass(slots=True)
+class _QueryStats:
+    text: str
+    count: int
+    last_used: float
+
+
+class _Node:
+    __slots__ = ("children", "keys")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.keys: set[str] = set()
+
+
+def _word_starts(key: str) -> list[str]:
+    """Return ``key`` and every suffix of it that starts a word."""
+
+    starts = [key]
+    for idx in range(1, len(key)):
+        if key[idx - 1].isspace() and not key[idx].isspace():
+            starts.append(key[idx:])
+    return starts
+
+
+class QueryPrefixIndex:
+    """Frecency-ranked prefix trie over one user's past queries.
+
+    Queries are matched from their start and from the start of every word,
+    so ``"tri"`` finds ``"hiking trip"``. Matching ignores case; the most
+    recently recorded spelling of a query is the one suggested. At most
+    ``max_queries`` queries are kept, dropping the least recently used like
+    the ``search_history`` table does.
+    """
+
+    def __init__(
+        self, max_queries: int, *, decay: float = DEFAULT_FRECENCY_DECAY
+    ) -> None:
+        self._max_queries = max(int(max_queries), 1)
+        self._decay = float(decay)
+        self._root = _Node()
+        self._stats: dict[str, _QueryStats] = {}
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    def record(
+        self, text: str, *, count: int = 1, last_used: float | None = None
+    ) -> None:
+        """Count one use of ``text``, or load it with an existing ``count``."""
+
+        cleaned = (text or "").strip()
+        if not cleaned:
+            return
+        key = cleaned.lower()
+        when = time.time() if last_used is None else float(last_used)
+        stats = self._stats.get(key)
+        if stats is None:
+            self._stats[key] = _QueryStats(cleaned, max(int(count), 1), when)
+            self._insert(key)
+            self._trim()
+            return
+        stats.text = cleaned
+        stats.count += max(int(count), 1)
+        stats.last_used = max(stats.last_used, when)
+
+    def _insert(self, key: str) -> None:
+        for start in _word_starts(key):
+            node = self._root
+            for ch in start[:_MAX_PREFIX_CHARS]:
+                node = node.children.setdefault(ch, _Node())
+                node.keys.add(key)
+
+    def _remove(self, key: str) -> None:
+        for start in _word_starts(key):
+            path: list[tuple[_Node, str]] = []
+            node = self._root
+            for ch in start[:_MAX_PREFIX_CHARS]:
+                child = node.children.get(ch)
+                if child is None:
+                    break
+                child.keys.discard(key)
+                path.append((node, ch))
+                node = child
+            for parent, ch in reversed(path):
+                if parent.children[ch].keys:
+                    break
+                del parent.children[ch]
+
+    def _trim(self) -> None:
+        overflow = len(self._stats) - self._max_queries
+        if overflow <= 0:
+            return
+        oldest = sorted(self._stats, key=lambda key: self._stats[key].last_used)
+        for key in oldest[:overflow]:
+            del self._stats[key]
+            self._remove(key)
+
+    def _frecency(self, stats: _QueryStats, now: float) -> float:
+        age = max(now - stats.last_used, 0.0)
+        return stats.count * math.exp(-self._decay * age)
+
+    def suggest(self, prefix: str, limit: int) -> list[str]:
+        """Return up to ``limit`` queries matching ``prefix``, best first."""
+
+        needle = " ".join((prefix or "").lower().split())
+        if not needle or limit <= 0:
+            return []
+        node = self._root
+        for ch in needle[:_MAX_PREFIX_CHARS]:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        keys = node.keys
+        if len(needle) > _MAX_PREFIX_CHARS:
+            keys = {
+                key
+                for key in keys
+                if any(start.startswith(needle) for start in _word_starts(key))
+            }
+        now = time.time()
+        ranked = sorted(
+            keys, key=lambda key: self._frecency(self._stats[key], now), reverse=True
+        )
+        return [self._stats[key].text for key in ranked[:limit]]
+
+    def recent(self, limit: int) -> list[str]:
+        """Return up to ``limit`` queries, most recently used first."""
+
+        ranked = sorted(
+            self._stats.values(), key=lambda stats: stats.last_used, reverse=True
+        )
+        return [stats.text for stats in ranked[: max(int(limit), 0)]]
+
+
+class SearchHistoryIndex:
+    """Hold a :class:`QueryPrefixIndex` per signed-in user.
+
+    Indexes live only in memory, expire after ``ttl`` seconds without use and
+    are dropped explicitly on logout through :meth:`forget`.
+    """
+
+    def __init__(self, *, ttl: float = 1800.0, max_users: int = 256) -> None:
+        self._indexes = TTLCache[str, QueryPrefixIndex](
+            maxsize=max(int(max_users), 1), ttl=float(ttl)
+        )
+
+    def get(self, user_id: str) -> QueryPrefixIndex | None:
+        index = self._indexes.get(user_id)
+        if index is not None:
+            # Reinsert to refresh the idle expiry.
+            self._indexes[user_id] = index
+        return index
+
+    def put(self, user_id: str, index: QueryPrefixIndex) -> None:
+        self._indexes[user_id] = index
+
+    def forget(self, user_id: str) -> None:
+        self._indexes.pop(user_id, None)
+
+
+__all__ = ["QueryPrefixIndex", "SearchHistoryIndex"]
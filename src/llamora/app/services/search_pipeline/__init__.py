@@ -6,10 +6,25 @@ from .exceptions import InvalidSearchQuery
 from .normalizer import BaseSearchNormalizer, DefaultSearchNormalizer, NormalizedQuery
 from .candidate_generator import (
     BaseSearchCandidateGenerator,
+    CandidateHydrator,
     DefaultSearchCandidateGenerator,
+    LexicalSearchCandidateGenerator,
+    merge_lexical_hits,
 )
-from .tag_enricher import BaseTagEnricher, DefaultTagEnricher, TagEnrichment
-from .reranker import BaseSearchReranker, DefaultSearchReranker
+from .tag_enricher import (
+    BaseTagEnricher,
+    DefaultTagEnricher,
+    TagEnrichment,
+    tag_boost,
+    tag_query_tokens,
+)
+from .fusion import (
+    FusionSearchCandidateGenerator,
+    FusionTagEnricher,
+    reciprocal_rank_fusion,
+)
+from .reranker import BaseSearchReranker, DefaultSearchReranker, prerank_candidates
+from .result_cache import CachedCandidates, SearchResultCache
 from .pipeline import (
     SearchPipeline,
     SearchPipelineComponents,
@@ -22,12 +37,23 @@ __all__ = [
     "DefaultSearchNormalizer",
     "NormalizedQuery",
     "BaseSearchCandidateGenerator",
+    "CandidateHydrator",
     "DefaultSearchCandidateGenerator",
+    "LexicalSearchCandidateGenerator",
+    "merge_lexical_hits",
     "BaseTagEnricher",
     "DefaultTagEnricher",
     "TagEnrichment",
+    "tag_boost",
+    "tag_query_tokens",
+    "FusionSearchCandidateGenerator",
+    "FusionTagEnricher",
+    "reciprocal_rank_fusion",
     "BaseSearchReranker",
     "DefaultSearchReranker",
+    "prerank_candidates",
+    "CachedCandidates",
+    "SearchResultCache",
     "SearchPipeline",
     "SearchPipelineComponents",
     "SearchPipelineResult",
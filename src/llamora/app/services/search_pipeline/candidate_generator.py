@@ -4,17 +4,34 @@ from __future__ import annotations
 
 import logging
 from collections import OrderedDict
-from typing import Any, Iterable, Protocol
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+    Protocol,
+    Sequence,
+)
 
 from llamora.app.services.search_config import SearchConfig
 from llamora.app.services.crypto import CryptoContext
+from llamora.app.services.lexical_index import LexicalIndexService, normalize_scores
+from llamora.app.services.search_filters import SearchFilters
 from llamora.app.services.vector_search import VectorSearchService
 
+if TYPE_CHECKING:
+    import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
 Candidate = dict[str, Any]
 CandidateMap = OrderedDict[str, Candidate]
+# Decrypts candidates that only carry an id and cosine, dropping vanished ones.
+CandidateHydrator = Callable[
+    [CryptoContext, Sequence[Candidate]], Awaitable[list[Candidate]]
+]
 
 
 class BaseSearchCandidateGenerator(Protocol):
@@ -26,20 +43,58 @@ class BaseSearchCandidateGenerator(Protocol):
         normalized_query: str,
         k1: int,
         k2: int,
+        *,
+        filters: SearchFilters | None = None,
+        query_vec: "np.ndarray | None" = None,
     ) -> CandidateMap:
-        """Return candidate entries ordered by recency and vector distance."""
+        """Return candidate entries ordered by recency and vector distance.
+
+        ``query_vec`` is the already embedded query, when the caller has one.
+        """
 
         ...
 
 
+def merge_lexical_hits(
+    candidate_map: CandidateMap, hits: Sequence[tuple[str, float]]
+) -> int:
+    """Attach BM25 scores to ``candidate_map``, adding stubs for new entries.
+
+    ``bm25`` keeps the raw score and ``lexical`` the score relative to the
+    best hit, which is what :func:`prerank_candidates` weighs against cosine.
+    Returns the number of entries that were not already candidates.
+    """
+
+    added = 0
+    relative = normalize_scores(hits)
+    for entry_id, score in hits:
+        candidate = candidate_map.get(entry_id)
+        if candidate is None:
+            candidate = {"id": entry_id, "cosine": 0.0}
+            candidate_map[entry_id] = candidate
+            added += 1
+        candidate["bm25"] = score
+        candidate["lexical"] = relative[entry_id]
+    return added
+
+
 class DefaultSearchCandidateGenerator:
-    """Use the configured :class:`VectorSearchService` to produce candidates."""
+    """Use the configured :class:`VectorSearchService` to produce candidates.
+
+    When a :class:`LexicalIndexService` is supplied, BM25 hits from the blind
+    lexical index are merged in so exact terms the embedding misses still
+    reach the reranker.
+    """
 
     def __init__(
-        self, vector_search: VectorSearchService, config: SearchConfig
+        self,
+        vector_search: VectorSearchService,
+        config: SearchConfig,
+        lexical_index: LexicalIndexService | None = None,
     ) -> None:
         self._vector_search = vector_search
         self._config = config
+        self._lexical_index = lexical_index
 
     async def generate(
         self,
@@ -47,6 +102,9 @@ class DefaultSearchCandidateGenerator:
         normalized_query: str,
         k1: int,
         k2: int,
+        *,
+        filters: SearchFilters | None = None,
+        query_vec: "np.ndarray | None" = None,
     ) -> CandidateMap:
         logger.debug(
             "Generating search candidates for user %s with k1=%d k2=%d",
@@ -59,6 +117,9 @@ class DefaultSearchCandidateGenerator:
             normalized_query,
             k1,
             k2,
+            query_vec,
+            filters=filters,
+            hydrate_limit=k2 + self._config.rerank_window,
         )
 
         candidate_map: CandidateMap = OrderedDict()
@@ -73,6 +134,50 @@ class DefaultSearchCandidateGenerator:
             ):
                 candidate_map[entry_id] = candidate
 
+        if self._lexical_index is not None:
+            hits = await self._lexical_index.search(
+                ctx, normalized_query, filters=filters
+            )
+            added = merge_lexical_hits(candidate_map, hits)
+            logger.debug(
+                "Lexical index matched %d entries (%d not found by vector search)",
+                len(hits),
+                added,
+            )
+
+        return candidate_map
+
+
+class LexicalSearchCandidateGenerator:
+    """Produce candidates from the blind lexical index alone (BM25)."""
+
+    def __init__(
+        self,
+        vector_search: VectorSearchService,
+        config: SearchConfig,
+        lexical_index: LexicalIndexService,
+    ) -> None:
+        self._config = config
+        self._lexical_index = lexical_index
+
+    async def generate(
+        self,
+        ctx: CryptoContext,
+        normalized_query: str,
+        k1: int,
+        k2: int,
+        *,
+        filters: SearchFilters | None = None,
+        query_vec: "np.ndarray | None" = None,
+    ) -> CandidateMap:
+        hits = await self._lexical_index.search(
+            ctx,
+            normalized_query,
+            max(k1, self._config.lexical.limit),
+            filters=filters,
+        )
+        candidate_map: CandidateMap = OrderedDict()
+        merge_lexical_hits(candidate_map, hits)
         return candidate_map
 
 
@@ -85,7 +190,10 @@ def iter_candidates(candidate_map: CandidateMap) -> Iterable[Candidate]:
 __all__ = [
     "Candidate",
     "CandidateMap",
+    "CandidateHydrator",
     "BaseSearchCandidateGenerator",
     "DefaultSearchCandidateGenerator",
+    "LexicalSearchCandidateGenerator",
     "iter_candidates",
+    "merge_lexical_hits",
 ]
@@ -0,0 +1,275 @@
+"""Reciprocal rank fusion over concurrently run candidate retrievers."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Awaitable, Callable, Sequence
+
+from llamora.app.services.crypto import CryptoContext
+from llamora.app.services.lexical_index import LexicalIndexService, normalize_scores
+from llamora.app.services.search_config import SearchConfig
+from llamora.app.services.search_filters import SearchFilters, restrict_entry_ids
+from llamora.app.services.tag_service import TagService
+from llamora.app.services.vector_search import VectorSearchService
+from llamora.app.util.tags import tag_hash
+
+from .candidate_generator import Candidate, CandidateMap
+from .tag_enricher import TagEnrichment, tag_boost, tag_query_tokens
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# Each retriever returns its candidates best first. The trailing argument is
+# an already embedded query vector, when the caller has one.
+CandidateRetriever = Callable[
+    [CryptoContext, str, int, int, SearchFilters | None, "np.ndarray | None"],
+    Awaitable[list[Candidate]],
+]
+
+# Marks a retrieved candidate that only annotates entries other retrievers
+# found; it takes no part in the ranking.
+ANNOTATION_ONLY = "annotation_only"
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]], k: int = 60
+) -> dict[str, float]:
+    """Return ``sum(1 / (k + rank))`` per id over all ``rankings``."""
+
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, entry_id in enumerate(ranking, start=1):
+            scores[entry_id] = scores.get(entry_id, 0.0) + 1.0 / (k + rank)
+    return scores
+
+
+class FusionSearchCandidateGenerator:
+    """Fuse vector, lexical and tag retrieval with reciprocal rank fusion.
+
+    The configured retrievers run concurrently, so candidate generation
+    costs about as much as the slowest of them. Candidates come back as
+    id-only stubs ordered by their fused ``rrf`` score; the vector cosine and
+    BM25 scores are kept for the reranker. The tag retriever also records
+    ``tag_matches`` on every tagged candidate, which :class:`FusionTagEnricher`
+    turns into boosts without querying tags again.
+    """
+
+    provides_tag_matches = True
+
+    def __init__(
+        self,
+        vector_search: VectorSearchService,
+        config: SearchConfig,
+        lexical_index: LexicalIndexService | None = None,
+        db=None,
+        tag_service: TagService | None = None,
+    ) -> None:
+        self._vector_search = vector_search
+        self._config = config
+        self._lexical_index = lexical_index
+        self._db = db
+        self._tag_service = tag_service
+        available: dict[str, CandidateRetriever | None] = {
+            "vector": self._retrieve_vector,
+            "lexical": self._retrieve_lexical if lexical_index is not None else None,
+            "tags": (
+                self._retrieve_tags
+                if db is not None and tag_service is not None
+                else None
+            ),
+        }
+        self._retrievers: dict[str, CandidateRetriever] = {}
+        for name in config.fusion.retrievers:
+            retriever = available.get(name)
+            if retriever is None:
+                logger.warning("Search fusion retriever %r is unavailable", name)
+                continue
+            self._retrievers[name] = retriever
+
+    async def _retrieve_vector(
+        self,
+        ctx: CryptoContext,
+        query: str,
+        k1: int,
+        k2: int,
+        filters: SearchFilters | None,
+        query_vec: "np.ndarray | None",
+    ) -> list[Candidate]:
+        return await self._vector_search.search_candidates(
+            ctx,
+            query,
+            k1,
+            k2,
+            query_vec,
+            filters=filters,
+            hydrate_limit=0,
+        )
+
+    async def _retrieve_lexical(
+        self,
+        ctx: CryptoContext,
+        query: str,
+        k1: int,
+        k2: int,
+        filters: SearchFilters | None,
+        query_vec: "np.ndarray | None",
+    ) -> list[Candidate]:
+        assert self._lexical_index is not None
+        hits = await self._lexical_index.search(ctx, query, filters=filters)
+        relative = normalize_scores(hits)
+        return [
+            {"id": entry_id, "bm25": score, "lexical": relative[entry_id]}
+            for entry_id, score in hits
+        ]
+
+    async def _retrieve_tags(
+        self,
+        ctx: CryptoContext,
+        query: str,
+        k1: int,
+        k2: int,
+        filters: SearchFilters | None,
+        query_vec: "np.ndarray | None",
+    ) -> list[Candidate]:
+        db = self._db
+        if db is None or self._tag_service is None:
+            return []
+        tokens = tag_query_tokens(self._tag_service, query)
+        if not tokens:
+            return []
+        # One query yields the recent matches to rank and the match count of
+        # every tagged entry, so boosts need no second round trip.
+        recent_ids, match_counts = await db.tags.get_tag_matches(
+            ctx.user_id,
+            [tag_hash(ctx.user_id, token) for token in tokens],
+            None,
+            limit=k1,
+        )
+        entry_ids = await restrict_entry_ids(db, ctx.user_id, recent_ids, filters)
+        ranked = set(entry_ids)
+        candidates: list[Candidate] = [
+            {"id": entry_id, "tag_matches": match_counts.get(entry_id, 0)}
+            for entry_id in entry_ids
+        ]
+        candidates.extend(
+            {"id": entry_id, "tag_matches": count, ANNOTATION_ONLY: True}
+            for entry_id, count in match_counts.items()
+            if entry_id not in ranked
+        )
+        return candidates
+
+    async def generate(
+        self,
+        ctx: CryptoContext,
+        normalized_query: str,
+        k1: int,
+        k2: int,
+        *,
+        filters: SearchFilters | None = None,
+        query_vec: "np.ndarray | None" = None,
+    ) -> CandidateMap:
+        names = list(self._retrievers)
+        results = await asyncio.gather(
+            *(
+                self._retrievers[name](
+                    ctx, normalized_query, k1, k2, filters, query_vec
+                )
+                for name in names
+            ),
+            return_exceptions=True,
+        )
+
+        rankings: list[list[str]] = []
+        counts: dict[str, int] = {}
+        merged: dict[str, Candidate] = {}
+        annotations: dict[str, Candidate] = {}
+        failures: list[BaseException] = []
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                if isinstance(result, asyncio.CancelledError):
+                    raise result
+                logger.warning(
+                    "Search fusion retriever %s failed", name, exc_info=result
+                )
+                failures.append(result)
+                continue
+            ranking: list[str] = []
+            seen: set[str] = set()
+            for candidate in result:
+                entry_id = candidate.get("id")
+                if not entry_id or entry_id in seen:
+                    continue
+                if candidate.get(ANNOTATION_ONLY):
+                    annotations.setdefault(entry_id, {}).update(
+                        (key, value)
+                        for key, value in candidate.items()
+                        if key not in ("id", ANNOTATION_ONLY)
+                    )
+                    continue
+                seen.add(entry_id)
+                ranking.append(entry_id)
+                existing = merged.setdefault(entry_id, {"id": entry_id, "cosine": 0.0})
+                for key, value in candidate.items():
+                    if key == "cosine" and value <= existing.get("cosine", 0.0):
+                        continue
+                    existing[key] = value
+            rankings.append(ranking)
+            counts[name] = len(ranking)
+        if failures and len(failures) == len(names):
+            raise failures[0]
+
+        fused = reciprocal_rank_fusion(rankings, self._config.fusion.rrf_k)
+        candidate_map: CandidateMap = OrderedDict()
+        for entry_id in sorted(fused, key=fused.__getitem__, reverse=True):
+            candidate = merged[entry_id]
+            candidate.update(annotations.get(entry_id, ()))
+            candidate["rrf"] = fused[entry_id]
+            candidate_map[entry_id] = candidate
+        logger.debug(
+            "Fused %d candidates from %s",
+            len(candidate_map),
+            ", ".join(f"{name}={count}" for name, count in counts.items()),
+        )
+        return candidate_map
+
+
+class FusionTagEnricher:
+    """Derive tag boosts from the ``tag_matches`` fusion already recorded.
+
+    Pairs with :class:`FusionSearchCandidateGenerator`, whose tag retriever
+    ran alongside the others; no tag query is issued here.
+    """
+
+    def __init__(self, tag_service: TagService) -> None:
+        self._tag_service = tag_service
+
+    async def enrich(
+        self,
+        ctx: CryptoContext,
+        normalized_query: str,
+        candidate_map: OrderedDict[str, dict],
+        limit: int,
+        *,
+        filters: SearchFilters | None = None,
+    ) -> TagEnrichment:
+        tokens = tag_query_tokens(self._tag_service, normalized_query)
+        boosts = {
+            entry_id: tag_boost(count)
+            for entry_id, candidate in candidate_map.items()
+            if (count := int(candidate.get("tag_matches", 0))) > 0
+        }
+        return TagEnrichment(tokens=tokens, boosts=boosts)
+
+
+__all__ = [
+    "ANNOTATION_ONLY",
+    "CandidateRetriever",
+    "FusionSearchCandidateGenerator",
+    "FusionTagEnricher",
+    "reciprocal_rank_fusion",
+]
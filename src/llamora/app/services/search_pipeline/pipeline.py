@@ -2,16 +2,20 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any
 
 from llamora.app.services.crypto import CryptoContext
+from llamora.app.services.search_filters import SearchFilters
 from .candidate_generator import (
     BaseSearchCandidateGenerator,
+    CandidateHydrator,
     CandidateMap,
 )
 from .normalizer import BaseSearchNormalizer, NormalizedQuery
-from .reranker import BaseSearchReranker
+from .reranker import BaseSearchReranker, prerank_candidates
+from .result_cache import SearchResultCache
 from .tag_enricher import BaseTagEnricher, TagEnrichment
 
 
@@ -43,9 +47,19 @@ class SearchPipelineResult:
 
 @dataclass(slots=True)
 class SearchPipeline:
-    """Execute the configured search pipeline components in order."""
+    """Execute the configured search pipeline components in order.
+
+    Candidates may arrive without plaintext; only the best ``k2`` plus
+    ``rerank_window`` of them (by tag boost and cosine) are decrypted via
+    ``hydrator`` before the lexical rerank. With a ``result_cache``, the
+    generated candidate scores are reused for repeat queries until the
+    user's index changes.
+    """
 
     components: SearchPipelineComponents
+    hydrator: CandidateHydrator | None = None
+    rerank_window: int = 0
+    result_cache: SearchResultCache | None = None
 
     async def execute(
         self,
@@ -53,18 +67,15 @@ class SearchPipeline:
         query: str,
         k1: int,
         k2: int,
+        *,
+        filters: SearchFilters | None = None,
     ) -> SearchPipelineResult:
         """Normalize, expand, enrich, and rerank search results for ``query``."""
 
         comps = self.components
 
         normalized = comps.normalizer.normalize(ctx.user_id, query)
-        candidate_map: CandidateMap = await comps.candidate_generator.generate(
-            ctx,
-            normalized.text,
-            k1,
-            k2,
-        )
+        candidate_map = await self._generate(ctx, normalized.text, k1, k2, filters)
 
         limit = max(k2, len(candidate_map), 1)
         enrichment = await comps.tag_enricher.enrich(
@@ -72,6 +83,7 @@ class SearchPipeline:
             normalized.text,
             candidate_map,
             limit,
+            filters=filters,
         )
 
         if not candidate_map:
@@ -82,7 +94,13 @@ class SearchPipeline:
                 enrichment=enrichment,
             )
 
-        ordered_candidates = list(candidate_map.values())
+        ordered_candidates = prerank_candidates(
+            candidate_map.values(), enrichment.boosts
+        )[: max(k2, 1) + max(self.rerank_window, 0)]
+        if self.hydrator is not None:
+            ordered_candidates = await self.hydrator(ctx, ordered_candidates)
+        else:
+            ordered_candidates = [c for c in ordered_candidates if "content" in c]
         results = comps.reranker.rerank(
             normalized.text,
             ordered_candidates,
@@ -97,6 +115,38 @@ class SearchPipeline:
             enrichment=enrichment,
         )
 
+    async def _generate(
+        self,
+        ctx: CryptoContext,
+        normalized_query: str,
+        k1: int,
+        k2: int,
+        filters: SearchFilters | None,
+    ) -> CandidateMap:
+        cache = self.result_cache
+        if filters is not None and filters.is_empty:
+            filters = None
+        key = ("pipeline", normalized_query, filters, k1, k2)
+        cached = cache.get_candidates(ctx.user_id, key) if cache is not None else None
+        if cached is not None:
+            return OrderedDict(
+                (candidate["id"], candidate) for candidate in cached.copy_candidates()
+            )
+
+        generation = cache.generation(ctx.user_id) if cache is not None else 0
+        candidate_map: CandidateMap = (
+            await self.components.candidate_generator.generate(
+                ctx,
+                normalized_query,
+                k1,
+                k2,
+                filters=filters,
+            )
+        )
+        if cache is not None:
+            cache.put_candidates(ctx.user_id, key, generation, candidate_map.values())
+        return candidate_map
+
 
 __all__ = [
     "SearchPipeline",
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Protocol, Sequence
+from typing import Iterable, Protocol, Sequence
 
 from llamora.app.services.lexical_reranker import LexicalReranker
 
@@ -22,6 +22,32 @@ class BaseSearchReranker(Protocol):
         ...
 
 
+def prerank_candidates(
+    candidates: Iterable[dict], boosts: dict[str, float] | None = None
+) -> list[dict]:
+    """Order candidates by tag boost and cosine, without needing plaintext.
+
+    Used to decide which candidates are worth decrypting for the lexical
+    reranker; the final order is still up to :class:`BaseSearchReranker`.
+    A relative BM25 score (``lexical``) counts alongside the cosine so
+    keyword-only hits are not starved of hydration; fused candidates are
+    ordered by their ``rrf`` score instead.
+    """
+
+    weights = boosts or {}
+
+    def _score(cand: dict) -> float:
+        if "rrf" in cand:
+            return cand["rrf"]
+        return cand.get("cosine", 0.0) + cand.get("lexical", 0.0)
+
+    return sorted(
+        candidates,
+        key=lambda cand: (weights.get(cand["id"], 0.0), _score(cand)),
+        reverse=True,
+    )
+
+
 class DefaultSearchReranker:
     """Use the lexical reranker to score and order candidates."""
 
@@ -44,4 +70,4 @@ class DefaultSearchReranker:
         return self._lexical_reranker.rerank(query, list(candidates), limit, boosts)
 
 
-__all__ = ["BaseSearchReranker", "DefaultSearchReranker"]
+__all__ = ["BaseSearchReranker", "DefaultSearchReranker", "prerank_candidates"]
@@ -0,0 +1,183 @@
+"""Per-user cache of query vectors and candidate scores."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Hashable, Iterable
+
+from .candidate_generator import Candidate
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Candidate keys worth caching; plaintext is always left out.
+_SCORE_KEYS = ("id", "cosine", "bm25", "lexical", "rrf", "tag_matches")
+
+
+@dataclass(slots=True, frozen=True)
+class CachedCandidates:
+    """Candidate scores computed against index revision ``revision``."""
+
+    revision: Hashable
+    candidates: tuple[Candidate, ...]
+    total_count: int = 0
+    refining: bool = False
+
+    def copy_candidates(self) -> list[Candidate]:
+        return [dict(candidate) for candidate in self.candidates]
+
+
+class SearchResultCache:
+    """Bounded in-memory cache of search work that does not need plaintext.
+
+    Query vectors are cached by normalized query alone. Candidate lists are
+    stored with the index revision they were computed at (``revision_of``
+    returns it for a user) and are ignored once that revision moves on, so
+    newly indexed, edited or deleted entries are never hidden by a stale hit.
+    Changes the index revision does not see, such as tag links, go through
+    :meth:`bump`.
+    Each user keeps at most ``max_entries`` items; the least recently active
+    users are dropped past ``max_users``.
+    """
+
+    def __init__(
+        self,
+        revision_of: Callable[[str], Hashable],
+        *,
+        max_entries: int = 32,
+        max_users: int = 64,
+    ) -> None:
+        self._revision_of = revision_of
+        self._max_entries = max(int(max_entries), 0)
+        self._max_users = max(int(max_users), 1)
+        self._users: OrderedDict[str, OrderedDict[Hashable, object]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    def generation(self, user_id: str) -> int:
+        """Return the token to pass to :meth:`put_candidates`.
+
+        Read it before computing candidates; results are dropped if the user
+        is bumped in the meantime.
+        """
+
+        return self._generations.get(user_id, 0)
+
+    def revision(self, user_id: str) -> Hashable:
+        """Return the revision that cached candidates must match."""
+
+        return (self._revision_of(user_id), self.generation(user_id))
+
+    def _get(self, user_id: str, key: Hashable) -> object | None:
+        entries = self._users.get(user_id)
+        if entries is None or key not in entries:
+            return None
+        self._users.move_to_end(user_id)
+        entries.move_to_end(key)
+        return entries[key]
+
+    def _put(self, user_id: str, key: Hashable, value: object) -> None:
+        if not self.enabled:
+            return
+        entries = self._users.get(user_id)
+        if entries is None:
+            entries = OrderedDict()
+            self._users[user_id] = entries
+            while len(self._users) > self._max_users:
+                self._users.popitem(last=False)
+        self._users.move_to_end(user_id)
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self._max_entries:
+            entries.popitem(last=False)
+
+    def get_query_vector(
+        self, user_id: str, normalized_query: str
+    ) -> "np.ndarray | None":
+        return self._get(user_id, ("vector", normalized_query))  # type: ignore[return-value]
+
+    def put_query_vector(
+        self, user_id: str, normalized_query: str, vector: "np.ndarray"
+    ) -> None:
+        self._put(user_id, ("vector", normalized_query), vector)
+
+    def get_candidates(self, user_id: str, key: Hashable) -> CachedCandidates | None:
+        """Return candidates for ``key`` if the user's index has not changed."""
+
+        cached = self._get(user_id, ("candidates", key))
+        if not isinstance(cached, CachedCandidates):
+            self.misses += 1
+            return None
+        if cached.revision != self.revision(user_id):
+            self._users[user_id].pop(("candidates", key), None)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return cached
+
+    def put_candidates(
+        self,
+        user_id: str,
+        key: Hashable,
+        generation: int,
+        candidates: Iterable[Candidate],
+        *,
+        total_count: int = 0,
+        refining: bool = False,
+    ) -> None:
+        """Store candidate scores under ``key``.
+
+        ``generation`` is what :meth:`generation` returned before the
+        candidates were computed. The index revision is read now, after any
+        backfill the search itself ran, so that backfill does not make the
+        result unusable.
+        """
+
+        if not self.enabled or generation != self.generation(user_id):
+            return
+        revision = self.revision(user_id)
+        stripped = tuple(
+            {name: candidate[name] for name in _SCORE_KEYS if name in candidate}
+            for candidate in candidates
+            if candidate.get("id")
+        )
+        self._put(
+            user_id,
+            ("candidates", key),
+            CachedCandidates(
+                revision=revision,
+                candidates=stripped,
+                total_count=total_count,
+                refining=refining,
+            ),
+        )
+
+    def bump(self, user_id: str) -> None:
+        """Drop the user's candidate lists, including ones still in flight."""
+
+        self._generations[user_id] = self.generation(user_id) + 1
+        entries = self._users.get(user_id)
+        if entries is not None:
+            for key, value in list(entries.items()):
+                if isinstance(value, CachedCandidates):
+                    del entries[key]
+
+    def invalidate(self, user_id: str) -> None:
+        self._users.pop(user_id, None)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "users": len(self._users),
+            "entries": sum(len(entries) for entries in self._users.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+__all__ = ["CachedCandidates", "SearchResultCache"]
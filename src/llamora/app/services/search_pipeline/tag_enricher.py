@@ -9,6 +9,7 @@ from dataclasses import dataclass
 from typing import Protocol
 
 from llamora.app.services.crypto import CryptoContext
+from llamora.app.services.search_filters import SearchFilters, restrict_entry_ids
 from llamora.app.services.tag_service import TagService
 from llamora.app.util.tags import tag_hash
 from llamora.persistence.local_db import LocalDB
@@ -28,6 +29,48 @@ class TagEnrichment:
     boosts: dict[str, float]
 
 
+def tag_query_tokens(tag_service: TagService, normalized_query: str) -> list[str]:
+    """Return the canonical tags a query could refer to.
+
+    Every whitespace separated token is tried, plus the whole query when it
+    spans several words.
+    """
+
+    seen_tokens: set[str] = set()
+    tokens: list[str] = []
+    raw_query = (normalized_query or "").strip()
+    for raw_token in _TOKEN_PATTERN.findall(normalized_query):
+        token = raw_token.strip()
+        if not token:
+            continue
+        try:
+            canonical = tag_service.canonicalize(token)
+        except ValueError:
+            continue
+        canonical_lower = canonical.lower()
+        if canonical_lower in seen_tokens:
+            continue
+        seen_tokens.add(canonical_lower)
+        tokens.append(canonical)
+    if raw_query and (any(ch.isspace() for ch in raw_query) or "_" in raw_query):
+        try:
+            canonical = tag_service.canonicalize(raw_query)
+        except ValueError:
+            canonical = ""
+        if canonical:
+            canonical_lower = canonical.lower()
+            if canonical_lower not in seen_tokens:
+                tokens.append(canonical)
+                seen_tokens.add(canonical_lower)
+    return tokens
+
+
+def tag_boost(match_count: int) -> float:
+    """Return the rerank boost for an entry carrying ``match_count`` query tags."""
+
+    return 1.0 + 0.1 * (match_count - 1)
+
+
 class BaseTagEnricher(Protocol):
     """Interface for enriching candidates with tag information."""
 
@@ -37,6 +80,8 @@ class BaseTagEnricher(Protocol):
         normalized_query: str,
         candidate_map: OrderedDict[str, dict],
         limit: int,
+        *,
+        filters: SearchFilters | None = None,
     ) -> TagEnrichment:
         """Augment ``candidate_map`` and compute tag boost weights."""
 
@@ -44,7 +89,11 @@ class BaseTagEnricher(Protocol):
 
 
 class DefaultTagEnricher:
-    """Apply canonical tag matching and hydration to the candidate set."""
+    """Apply canonical tag matching and hydration to the candidate set.
+
+    Recent tag matches and the match counts behind the boosts come from a
+    single query, however many tokens the query has.
+    """
 
     def __init__(
         self,
@@ -62,111 +111,40 @@ class DefaultTagEnricher:
         normalized_query: str,
         candidate_map: OrderedDict[str, dict],
         limit: int,
+        *,
+        filters: SearchFilters | None = None,
     ) -> TagEnrichment:
-        tokens = self._tokenize(normalized_query)
+        tokens = tag_query_tokens(self._tag_service, normalized_query)
         boosts: dict[str, float] = {}
         if not tokens:
             return TagEnrichment(tokens=tokens, boosts=boosts)
 
         tag_hashes = [tag_hash(ctx.user_id, token) for token in tokens]
-        await self._hydrate_candidates(ctx, candidate_map, tag_hashes, limit)
-        boosts = await self._compute_tag_boosts(ctx.user_id, candidate_map, tag_hashes)
-        return TagEnrichment(tokens=tokens, boosts=boosts)
-
-    def _tokenize(self, normalized_query: str) -> list[str]:
-        seen_tokens: set[str] = set()
-        tokens: list[str] = []
-        raw_query = (normalized_query or "").strip()
-        for raw_token in _TOKEN_PATTERN.findall(normalized_query):
-            token = raw_token.strip()
-            if not token:
-                continue
-            try:
-                canonical = self._tag_service.canonicalize(token)
-            except ValueError:
-                continue
-            canonical_lower = canonical.lower()
-            if canonical_lower in seen_tokens:
-                continue
-            seen_tokens.add(canonical_lower)
-            tokens.append(canonical)
-        if raw_query and (any(ch.isspace() for ch in raw_query) or "_" in raw_query):
-            try:
-                canonical = self._tag_service.canonicalize(raw_query)
-            except ValueError:
-                canonical = ""
-            if canonical:
-                canonical_lower = canonical.lower()
-                if canonical_lower not in seen_tokens:
-                    tokens.append(canonical)
-                    seen_tokens.add(canonical_lower)
-        return tokens
-
-    async def _hydrate_candidates(
-        self,
-        ctx: CryptoContext,
-        candidate_map: OrderedDict[str, dict],
-        tag_hashes: list[bytes],
-        limit: int,
-    ) -> None:
-        if not tag_hashes:
-            return
-
-        tag_entry_ids = await self._db.tags.get_recent_entries_for_tag_hashes(
-            ctx.user_id,
-            tag_hashes,
-            limit=limit,
-        )
-        if not tag_entry_ids:
-            return
-
-        missing_ids = [eid for eid in tag_entry_ids if eid not in candidate_map]
-        if not missing_ids:
-            return
-
-        rows = await self._vector_search.index_store.hydrate_entries(
-            ctx,
-            missing_ids,
+        recent_ids, match_counts = await self._db.tags.get_tag_matches(
+            ctx.user_id, tag_hashes, list(candidate_map), limit=limit
         )
-        row_map = {row["id"]: row for row in rows}
+        tag_entry_ids = [
+            entry_id for entry_id in recent_ids if entry_id not in candidate_map
+        ]
+        if tag_entry_ids:
+            tag_entry_ids = await restrict_entry_ids(
+                self._db, ctx.user_id, tag_entry_ids, filters
+            )
+        # Tag matches join as id-only candidates; they are decrypted later,
+        # and only if they rank into the window being shown.
         for entry_id in tag_entry_ids:
-            if entry_id in candidate_map:
-                continue
-            row = row_map.get(entry_id)
-            if not row:
-                continue
-            candidate_map[entry_id] = {
-                "id": row["id"],
-                "created_at": row["created_at"],
-                "created_date": row.get("created_date"),
-                "role": row["role"],
-                "content": row.get("text", ""),
-                "cosine": 0.0,
-            }
-
-    async def _compute_tag_boosts(
-        self,
-        user_id: str,
-        candidate_map: OrderedDict[str, dict],
-        tag_hashes: list[bytes],
-    ) -> dict[str, float]:
-        if not candidate_map or not tag_hashes:
-            return {}
-
-        entry_ids = list(candidate_map.keys())
-        if not entry_ids:
-            return {}
-
-        match_counts = await self._db.tags.get_tag_match_counts(
-            user_id,
-            tag_hashes,
-            entry_ids,
-        )
-        boosts: dict[str, float] = {}
+            candidate_map[entry_id] = {"id": entry_id, "cosine": 0.0}
+
         for entry_id, count in match_counts.items():
-            if count > 0:
-                boosts[entry_id] = 1.0 + 0.1 * (count - 1)
-        return boosts
+            if count > 0 and entry_id in candidate_map:
+                boosts[entry_id] = tag_boost(count)
+        return TagEnrichment(tokens=tokens, boosts=boosts)
 
 
-__all__ = ["TagEnrichment", "BaseTagEnricher", "DefaultTagEnricher"]
+__all__ = [
+    "TagEnrichment",
+    "BaseTagEnricher",
+    "DefaultTagEnricher",
+    "tag_boost",
+    "tag_query_tokens",
+]
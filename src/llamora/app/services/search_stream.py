@@ -1,24 +1,222 @@
 from __future__ import annotations
 
 import logging
+import math
 import time
+from array import array
 from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, AsyncIterator, Iterable
 
 import numpy as np
 from ulid import ULID
 
 from llamora.app.embed.model import async_embed_texts
 from llamora.app.services.crypto import CryptoContext
+from llamora.app.services.lexical_index import LexicalIndexService
 from llamora.app.services.search_config import SearchConfig
-from llamora.app.services.search_pipeline import SearchPipelineComponents
+from llamora.app.services.search_filters import SearchFilters
+from llamora.app.services.search_pipeline import (
+    DefaultSearchCandidateGenerator,
+    SearchPipelineComponents,
+    SearchResultCache,
+    merge_lexical_hits,
+    prerank_candidates,
+)
 from llamora.app.services.service_pulse import ServicePulse
 from llamora.app.services.tag_service import TagService
 from llamora.app.services.vector_search import VectorSearchService
 
 logger = logging.getLogger(__name__)
 
+Candidate = dict[str, Any]
+CandidateMap = OrderedDict[str, Candidate]
+
+
+# Rough per-item overheads used for the session memory estimate.
+_CANDIDATE_OVERHEAD_BYTES = 96
+_DELIVERED_OVERHEAD_BYTES = 32
+_SESSION_OVERHEAD_BYTES = 256
+_PLAINTEXT_OVERHEAD_BYTES = 160
+
+_NO_SCORE = float("nan")
+
+
+class SessionCandidates:
+    """Entry ids and rerank features of a session's candidates.
+
+    Only scores are kept: cosine, raw BM25 (NaN when the entry had no
+    lexical hit), the relative lexical score, the fused ``rrf`` score (NaN
+    unless a fusion generator produced it) and the tag match count, in
+    parallel arrays. Plaintext is looked up per page in
+    :class:`SearchPlaintextCache`.
+    """
+
+    __slots__ = (
+        "ids",
+        "nbytes",
+        "_positions",
+        "_cosine",
+        "_bm25",
+        "_lexical",
+        "_rrf",
+        "_tag_matches",
+    )
+
+    def __init__(self) -> None:
+        self.ids: list[str] = []
+        self.nbytes = 0
+        self._positions: dict[str, int] = {}
+        self._cosine = array("f")
+        self._bm25 = array("f")
+        self._lexical = array("f")
+        self._rrf = array("f")
+        self._tag_matches = array("I")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, entry_id: object) -> bool:
+        return entry_id in self._positions
+
+    def upsert(self, candidate: Candidate) -> None:
+        """Add ``candidate`` or raise its scores to the ones it carries."""
+
+        entry_id = candidate.get("id")
+        if not entry_id:
+            return
+        cosine = float(candidate.get("cosine", 0.0))
+        position = self._positions.get(entry_id)
+        if position is None:
+            self._positions[entry_id] = len(self.ids)
+            self.ids.append(entry_id)
+            self._cosine.append(cosine)
+            self._bm25.append(float(candidate.get("bm25", _NO_SCORE)))
+            self._lexical.append(float(candidate.get("lexical", 0.0)))
+            self._rrf.append(float(candidate.get("rrf", _NO_SCORE)))
+            self._tag_matches.append(int(candidate.get("tag_matches", 0)))
+            self.nbytes += len(entry_id) + _CANDIDATE_OVERHEAD_BYTES
+            return
+        if cosine > self._cosine[position]:
+            self._cosine[position] = cosine
+        if "bm25" in candidate:
+            self._bm25[position] = float(candidate["bm25"])
+            self._lexical[position] = float(candidate.get("lexical", 0.0))
+        if "rrf" in candidate:
+            self._rrf[position] = float(candidate["rrf"])
+        if "tag_matches" in candidate:
+            self._tag_matches[position] = int(candidate["tag_matches"])
+
+    def discard(self, entry_id: str) -> None:
+        position = self._positions.pop(entry_id, None)
+        if position is None:
+            return
+        del self.ids[position]
+        del self._cosine[position]
+        del self._bm25[position]
+        del self._lexical[position]
+        del self._rrf[position]
+        del self._tag_matches[position]
+        for index in range(position, len(self.ids)):
+            self._positions[self.ids[index]] = index
+        self.nbytes -= len(entry_id) + _CANDIDATE_OVERHEAD_BYTES
+
+    def to_map(self) -> CandidateMap:
+        """Return fresh id-only candidate dicts, in insertion order."""
+
+        candidate_map: CandidateMap = OrderedDict()
+        for position, entry_id in enumerate(self.ids):
+            candidate: Candidate = {"id": entry_id, "cosine": self._cosine[position]}
+            bm25 = self._bm25[position]
+            if not math.isnan(bm25):
+                candidate["bm25"] = bm25
+                candidate["lexical"] = self._lexical[position]
+            rrf = self._rrf[position]
+            if not math.isnan(rrf):
+                candidate["rrf"] = rrf
+            tag_matches = self._tag_matches[position]
+            if tag_matches:
+                candidate["tag_matches"] = tag_matches
+            candidate_map[entry_id] = candidate
+        return candidate_map
+
+
+class SearchPlaintextCache:
+    """Decrypted entry fields shared by all stream sessions.
+
+    A byte-bounded LRU keyed by ``(user_id, entry_id)``; entries untouched
+    for ``ttl`` seconds are dropped on :meth:`prune`.
+    """
+
+    _FIELDS = ("created_at", "created_date", "role", "content")
+
+    def __init__(self, max_bytes: int, ttl: float) -> None:
+        self._max_bytes = max(int(max_bytes), 0)
+        self._ttl = float(ttl)
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Candidate, int]] = (
+            OrderedDict()
+        )
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, user_id: str, entry_ids: Iterable[str]) -> dict[str, Candidate]:
+        now = time.monotonic()
+        found: dict[str, Candidate] = {}
+        for entry_id in entry_ids:
+            key = (user_id, entry_id)
+            item = self._entries.get(key)
+            if item is None:
+                continue
+            _, fields, size = item
+            self._entries[key] = (now, fields, size)
+            self._entries.move_to_end(key)
+            found[entry_id] = fields
+        return found
+
+    def put(self, user_id: str, candidate: Candidate) -> None:
+        if self._max_bytes <= 0:
+            return
+        fields = {name: candidate.get(name) for name in self._FIELDS}
+        size = (
+            len(candidate["id"])
+            + len(str(fields["content"] or ""))
+            + _PLAINTEXT_OVERHEAD_BYTES
+        )
+        if size > self._max_bytes:
+            return
+        key = (user_id, candidate["id"])
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.nbytes -= previous[2]
+        self._entries[key] = (time.monotonic(), fields, size)
+        self.nbytes += size
+        while self.nbytes > self._max_bytes and self._entries:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+
+    def invalidate(self, user_id: str, entry_ids: Iterable[str] | None = None) -> None:
+        """Forget ``entry_ids`` of ``user_id``, or all of the user's entries."""
+
+        if entry_ids is None:
+            keys = [key for key in self._entries if key[0] == user_id]
+        else:
+            keys = [(user_id, entry_id) for entry_id in entry_ids]
+        for key in keys:
+            item = self._entries.pop(key, None)
+            if item is not None:
+                self.nbytes -= item[2]
+
+    def prune(self) -> None:
+        cutoff = time.monotonic() - self._ttl
+        while self._entries:
+            key, (last_access, _, size) = next(iter(self._entries.items()))
+            if last_access > cutoff:
+                break
+            del self._entries[key]
+            self.nbytes -= size
+
 
 @dataclass(slots=True)
 class SearchStreamSession:
@@ -27,23 +225,35 @@ class SearchStreamSession:
     normalized_query: str
     truncated: bool
     query_vec: np.ndarray
-    candidate_map: OrderedDict[str, Candidate] = field(default_factory=OrderedDict)
+    filters: SearchFilters | None = None
+    candidates: SessionCandidates = field(default_factory=SessionCandidates)
     delivered_ids: set[str] = field(default_factory=set)
     current_k2: int = 0
     exhausted: bool = False
     last_access: float = field(default_factory=time.monotonic)
+    _delivered_bytes: int = field(default=0, init=False, repr=False)
+
+    def deliver(self, entry_ids: Iterable[str]) -> None:
+        for entry_id in entry_ids:
+            if entry_id not in self.delivered_ids:
+                self.delivered_ids.add(entry_id)
+                self._delivered_bytes += len(entry_id) + _DELIVERED_OVERHEAD_BYTES
+
+    def reset_delivered(self, entry_ids: Iterable[str]) -> None:
+        self.delivered_ids = set()
+        self._delivered_bytes = 0
+        self.deliver(entry_ids)
 
     def estimated_memory_bytes(self) -> int:
-        query_vec_bytes = int(getattr(self.query_vec, "nbytes", 0))
-        candidate_payload_bytes = 0
-        for entry_id, candidate in self.candidate_map.items():
-            candidate_payload_bytes += len(entry_id) + 96
-            candidate_payload_bytes += len(str(candidate.get("content", "")))
-        delivered_bytes = sum(len(entry_id) + 32 for entry_id in self.delivered_ids)
-        return query_vec_bytes + candidate_payload_bytes + delivered_bytes + 256
+        return (
+            int(getattr(self.query_vec, "nbytes", 0))
+            + self.candidates.nbytes
+            + self._delivered_bytes
+            + _SESSION_OVERHEAD_BYTES
+        )
 
     def priority_score(self) -> int:
-        return len(self.delivered_ids) + len(self.candidate_map) + self.current_k2
+        return len(self.delivered_ids) + len(self.candidates) + self.current_k2
 
 
 @dataclass(slots=True)
@@ -57,6 +267,7 @@ class SearchStreamResult:
     total_known: bool
     warming: bool = False
     index_coverage: dict[str, float | int | str] | None = None
+    refining: bool = False
 
 
 class SearchStreamManager:
@@ -73,8 +284,12 @@ class SearchStreamManager:
         tag_service: TagService,
         stream_global_memory_budget_bytes: int,
         service_pulse: ServicePulse | None = None,
+        lexical_index: LexicalIndexService | None = None,
+        stream_plaintext_cache_bytes: int = 0,
+        result_cache: SearchResultCache | None = None,
     ) -> None:
         self._vector_search = vector_search
+        self._lexical_index = lexical_index
         self._components = pipeline_components
         self._config = config
         self._stream_ttl = stream_ttl
@@ -85,6 +300,8 @@ class SearchStreamManager:
         )
         self._service_pulse = service_pulse
         self._sessions: dict[str, SearchStreamSession] = {}
+        self._result_cache = result_cache
+        self._plaintext = SearchPlaintextCache(stream_plaintext_cache_bytes, stream_ttl)
 
     def _emit_budget_pressure(self, *, evicted: int, total_bytes: int) -> None:
         if self._service_pulse is None:
@@ -97,6 +314,8 @@ class SearchStreamManager:
             "pressure": pressure,
             "evicted_sessions": evicted,
             "active_sessions": len(self._sessions),
+            "plaintext_cache_bytes": self._plaintext.nbytes,
+            "plaintext_cache_entries": len(self._plaintext),
         }
         try:
             self._service_pulse.emit("search.stream_budget", payload)
@@ -128,6 +347,7 @@ class SearchStreamManager:
         self._emit_budget_pressure(evicted=evicted, total_bytes=total_bytes)
 
     def _prune(self) -> None:
+        self._plaintext.prune()
         if not self._sessions:
             return
         now = time.monotonic()
@@ -145,24 +365,20 @@ class SearchStreamManager:
         for session in ordered[: max(0, len(ordered) - self._stream_max_sessions)]:
             self._sessions.pop(session.session_id, None)
 
-    async def fetch_page(
+    async def _open_session(
         self,
-        *,
         ctx: CryptoContext,
         query: str,
         session_id: str | None,
-        page_limit: int,
-        result_window: int,
-        k1: int | None = None,
-        k2: int | None = None,
-    ) -> SearchStreamResult:
-        """Fetch the next page without recomputing earlier candidates."""
+        filters: SearchFilters | None,
+    ) -> tuple[SearchStreamSession, bool]:
+        """Return the matching session or a new one, and whether it is new."""
 
-        self._prune()
         user_id = ctx.user_id
         normalized = self._components.normalizer.normalize(user_id, query)
         normalized_query = normalized.text
-        truncated = normalized.truncated
+        if filters is not None and filters.is_empty:
+            filters = None
 
         session: SearchStreamSession | None = None
         if session_id:
@@ -170,121 +386,455 @@ class SearchStreamManager:
             if session and (
                 session.user_id != user_id
                 or session.normalized_query != normalized_query
+                or session.filters != filters
             ):
                 session = None
 
+        created = session is None
         if session is None:
-            query_vec = (await async_embed_texts([normalized_query])).reshape(1, -1)
+            cache = self._result_cache
+            query_vec = (
+                cache.get_query_vector(user_id, normalized_query)
+                if cache is not None
+                else None
+            )
+            if query_vec is None:
+                query_vec = (
+                    await async_embed_texts([normalized_query], priority="query")
+                ).reshape(1, -1)
+                if cache is not None:
+                    cache.put_query_vector(user_id, normalized_query, query_vec)
             session = SearchStreamSession(
                 session_id=str(ULID()),
                 user_id=user_id,
                 normalized_query=normalized_query,
-                truncated=truncated,
+                truncated=normalized.truncated,
                 query_vec=query_vec,
+                filters=filters,
             )
             self._sessions[session.session_id] = session
 
         session.last_access = time.monotonic()
+        return session, created
 
+    def _desired_depth(
+        self,
+        delivered: int,
+        page_limit: int,
+        result_window: int,
+        k1: int | None,
+        k2: int | None,
+    ) -> tuple[int, int, int]:
         cfg = self._config.progressive
-        delivered = len(session.delivered_ids)
         desired_limit = min(result_window, delivered + page_limit)
         desired_k2 = max(int(cfg.k2), int(k2) if k2 is not None else 0, desired_limit)
         desired_k1 = max(int(cfg.k1), int(k1) if k1 is not None else 0, desired_k2)
+        return desired_limit, desired_k1, desired_k2
 
-        index_coverage: dict[str, float | int | str] | None = None
-        if desired_k2 > session.current_k2:
-            if self._config.include_index_coverage_hints:
-                (
-                    candidates,
-                    total_count,
-                    index_coverage,
-                ) = await self._vector_search.search_candidates(
-                    ctx,
-                    normalized_query,
-                    desired_k1,
-                    desired_k2,
-                    query_vec=session.query_vec,
-                    include_count=True,
-                    include_coverage=True,
-                )
-            else:
-                candidates, total_count = await self._vector_search.search_candidates(
-                    ctx,
-                    normalized_query,
-                    desired_k1,
-                    desired_k2,
-                    query_vec=session.query_vec,
-                    include_count=True,
-                )
-            if desired_k2 >= total_count:
-                session.exhausted = True
-            for candidate in candidates:
-                entry_id = candidate.get("id")
-                if not entry_id:
-                    continue
-                existing = session.candidate_map.get(entry_id)
-                if existing is None or candidate.get("cosine", 0.0) > existing.get(
-                    "cosine",
-                    0.0,
-                ):
-                    session.candidate_map[entry_id] = candidate
-            session.current_k2 = desired_k2
+    @staticmethod
+    def _merge_candidates(
+        session: SearchStreamSession, candidates: Iterable[Candidate]
+    ) -> None:
+        for candidate in candidates:
+            session.candidates.upsert(candidate)
+
+    async def _lexical_candidates(
+        self, ctx: CryptoContext, session: SearchStreamSession, k2: int
+    ) -> list[Candidate]:
+        if self._lexical_index is None:
+            return []
+        hits = await self._lexical_index.search(
+            ctx,
+            session.normalized_query,
+            max(self._config.lexical.limit, k2),
+            filters=session.filters,
+        )
+        lexical_map: CandidateMap = OrderedDict()
+        merge_lexical_hits(lexical_map, hits)
+        return list(lexical_map.values())
+
+    @property
+    def _progressive(self) -> bool:
+        """Whether candidates come from the progressive vector rounds.
+
+        That is what the default generator searches; any other configured
+        generator is asked for its candidates directly.
+        """
+
+        return isinstance(
+            self._components.candidate_generator, DefaultSearchCandidateGenerator
+        )
+
+    async def _generate_candidates(
+        self, ctx: CryptoContext, session: SearchStreamSession, k1: int, k2: int
+    ) -> tuple[list[Candidate], int]:
+        """Run the configured candidate generator for ``session``."""
+
+        candidate_map = await self._components.candidate_generator.generate(
+            ctx,
+            session.normalized_query,
+            k1,
+            k2,
+            filters=session.filters,
+            query_vec=session.query_vec,
+        )
+        index = await self._vector_search.index_store.ensure_index(ctx)
+        return list(candidate_map.values()), index.entry_count
+
+    async def _candidate_rounds(
+        self, ctx: CryptoContext, session: SearchStreamSession, k1: int, k2: int
+    ) -> AsyncIterator[tuple[list[Candidate], int]]:
+        """Yield ``(candidates, total_count)`` after every search round.
+
+        Progressive vector rounds backfill older vectors in between, with
+        lexical hits joining the first round; other generators answer in a
+        single round.
+        """
+
+        if not self._progressive:
+            yield await self._generate_candidates(ctx, session, k1, k2)
+            return
+        first = True
+        async for candidates, total_count in self._vector_search.iter_candidate_rounds(
+            ctx,
+            session.normalized_query,
+            k1,
+            k2,
+            session.query_vec,
+            filters=session.filters,
+            backfill=True,
+        ):
+            if first:
+                first = False
+                candidates.extend(await self._lexical_candidates(ctx, session, k2))
+            yield candidates, total_count
+
+    async def _hydrate(
+        self, ctx: CryptoContext, window: list[Candidate]
+    ) -> list[Candidate]:
+        """Fill ``window`` from the plaintext cache, decrypting the rest."""
+
+        user_id = ctx.user_id
+        cached = self._plaintext.get_many(
+            user_id, (candidate["id"] for candidate in window)
+        )
+        for candidate in window:
+            fields = cached.get(candidate["id"])
+            if fields is not None:
+                candidate.update(fields)
+        hydrated = await self._vector_search.hydrate_candidates(ctx, window)
+        for candidate in hydrated:
+            if candidate["id"] not in cached:
+                self._plaintext.put(user_id, candidate)
+        return hydrated
+
+    def invalidate_entries(
+        self, user_id: str, entry_ids: Iterable[str] | None = None
+    ) -> None:
+        """Drop cached plaintext for changed or deleted entries."""
+
+        self._plaintext.invalidate(user_id, entry_ids)
+
+    def forget(self, user_id: str) -> None:
+        """Drop the user's sessions and cached plaintext, e.g. on logout."""
+
+        for sid in [
+            sid for sid, session in self._sessions.items() if session.user_id == user_id
+        ]:
+            self._sessions.pop(sid, None)
+        self._plaintext.invalidate(user_id)
 
-        limit = max(desired_k2, len(session.candidate_map), 1)
+    async def _rank_page(
+        self,
+        ctx: CryptoContext,
+        session: SearchStreamSession,
+        page_limit: int,
+        desired_k2: int,
+        exclude: set[str],
+    ) -> list[Candidate]:
+        """Rerank the best candidates outside ``exclude`` into one page."""
+
+        # Per-request dicts; scores flow back into the session, plaintext
+        # only into the shared cache.
+        candidate_map = session.candidates.to_map()
+        limit = max(desired_k2, len(candidate_map), 1)
         enrichment = await self._components.tag_enricher.enrich(
             ctx,
-            normalized_query,
-            session.candidate_map,
+            session.normalized_query,
+            candidate_map,
             limit,
+            filters=session.filters,
+        )
+        self._merge_candidates(
+            session,
+            (
+                candidate
+                for entry_id, candidate in candidate_map.items()
+                if entry_id not in session.candidates
+            ),
         )
 
-        ordered_candidates = list(session.candidate_map.values())
-        reranked = self._components.reranker.rerank(
-            normalized_query,
-            ordered_candidates,
-            limit=len(ordered_candidates),
+        # Decrypt just the page plus a rerank window of the best undelivered
+        # candidates; anything further down waits for a later page.
+        window = prerank_candidates(
+            (
+                candidate
+                for candidate in candidate_map.values()
+                if candidate["id"] not in exclude
+            ),
+            enrichment.boosts,
+        )[: page_limit + self._config.rerank_window]
+        hydrated = await self._hydrate(ctx, window)
+        if len(hydrated) < len(window):
+            kept = {candidate["id"] for candidate in hydrated}
+            for candidate in window:
+                if candidate["id"] not in kept:
+                    session.candidates.discard(candidate["id"])
+        # The window never holds excluded ids, so only the page itself needs
+        # snippets.
+        page_results = self._components.reranker.rerank(
+            session.normalized_query,
+            hydrated,
+            limit=page_limit,
             boosts=enrichment.boosts,
         )
 
-        page_results: list[dict] = []
-        for item in reranked:
-            if item["id"] in session.delivered_ids:
-                continue
-            page_results.append(item)
-            session.delivered_ids.add(item["id"])
-            if len(page_results) >= page_limit:
-                break
-
         if page_results:
             await self._tag_service.hydrate_search_results(
                 ctx,
                 page_results,
                 enrichment.tokens,
             )
+        return page_results
 
-        showing_count = len(session.delivered_ids)
+    def _build_result(
+        self,
+        session: SearchStreamSession,
+        page_results: list[Candidate],
+        page_limit: int,
+        desired_limit: int,
+        result_window: int,
+        index_coverage: dict[str, float | int | str] | None = None,
+        refining: bool = False,
+    ) -> SearchStreamResult:
         has_more = (
             not session.exhausted
-            and len(session.candidate_map) >= desired_limit
+            and len(session.candidates) >= desired_limit
             and desired_limit < result_window
             and len(page_results) > 0
             and len(page_results) >= page_limit
         )
-        total_known = not has_more
-
         return SearchStreamResult(
             session_id=session.session_id,
-            normalized_query=normalized_query,
+            normalized_query=session.normalized_query,
             results=page_results,
-            truncated=truncated,
+            truncated=session.truncated,
             has_more=has_more,
-            showing_count=showing_count,
-            total_known=total_known,
-            warming=self._vector_search.index_store.is_warming(user_id),
+            showing_count=len(session.delivered_ids),
+            total_known=not has_more,
+            warming=self._vector_search.index_store.is_warming(session.user_id),
             index_coverage=index_coverage,
+            refining=refining,
         )
 
+    async def _search_candidates(
+        self,
+        ctx: CryptoContext,
+        session: SearchStreamSession,
+        k1: int,
+        k2: int,
+        backfill: bool | None,
+    ) -> tuple[list[Candidate], int, dict[str, float | int | str] | None, bool]:
+        """Return the configured generator's candidates, reusing cached scores.
 
-__all__ = ["SearchStreamManager", "SearchStreamResult"]
-Candidate = dict[str, Any]
+        Only the default generator's vector search can skip backfill and
+        report ``refining``; other generators search everything at once.
+        """
+
+        user_id = ctx.user_id
+        cache = self._result_cache
+        key = ("stream", session.normalized_query, session.filters, k1, k2, backfill)
+        index_coverage: dict[str, float | int | str] | None = None
+        cached = cache.get_candidates(user_id, key) if cache is not None else None
+        if cached is not None:
+            if self._config.include_index_coverage_hints:
+                index_coverage = (
+                    await self._vector_search.index_store.get_index_coverage(ctx)
+                )
+            return (
+                cached.copy_candidates(),
+                cached.total_count,
+                index_coverage,
+                cached.refining,
+            )
+
+        generation = cache.generation(user_id) if cache is not None else 0
+        refining = False
+        if not self._progressive:
+            candidates, total_count = await self._generate_candidates(
+                ctx, session, k1, k2
+            )
+            if self._config.include_index_coverage_hints:
+                index_coverage = (
+                    await self._vector_search.index_store.get_index_coverage(
+                        ctx, recalculate=True
+                    )
+                )
+        elif self._config.include_index_coverage_hints:
+            (
+                candidates,
+                total_count,
+                index_coverage,
+            ) = await self._vector_search.search_candidates(
+                ctx,
+                session.normalized_query,
+                k1,
+                k2,
+                query_vec=session.query_vec,
+                filters=session.filters,
+                hydrate_limit=0,
+                backfill=backfill,
+                include_count=True,
+                include_coverage=True,
+            )
+        else:
+            candidates, total_count = await self._vector_search.search_candidates(
+                ctx,
+                session.normalized_query,
+                k1,
+                k2,
+                query_vec=session.query_vec,
+                filters=session.filters,
+                hydrate_limit=0,
+                backfill=backfill,
+                include_count=True,
+            )
+        if self._progressive:
+            refining = backfill is False and self._vector_search.needs_refinement(
+                user_id, candidates, k2
+            )
+            candidates.extend(await self._lexical_candidates(ctx, session, k2))
+        if cache is not None:
+            cache.put_candidates(
+                user_id,
+                key,
+                generation,
+                candidates,
+                total_count=total_count,
+                refining=refining,
+            )
+        return candidates, total_count, index_coverage, refining
+
+    async def fetch_page(
+        self,
+        *,
+        ctx: CryptoContext,
+        query: str,
+        session_id: str | None,
+        page_limit: int,
+        result_window: int,
+        k1: int | None = None,
+        k2: int | None = None,
+        filters: SearchFilters | None = None,
+        backfill: bool | None = None,
+    ) -> SearchStreamResult:
+        """Fetch the next page without recomputing earlier candidates.
+
+        With ``backfill=False`` only the vectors already in memory are
+        searched; ``refining`` on the result then tells the caller whether
+        :meth:`stream_rounds` could still improve the first page.
+        """
+
+        self._prune()
+        session, _ = await self._open_session(ctx, query, session_id, filters)
+        desired_limit, desired_k1, desired_k2 = self._desired_depth(
+            len(session.delivered_ids), page_limit, result_window, k1, k2
+        )
+
+        index_coverage: dict[str, float | int | str] | None = None
+        refining = False
+        if desired_k2 > session.current_k2:
+            (
+                candidates,
+                total_count,
+                index_coverage,
+                refining,
+            ) = await self._search_candidates(
+                ctx, session, desired_k1, desired_k2, backfill
+            )
+            if desired_k2 >= total_count:
+                session.exhausted = True
+            self._merge_candidates(session, candidates)
+            session.current_k2 = desired_k2
+
+        page_results = await self._rank_page(
+            ctx, session, page_limit, desired_k2, session.delivered_ids
+        )
+        session.deliver(item["id"] for item in page_results)
+        return self._build_result(
+            session,
+            page_results,
+            page_limit,
+            desired_limit,
+            result_window,
+            index_coverage,
+            refining,
+        )
+
+    async def stream_rounds(
+        self,
+        *,
+        ctx: CryptoContext,
+        query: str,
+        session_id: str | None,
+        page_limit: int,
+        result_window: int,
+        k1: int | None = None,
+        k2: int | None = None,
+        filters: SearchFilters | None = None,
+    ) -> AsyncIterator[SearchStreamResult]:
+        """Yield the first page again after every progressive search round.
+
+        The first round answers from the vectors already in memory; each
+        later round follows a backfill batch of older vectors and re-ranks
+        the first page with whatever it turned up. When resuming a session
+        whose first page was already delivered, that unchanged first round
+        is skipped. A generator other than the default one yields a single
+        round.
+        """
+
+        self._prune()
+        session, created = await self._open_session(ctx, query, session_id, filters)
+        resumed = not created and bool(session.delivered_ids)
+        desired_limit, desired_k1, desired_k2 = self._desired_depth(
+            0, page_limit, result_window, k1, k2
+        )
+
+        round_index = 0
+        async for candidates, total_count in self._candidate_rounds(
+            ctx, session, desired_k1, desired_k2
+        ):
+            first = round_index == 0
+            round_index += 1
+            session.last_access = time.monotonic()
+            self._merge_candidates(session, candidates)
+            session.exhausted = desired_k2 >= total_count
+            session.current_k2 = max(session.current_k2, desired_k2)
+            if first and resumed:
+                continue
+
+            page_results = await self._rank_page(
+                ctx, session, page_limit, desired_k2, set()
+            )
+            session.reset_delivered(item["id"] for item in page_results)
+            yield self._build_result(
+                session, page_results, page_limit, desired_limit, result_window
+            )
+
+
+__all__ = [
+    "SearchPlaintextCache",
+    "SearchStreamManager",
+    "SearchStreamResult",
+    "SessionCandidates",
+]
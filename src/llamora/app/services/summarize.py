@@ -11,7 +11,10 @@ import orjson
 from llamora.app.services.crypto import CryptoContext
 from llamora.app.services.lockbox import Lockbox
 from llamora.app.services.lockbox_store import LockboxStore
-from llamora.app.services.digest_policy import entry_digest_aggregate, tag_digest
+from llamora.app.services.digest_policy import (
+    digest_policy_tag,
+    entry_digest_aggregate,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -126,7 +129,7 @@ class SummarizeService:
         cached = await self.store.get_json(ctx, "digest", cache_key)
         if isinstance(cached, dict):
             value = cached.get("value")
-            if isinstance(value, str) and value:
+            if isinstance(value, str) and _is_current_digest(value):
                 return value
 
         digest = await self.entries_repo.get_day_summary_digest_for_date(
@@ -141,13 +144,10 @@ class SummarizeService:
         cached = await self.store.get_json(ctx, "digest", cache_key)
         if isinstance(cached, dict):
             value = cached.get("value")
-            if isinstance(value, str) and value:
+            if isinstance(value, str) and _is_current_digest(value):
                 return value
 
-        entry_digests = await self.tags_repo.get_entry_digests_for_tag(
-            ctx.user_id, tag_hash
-        )
-        digest = tag_digest(entry_digests)
+        digest = await self.tags_repo.get_tag_digest(ctx.user_id, tag_hash)
         await self.store.set_json(ctx, "digest", cache_key, {"value": digest})
         return digest
 
@@ -160,6 +160,11 @@ class SummarizeService:
         await self.lockbox.delete(user_id, "digest", f"tag:{tag_hash_hex}")
 
 
+def _is_current_digest(value: str) -> bool:
+    # Digests cached under an older policy are recomputed.
+    return value.startswith(f"{digest_policy_tag()}:")
+
+
 def _extract_summary_field(raw: str) -> str:
     if not raw:
         return ""
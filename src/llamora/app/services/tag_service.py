@@ -22,7 +22,6 @@ from llamora.app.services.entry_metadata import (
     DEFAULT_METADATA_EMOJI,
     generate_metadata,
 )
-from llamora.app.services.digest_policy import tag_digest
 
 
 logger = logging.getLogger(__name__)
@@ -48,10 +47,6 @@ def _parse_tag_cursor(cursor: str | None) -> tuple[str | None, str | None]:
     return created_at, entry_id
 
 
-def _build_summary_digest(entry_digests: Iterable[str]) -> str:
-    return tag_digest(entry_digests)
-
-
 @dataclass(slots=True)
 class TagEntryPreview:
     entry_id: str
@@ -276,9 +271,7 @@ class TagService:
             limit=limit,
             cursor=cursor,
         )
-        entry_digests = await self._db.tags.get_entry_digests_for_tag(
-            ctx.user_id, tag_hash
-        )
+        summary_digest = await self._db.tags.get_tag_digest(ctx.user_id, tag_hash)
 
         return TagOverview(
             name=self.display(info["name"]),
@@ -286,7 +279,7 @@ class TagService:
             count=int(info.get("count", 0) or 0),
             last_used=info.get("last_used"),
             last_updated=info.get("last_updated"),
-            summary_digest=_build_summary_digest(entry_digests),
+            summary_digest=summary_digest,
             entries=tuple(previews),
             has_more=has_more,
             next_cursor=next_cursor,
@@ -569,9 +562,7 @@ class TagService:
         info = await self._db.tags.get_tag_info(ctx, tag_hash)
         if not info:
             return None
-        entry_digests = await self._db.tags.get_entry_digests_for_tag(
-            ctx.user_id, tag_hash
-        )
+        summary_digest = await self._db.tags.get_tag_digest(ctx.user_id, tag_hash)
 
         archive_entries, next_cursor, has_more = await self.get_archive_entries_page(
             ctx,
@@ -587,7 +578,7 @@ class TagService:
                 first_used=info.get("first_used"),
                 first_used_label=_format_month_year(info.get("first_used")),
                 last_updated=info.get("last_updated"),
-                summary_digest=_build_summary_digest(entry_digests),
+                summary_digest=summary_digest,
                 entries=(),
                 entries_has_more=False,
                 entries_next_cursor=None,
@@ -628,7 +619,7 @@ class TagService:
             first_used=info.get("first_used"),
             first_used_label=_format_month_year(info.get("first_used")),
             last_updated=info.get("last_updated"),
-            summary_digest=_build_summary_digest(entry_digests),
+            summary_digest=summary_digest,
             entries=tuple(archive_entries),
             entries_has_more=has_more,
             entries_next_cursor=next_cursor,
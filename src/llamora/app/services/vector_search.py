@@ -1,6 +1,6 @@
 import logging
 import time
-from typing import Any, TYPE_CHECKING, Literal, overload
+from typing import Any, AsyncIterator, TYPE_CHECKING, Literal, Sequence, overload
 
 if TYPE_CHECKING:
     import numpy as np
@@ -11,10 +11,17 @@ from llamora.app.embed.model import async_embed_texts
 from llamora.app.index.entry_ann import EntryIndexStore
 from llamora.app.services.crypto import CryptoContext
 from llamora.app.services.search_config import SearchConfig
+from llamora.app.services.search_filters import SearchFilters
 
 logger = logging.getLogger(__name__)
 
 
+def is_hydrated(candidate: dict[str, Any]) -> bool:
+    """Return whether ``candidate`` carries decrypted entry content."""
+
+    return "content" in candidate
+
+
 class VectorSearchService:
     """Handles ANN index access and progressive warm-up for entry search."""
 
@@ -51,6 +58,23 @@ class VectorSearchService:
         min_hits = max(1, int(cfg.poor_match_min_hits))
         return max_cos >= float(cfg.poor_match_max_cos) and hits >= min_hits
 
+    def needs_refinement(
+        self, user_id: str, candidates: Sequence[dict[str, Any]], k2: int
+    ) -> bool:
+        """Return whether backfill rounds could still improve ``candidates``.
+
+        True while older stored vectors remain outside the in-memory index
+        and the current matches are too few or too weak.
+        """
+
+        if not self.index_store.cursors.get(user_id):
+            return False
+        return not self._quality_satisfied(
+            [candidate["id"] for candidate in candidates],
+            [float(candidate.get("cosine", 0.0)) for candidate in candidates],
+            k2,
+        )
+
     @staticmethod
     def _entry_id_from_vector_id(vector_id: str) -> str:
         if "::c" in vector_id:
@@ -89,6 +113,9 @@ class VectorSearchService:
         k2: int | None = None,
         query_vec: "np.ndarray | None" = None,
         *,
+        filters: SearchFilters | None = None,
+        hydrate_limit: int | None = None,
+        backfill: bool | None = None,
         include_count: Literal[False] = False,
         include_coverage: Literal[False] = False,
     ) -> list[dict[str, Any]]: ...
@@ -102,6 +129,9 @@ class VectorSearchService:
         k2: int | None = None,
         query_vec: "np.ndarray | None" = None,
         *,
+        filters: SearchFilters | None = None,
+        hydrate_limit: int | None = None,
+        backfill: bool | None = None,
         include_count: Literal[True] = True,
         include_coverage: Literal[False] = False,
     ) -> tuple[list[dict[str, Any]], int]: ...
@@ -115,6 +145,9 @@ class VectorSearchService:
         k2: int | None = None,
         query_vec: "np.ndarray | None" = None,
         *,
+        filters: SearchFilters | None = None,
+        hydrate_limit: int | None = None,
+        backfill: bool | None = None,
         include_count: Literal[False] = False,
         include_coverage: Literal[True],
     ) -> tuple[list[dict[str, Any]], None, dict[str, float | int | str]]: ...
@@ -128,6 +161,9 @@ class VectorSearchService:
         k2: int | None = None,
         query_vec: "np.ndarray | None" = None,
         *,
+        filters: SearchFilters | None = None,
+        hydrate_limit: int | None = None,
+        backfill: bool | None = None,
         include_count: Literal[True],
         include_coverage: Literal[True],
     ) -> tuple[list[dict[str, Any]], int, dict[str, float | int | str]]: ...
@@ -140,6 +176,9 @@ class VectorSearchService:
         k2: int | None = None,
         query_vec: "np.ndarray | None" = None,
         *,
+        filters: SearchFilters | None = None,
+        hydrate_limit: int | None = None,
+        backfill: bool | None = None,
         include_count: bool = False,
         include_coverage: bool = False,
     ) -> (
@@ -148,88 +187,165 @@ class VectorSearchService:
         | tuple[list[dict[str, Any]], None, dict[str, float | int | str]]
         | tuple[list[dict[str, Any]], int, dict[str, float | int | str]]
     ):
+        results: list[dict[str, Any]] = []
+        total_count = 0
+        async for results, total_count in self.iter_candidate_rounds(
+            ctx,
+            query,
+            k1,
+            k2,
+            query_vec,
+            filters=filters,
+            backfill=backfill,
+        ):
+            pass
+
+        # Only the head is decrypted; callers hydrate the rest page by page.
+        limit = len(results) if hydrate_limit is None else max(int(hydrate_limit), 0)
+        hydrated = await self.hydrate_candidates(ctx, results[:limit])
+        results = hydrated + results[limit:]
+        logger.debug(
+            "Vector search returning %d candidates (%d hydrated)",
+            len(results),
+            len(hydrated),
+        )
+
+        if include_coverage:
+            coverage = await self.index_store.get_index_coverage(ctx, recalculate=True)
+            if include_count:
+                return results, total_count, coverage
+            return results, None, coverage
+        if include_count:
+            return results, total_count
+        return results
+
+    async def iter_candidate_rounds(
+        self,
+        ctx: CryptoContext,
+        query: str,
+        k1: int | None = None,
+        k2: int | None = None,
+        query_vec: "np.ndarray | None" = None,
+        *,
+        filters: SearchFilters | None = None,
+        backfill: bool | None = None,
+    ) -> AsyncIterator[tuple[list[dict[str, Any]], int]]:
+        """Yield ``(candidates, indexed_entries)`` after every ANN query.
+
+        The first round searches what is already in memory. While matches
+        stay poor, each further round first pulls a batch of older stored
+        vectors into the index (``progressive`` settings); ``backfill``
+        defaults to ``progressive_inline_backfill``. Candidates are
+        ``{"id", "cosine"}`` stubs, best first. Time the consumer spends
+        between rounds does not count against ``progressive.max_ms``.
+        """
+
         user_id = ctx.user_id
         cfg = self._config.progressive
         k1 = int(k1) if k1 is not None else cfg.k1
         k2 = int(k2) if k2 is not None else cfg.k2
+        if backfill is None:
+            backfill = self._config.progressive_inline_backfill
         logger.debug(
             "Vector search requested by user %s with k1=%d k2=%d", user_id, k1, k2
         )
         index = await self.index_store.ensure_index(ctx)
-        total_count = len(getattr(index, "entry_to_ids", {}))
         if query_vec is None:
-            q_vec = (await async_embed_texts([query])).reshape(1, -1)
+            q_vec = (await async_embed_texts([query], priority="query")).reshape(1, -1)
         else:
             q_vec = query_vec
 
+        if filters is not None and filters.is_empty:
+            filters = None
+        tag_entry_ids: set[str] | None = None
+        if filters is not None and filters.tags:
+            tag_entry_ids = await self.index_store.entry_ids_for_tags(
+                user_id, filters.tags
+            )
+
+        async def _search(limit: int) -> tuple[list[str], "np.ndarray"]:
+            if filters is None:
+                return index.search(q_vec, limit)
+            if filters.roles or filters.date_from or filters.date_to:
+                await self.index_store.load_filter_metadata(user_id, index)
+            return index.search(q_vec, limit, filters=filters, entry_ids=tag_entry_ids)
+
         current_k1 = k1
         start = time.monotonic()
-        ids, dists = index.search(q_vec, current_k1)
+        ids, dists = await _search(current_k1)
         cosines = (1.0 - dists).tolist()
         logger.debug("Initial vector search returned %d candidates", len(ids))
 
         rounds = 0
-        if self._config.progressive_inline_backfill:
-            while self._should_continue(start, rounds, ids, cosines, k2):
-                added = await self.index_store.expand_older(
-                    ctx,
-                    int(cfg.batch_size),
-                    embed_missing=False,
-                )
-                logger.debug("Backfill round %d added %d vectors", rounds + 1, added)
-                if added <= 0:
-                    break
-                rounds += 1
-                if rounds == 1:
-                    current_k1 = min(2 * current_k1, 512)
-                ids, dists = index.search(q_vec, current_k1)
-                cosines = (1.0 - dists).tolist()
-
-        seen: set[str] = set()
-        dedup_ids: list[str] = []
+        while True:
+            paused = time.monotonic()
+            yield self._collect_candidates(ids, cosines), index.entry_count
+            start += time.monotonic() - paused
+            if not backfill or not self._should_continue(
+                start, rounds, ids, cosines, k2
+            ):
+                return
+            added = await self.index_store.expand_older(
+                ctx,
+                int(cfg.batch_size),
+                embed_missing=False,
+            )
+            logger.debug("Backfill round %d added %d vectors", rounds + 1, added)
+            if added <= 0:
+                return
+            rounds += 1
+            if rounds == 1:
+                current_k1 = min(2 * current_k1, 512)
+            ids, dists = await _search(current_k1)
+            cosines = (1.0 - dists).tolist()
+
+    def _collect_candidates(
+        self, ids: list[str], cosines: list[float]
+    ) -> list[dict[str, Any]]:
         id_cos: dict[str, float] = {}
         for vector_id, cos in zip(ids, cosines):
             if vector_id is None:
                 continue
             entry_id = self._entry_id_from_vector_id(vector_id)
-            if entry_id not in seen:
-                seen.add(entry_id)
-                dedup_ids.append(entry_id)
             existing = id_cos.get(entry_id)
             if existing is None or cos > existing:
                 id_cos[entry_id] = cos
+        results = [
+            {"id": entry_id, "cosine": cosine} for entry_id, cosine in id_cos.items()
+        ]
+        results.sort(key=lambda r: r["cosine"], reverse=True)
+        return results
 
-        rows = await self.index_store.hydrate_entries(ctx, dedup_ids)
-        row_map = {r["id"]: r for r in rows}
+    async def hydrate_candidates(
+        self, ctx: CryptoContext, candidates: Sequence[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Decrypt entries for candidates that only carry an id and cosine.
 
-        results: list[dict[str, Any]] = []
-        for entry_id in dedup_ids:
-            row = row_map.get(entry_id)
-            if not row:
-                continue
-            content = row.get("text", "")
-            results.append(
-                {
-                    "id": row["id"],
-                    "created_at": row["created_at"],
-                    "created_date": row.get("created_date"),
-                    "role": row["role"],
-                    "content": content,
-                    "cosine": id_cos.get(entry_id, 0.0),
-                }
-            )
-
-        results.sort(key=lambda r: r["cosine"], reverse=True)
-        logger.debug("Vector search returning %d hydrated candidates", len(results))
+        Candidates are filled in place; the returned list keeps their order
+        and drops entries that no longer exist.
+        """
 
-        if include_coverage:
-            coverage = await self.index_store.get_index_coverage(ctx, recalculate=True)
-            if include_count:
-                return results, total_count, coverage
-            return results, None, coverage
-        if include_count:
-            return results, total_count
-        return results
+        pending = [candidate for candidate in candidates if not is_hydrated(candidate)]
+        if pending:
+            rows = await self.index_store.hydrate_entries(
+                ctx, [candidate["id"] for candidate in pending]
+            )
+            row_map = {row["id"]: row for row in rows}
+            for candidate in pending:
+                row = row_map.get(candidate["id"])
+                if not row:
+                    continue
+                candidate.update(
+                    {
+                        "id": row["id"],
+                        "created_at": row["created_at"],
+                        "created_date": row.get("created_date"),
+                        "role": row["role"],
+                        "content": row.get("text", ""),
+                    }
+                )
+                candidate.setdefault("cosine", 0.0)
+        return [candidate for candidate in candidates if is_hydrated(candidate)]
 
     async def append_entry(
         self, ctx: CryptoContext, entry_id: str, content: str
@@ -22,6 +22,8 @@ from llamora.app.db.users import UsersRepository
 from llamora.app.db.entries import EntriesRepository
 from llamora.app.db.tags import TagsRepository
 from llamora.app.db.vectors import VectorsRepository
+from llamora.app.db.lexical import LexicalIndexRepository
+from llamora.app.db.related import RelatedEntriesRepository
 from llamora.app.db.search_history import SearchHistoryRepository
 
 
@@ -43,6 +45,8 @@ class LocalDB:
         self._entries: EntriesRepository | None = None
         self._tags: TagsRepository | None = None
         self._vectors: VectorsRepository | None = None
+        self._lexical: LexicalIndexRepository | None = None
+        self._related: RelatedEntriesRepository | None = None
         self._search_history: SearchHistoryRepository | None = None
         self._events: RepositoryEventBus | None = None
         self._init_lock = asyncio.Lock()
@@ -106,6 +110,8 @@ class LocalDB:
                 self._entries = None
                 self._tags = None
                 self._vectors = None
+                self._lexical = None
+                self._related = None
                 self._search_history = None
                 self._events = None
                 raise
@@ -121,6 +127,8 @@ class LocalDB:
             self._entries = None
             self._tags = None
             self._vectors = None
+            self._lexical = None
+            self._related = None
             self._search_history = None
             self._events = None
 
@@ -168,6 +176,8 @@ class LocalDB:
             self._events,
         )
         self._vectors = VectorsRepository(self.pool)
+        self._lexical = LexicalIndexRepository(self.pool)
+        self._related = RelatedEntriesRepository(self.pool)
         self._search_history = SearchHistoryRepository(self.pool)
         self._entries.set_on_entry_appended(self._on_entry_appended)
 
@@ -208,6 +218,18 @@ class LocalDB:
 
         return self._require_repository(self._vectors, "Vectors")
 
+    @property
+    def lexical(self) -> LexicalIndexRepository:
+        """Return the blind lexical index repository."""
+
+        return self._require_repository(self._lexical, "Lexical index")
+
+    @property
+    def related(self) -> RelatedEntriesRepository:
+        """Return the related entries repository."""
+
+        return self._require_repository(self._related, "Related entries")
+
     @property
     def search_history(self) -> SearchHistoryRepository:
         """Return the search history repository."""
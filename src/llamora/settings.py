@@ -88,8 +88,10 @@ DEFAULTS: dict[str, Any] = {
         "entry_index_max_elements": 100_000,
         "entry_index_allow_growth": False,
         "stream_global_memory_budget_bytes": 32 * 1024 * 1024,
+        "stream_plaintext_cache_bytes": 8 * 1024 * 1024,
         "progressive_inline_backfill": True,
         "include_index_coverage_hints": False,
+        "rerank_window": 20,
         "progressive": {
             "k1": 128,
             "k2": 10,
@@ -99,6 +101,22 @@ DEFAULTS: dict[str, Any] = {
             "poor_match_max_cos": 0.28,
             "poor_match_min_hits": 3,
         },
+        "lexical": {
+            "enabled": True,
+            "limit": 50,
+            "bm25_k1": 1.2,
+            "bm25_b": 0.75,
+            "max_df_ratio": 0.5,
+            "backfill_batch_size": 100,
+        },
+        "fusion": {
+            "rrf_k": 60,
+            "retrievers": ["vector", "lexical", "tags"],
+        },
+        "query_cache": {
+            "max_entries_per_user": 32,
+            "max_users": 64,
+        },
     },
     "AUTH": {
         "max_login_attempts": 5,
@@ -108,6 +126,8 @@ DEFAULTS: dict[str, Any] = {
         "idle_ttl": 8 * 60 * 60,
         "cookie_touch_interval": 5 * 60,
         "csrf_ttl": 8 * 60 * 60,
+        "entry_cache_bytes": 16 * 1024 * 1024,
+        "entry_cache_ttl": 30 * 60,
     },
     "DATABASE": {
         "path": "state.sqlite3",
@@ -129,6 +149,11 @@ DEFAULTS: dict[str, Any] = {
             "max_chars": 1200,
             "overlap_chars": 200,
         },
+        "batching": {
+            "max_batch_size": 64,
+            "max_wait_ms": 5.0,
+            "query_wait_ms": 1.0,
+        },
         "index": {
             "backfill_batch_size": 64,
             "backfill_max_users_per_tick": 8,
@@ -136,6 +161,15 @@ DEFAULTS: dict[str, Any] = {
             "backfill_cpu_budget_ms": 40.0,
             "coverage_recent_limit": 1000,
             "coverage_emit_interval_s": 30.0,
+            "snapshot_enabled": True,
+            "snapshot_interval_s": 300.0,
+            "exact_search_threshold": 4096,
+            "exact_search_dtype": "float32",
+        },
+        "related": {
+            "enabled": True,
+            "k": 6,
+            "batch_size": 64,
         },
     },
     "LLM": {
@@ -304,18 +338,24 @@ def _parse_byte_size(value: Any, *, default: int) -> int:
 
 def _normalise_byte_budgets() -> None:
     search_default = int(DEFAULTS["SEARCH"]["stream_global_memory_budget_bytes"])
+    plaintext_default = int(DEFAULTS["SEARCH"]["stream_plaintext_cache_bytes"])
     embedding_default = int(DEFAULTS["EMBEDDING"]["global_memory_budget_bytes"])
 
     stream_budget = _parse_byte_size(
         settings.get("SEARCH.stream_global_memory_budget_bytes"),
         default=search_default,
     )
+    plaintext_budget = _parse_byte_size(
+        settings.get("SEARCH.stream_plaintext_cache_bytes"),
+        default=plaintext_default,
+    )
     embedding_budget = _parse_byte_size(
         settings.get("EMBEDDING.global_memory_budget_bytes"),
         default=embedding_default,
     )
 
     settings.set("SEARCH.stream_global_memory_budget_bytes", stream_budget)
+    settings.set("SEARCH.stream_plaintext_cache_bytes", plaintext_budget)
     settings.set("EMBEDDING.global_memory_budget_bytes", embedding_budget)
 
 